@@ -1,6 +1,20 @@
+import os
+
 import streamlit as st
-import pandas as pd
 import numpy as np
+import pandas as pd
+
+from board import (
+    HITTER_EXTRA_COLS, HITTER_SYSTEMS, PITCHER_EXTRA_COLS, PITCHER_SYSTEMS, RELIEVER_SOURCES, career_variant_columns,
+    frame_version, merge_hitters, merge_pitchers, merge_relievers, project_source
+)
+from projection import DISCOUNT_RATE
+from draft import DEFAULT_POLL_INTERVAL, DRAFT_SHEET_URL, DraftBoardPoller, DraftColumn
+from names import NameIndex, parse_name_list
+from query import QueryCache, QueryError, compile_query
+from sources import SOURCES, load_source, source_fingerprint
+from timing import Spans, log_to_stderr, logging_enabled
+from view import DEFAULT_PAGE_SIZE, View
 
 # -------------------------------#
 # 1. CONFIG AND PAGE METADATA
@@ -15,7 +29,12 @@ st.set_page_config(
 st.title("Franchise Draft - Beetie Board")
 st.write("Career WAR projections for the best players available, merged across multiple systems.")
 
-DISCOUNT_RATE = 0.10  # 10% discount rate
+# Where this rerun spends its time: shown with ?debug=1 in the URL, and logged as
+# JSON lines when FRANCHISEDRAFT_TIMINGS=1 (see timing.py)
+show_timings = "debug" in st.query_params
+if logging_enabled():
+    log_to_stderr()
+spans = Spans(enabled=show_timings, log=logging_enabled())
 
 # -------------------------------#
 # 2. STREAMLIT WIDGETS
@@ -31,8 +50,16 @@ with st.expander("Custom Query"):
     """)
     custom_query = st.text_input("Query", key="custom_query", placeholder="Enter query here...")
 
+# Parsed once per distinct query text; each table is checked against it separately
+compiled_query = None
+if custom_query:
+    try:
+        compiled_query = compile_query(custom_query)
+    except QueryError as e:
+        st.error(f"Invalid query: {str(e)}")
+
 # Move the columns definition here
-col1, col2, col3 = st.columns(3)
+col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     show_drafted = st.toggle("Show Drafted Players", value=False, 
@@ -45,220 +72,147 @@ with col3:
     use_flat_curve = st.toggle("Use Flattened Aging Curve", value=False, 
                                key="use_flat_curve", 
                                help="Uses a flattened aging curve, with less growth and less decline.")
+with col4:
+    page_size = st.number_input("Rows per Page", min_value=25, max_value=5000, value=DEFAULT_PAGE_SIZE, step=25,
+                                key="page_size",
+                                help="Only the top rows of each table are sent; \"Load More\" adds another page.")
 
 # -------------------------------#
 # 3. HELPER FUNCTIONS
 # -------------------------------#
 
-def interpolate_delta(age_deltas, age):
-    """
-    Interpolates between two ages based on decimal age.
-    For example, age 24.8 will use 20% of age 24's delta and 80% of age 25's delta.
-    """
-    lower_age = int(age)
-    upper_age = lower_age + 1
-    decimal_part = age - lower_age
+@st.cache_resource
+def get_query_cache():
+    """Query masks and column indexes shared by every session (see query.py)."""
+    return QueryCache()
 
-    lower_delta = age_deltas.get(lower_age, -2.5)
-    upper_delta = age_deltas.get(upper_age, -2.5)
-
-    return (1 - decimal_part) * lower_delta + decimal_part * upper_delta
-
-def aging_projection(row, is_pitcher, discount, flatten):
+def custom_query_mask(view, version=None, index_version=None):
     """
-    Calculates career WAR from current WAR and age, 
-    optionally using a flattened or standard aging curve,
-    and optionally discounting future WAR.
+    Mask of the rows of `view` matching the custom query, or None if there
+    is no query. `version` identifies the frame's contents:
+    the mask is memoized under it, and range predicates on Age and the
+    WAR/Career columns use the frame's sorted indexes (keyed by
+    `index_version` if given). Without a version the query runs directly.
+    Only the queried columns are built; a table missing one, or where the
+    query fails (e.g. comparing a text column to a number), shows no rows.
     """
-    age = float(row["Age"])
-    current_war = row["WAR"]  # System-specific single-year WAR
-    total_future_war = max(0, current_war)
-    years_from_now = 0
-
-    # Choose deltas based on whether it's a pitcher or hitter, and whether flattening is used
-    if is_pitcher:
-        if not flatten:
-            # Standard pitcher deltas
-            deltas = {
-                16: +0.27, 17: +0.22, 18: +0.22, 19: +0.17, 20: +0.17,
-                21: +0.17, 22: +0.07, 23: +0.07, 24: +0.07,
-                25: +0.00, 26: +0.00, 27: -0.08, 28: -0.18, 29: -0.18,
-                30: -0.28, 31: -0.28, 32: -0.38, 33: -0.38, 34: -0.48,
-                35: -0.58, 36: -0.68, 37: -0.78, 38: -0.88, 39: -0.98,
-                40: -1.08, 41: -1.18, 42: -1.28, 43: -1.38, 44: -1.48,
-                45: -1.58
-            }
-        else:
-            # Flattened pitcher deltas
-            deltas = {
-                16: +0.02, 17: +0.01, 18: +0.00, 19: -0.01, 20: -0.02,
-                21: -0.02, 22: -0.05, 23: -0.08, 24: -0.08,
-                25: -0.11, 26: -0.14, 27: -0.17, 28: -0.22, 29: -0.22,
-                30: -0.25, 31: -0.25, 32: -0.30, 33: -0.30, 34: -0.33,
-                35: -0.37, 36: -0.41, 37: -0.45, 38: -0.50, 39: -0.55,
-                40: -0.60, 41: -0.65, 42: -0.70, 43: -0.75, 44: -0.80,
-                45: -0.85
-            }
-    else:
-        if not flatten:
-            # Standard hitter deltas
-            deltas = {
-                16: +0.35, 17: +0.30, 18: +0.30, 19: +0.25, 20: +0.25, 
-                21: +0.20, 22: +0.20, 23: +0.10, 24: +0.10,
-                25: +0.03, 26: +0.03, 27: -0.05, 28: -0.15, 29: -0.25,
-                30: -0.35, 31: -0.45, 32: -0.55, 33: -0.65, 34: -0.75,
-                35: -0.85, 36: -0.95, 37: -1.15, 38: -1.35, 39: -1.55,
-                40: -1.75, 41: -1.95, 42: -2.15, 43: -2.35, 44: -2.55,
-                45: -2.80
-            }
-        else:
-            # Flattened hitter deltas
-            deltas = {
-                16: +0.05, 17: +0.03, 18: +0.02, 19: +0.01, 20: +0.01,
-                21: +0.01, 22: -0.03, 23: -0.06, 24: -0.09,
-                25: -0.13, 26: -0.17, 27: -0.21, 28: -0.25, 29: -0.30,
-                30: -0.35, 31: -0.40, 32: -0.45, 33: -0.50, 34: -0.55,
-                35: -0.60, 36: -0.70, 37: -0.80, 38: -0.90, 39: -1.00,
-                40: -1.10, 41: -1.20, 42: -1.30, 43: -1.40, 44: -1.50,
-                45: -1.60
-            }
-
-    # Project until age 45
-    while age < 46:
-        delta = interpolate_delta(deltas, age)
-        current_war += delta
-
-        if current_war > 0:
-            if discount:
-                discount_factor = 1 / ((1 + DISCOUNT_RATE) ** years_from_now)
-                total_future_war += current_war * discount_factor
-            else:
-                total_future_war += current_war
-
-        age += 1
-        years_from_now += 1
-
-    return total_future_war
-
-
-def calculate_career_war(df, is_pitcher=False, discount=False, flatten=False, war_col="WAR", new_col="CareerWAR"):
+    if compiled_query is None:
+        return None
+    missing = compiled_query.missing_columns(view.columns)
+    if missing:
+        st.info(f"Custom query doesn't apply to {view.name}: no {', '.join(missing)} column.")
+        return np.zeros(len(view), dtype=bool)
+    try:
+        df = view.frame(compiled_query.columns)
+        if version is None:
+            return compiled_query.mask(df)
+        return get_query_cache().mask(compiled_query, df, version, index_version=index_version)
+    except Exception as e:
+        st.error(f"Invalid query for {view.name}: {str(e)}")
+        return np.zeros(len(view), dtype=bool)
+
+def names_mask(view, name_index, key_col="MLBAMID"):
     """
-    Adds a column `new_col` to df that calculates the career WAR 
-    given the current (war_col), age, and an aging-curve approach.
+    Mask of the players whose names are in the provided list, or None if
+    there's no list. Names are matched in normalized form through
+    `name_index` (see names.py), falling back to the closest confident
+    match, then to rows by `key_col`.
     """
-    # Make sure Age and WAR columns are numeric
-    df["Age"] = pd.to_numeric(df["Age"], errors="coerce")
-    df[war_col] = pd.to_numeric(df[war_col], errors="coerce")
-    
-    df[new_col] = df.apply(
-        lambda row: aging_projection(
-            row={
-                "Age": row["Age"], 
-                "WAR": row[war_col]
-            },
-            is_pitcher=is_pitcher,
-            discount=discount,
-            flatten=flatten
-        ),
-        axis=1
-    ).round(1)
-
-    return df
-
-def apply_custom_query(df):
-    """Applies a custom query to the dataframe if one is provided."""
-    if custom_query:
-        try:
-            return df.query(custom_query)
-        except Exception as e:
-            st.error(f"Invalid query: {str(e)}")
-            return df
-    return df
-
-def filter_by_names(df):
-    """Filters dataframe to only show players whose names are in the provided list."""
     if st.session_state.name_list:
         # Split by either commas or newlines
-        names = [name.strip() for name in st.session_state.name_list.replace('\n', ',').split(',')]
-        # Remove empty strings
-        names = [name for name in names if name]
+        names = parse_name_list(st.session_state.name_list)
         if names:
-            # Convert both the dataframe names and input names to lowercase for case-insensitive matching
-            df_names_lower = df["NameASCII"].str.lower()
-            names_lower = [name.lower() for name in names]
-            return df[df_names_lower.isin(names_lower)]
-    return df
+            return pd.Series(view.column(key_col)).isin(name_index.lookup_many(names, fuzzy=True))
+    return None
+
+@st.cache_resource
+def get_draft_poller():
+    """
+    One draft sheet poller shared by every session. The first fetch happens
+    here so the board is never empty; after that a background thread
+    re-checks the sheet every DRAFT_POLL_INTERVAL seconds and only publishes
+    a new mapping when the sheet changed (see draft.py).
+    """
+    interval = float(os.environ.get("DRAFT_POLL_INTERVAL", DEFAULT_POLL_INTERVAL))
+    poller = DraftBoardPoller(DRAFT_SHEET_URL, interval=interval)
+    poller.poll()
+    return poller.start()
 
-@st.cache_data(ttl=0.15*3600)
 def load_drafted_players():
     """
-    Load the Google Sheet with draft picks. 
-    Return a dict {player_name : draft_position} 
+    Return the latest {player_name : draft_position} from the draft sheet.
     The names in the sheet are already in ASCII format.
     """
-    df = pd.read_csv(
-        'https://docs.google.com/spreadsheets/d/'
-        '1kfOLdBmdbnr0fNgwdLDYQ3CyY-R0m5RZiCslCNjwMb4'
-        '/export?format=csv&gid=306625921'
-    )
-    drafted_dict = {}
-    for idx, row in df.iterrows():
-        if pd.notna(row['Player']):
-            # idx + 1 is the draft position
-            # Store both original and lowercase versions for case-insensitive matching
-            player_name = row['Player']
-            drafted_dict[player_name] = idx + 1
-    return drafted_dict
+    return get_draft_poller().drafted
 
-def filter_drafted(df, show_drafted):
+def drafted_mask(view, show_drafted):
     """
-    If show_drafted=False, only show those not drafted.
-    If show_drafted=True, show all (or highlight).
+    If show_drafted=False, mask of those not drafted.
+    If show_drafted=True, None: show all (or highlight).
     """
     if not show_drafted:
-        return df[df["DraftPos"].isna()]
-    else:
-        return df
-
-def create_fangraphs_url(player_id):
-    """Creates a Fangraphs URL from a player ID"""
-    if pd.isna(player_id):
-        return None
-    return f"https://www.fangraphs.com/players/placeholder/{player_id}/stats"
+        return pd.isna(view.column("DraftPos"))
+    return None
 
-def create_statcast_url(player_id, name, is_pitcher=False):
-    """Creates a Baseball Savant/Statcast URL from a player ID and name"""
-    if pd.isna(player_id):
-        return None
-    # Convert name to lowercase and replace spaces with hyphens
-    name_slug = name.lower().replace(' ', '-') if pd.notna(name) else 'player'
-    stat_type = 'pitching' if is_pitcher else 'hitting'
-    return f"https://baseballsavant.mlb.com/savant-player/{name_slug}-{player_id}?stats=statcast-r-{stat_type}-mlb"
+def filter_view(view, version, index_version, name_index=None, key_col="MLBAMID"):
+    """
+    Narrows `view` by the custom query, the drafted toggle and (given a
+    `name_index`) the name filter. Each only adds to the view's mask, so
+    nothing is copied until the table is materialized.
+    """
+    with view.stage("query"):
+        view.filter(custom_query_mask(view, version, index_version=index_version))
+    with view.stage("drafted"):
+        view.filter(drafted_mask(view, show_drafted))
+    if name_index is not None:
+        with view.stage("name filter"):
+            view.filter(names_mask(view, name_index, key_col))
+    return view
+
+def shown_rows(table):
+    """How many of `table`'s top rows to show: a page, plus one per "Load More" click."""
+    return page_size * st.session_state.get(f"{table}_pages", 1)
+
+def load_more(table):
+    st.session_state[f"{table}_pages"] = st.session_state.get(f"{table}_pages", 1) + 1
+
+def render_table(table, df, **options):
+    """st.dataframe, timed as the table's render span."""
+    with spans.span("render", table=table):
+        st.dataframe(df, **options)
+
+def load_more_button(table, shown, total):
+    """Shows how much of the table is displayed, with a button for the next page."""
+    if shown < total:
+        st.caption(f"Showing the top {shown:,} of {total:,} players.")
+        st.button("Load More", key=f"{table}_load_more", on_click=load_more, args=(table,))
 
 # -------------------------------#
-# 4. LOAD ALL CSV FILES
+# 4. LOAD PROJECTION SOURCES
 # -------------------------------#
 
-@st.cache_data(ttl=24*3600)
-def load_csv_files():
+@spans.cached("load", st.cache_data(ttl=24*3600))
+def load_source_df(name, fingerprint):
     """
-    Load all the raw CSVs.
+    Load one projection source.
     Make sure each has:
        - MLBAMID (unique identifier)
        - WAR (2025 projection)
        - Age
        - Position
        - etc.
+    Each CSV is read through its Feather cache (see sources.py), which is
+    rebuilt automatically when the CSV changes, with the dtypes declared
+    in the source's schema. `fingerprint` is the CSV's content hash: it is
+    only part of the cache key, so a changed file misses the cache on its
+    own while every other source stays cached.
     """
-    zips_hitters = pd.read_csv('zips-hitters-2025.csv')
-    zips_pitchers = pd.read_csv('zips-pitchers-2025.csv')
-    steamer_hitters = pd.read_csv('steamer600-hitters-2025.csv')
-    steamer_pitchers = pd.read_csv('steamer600-pitchers-2025.csv')
-    batx_hitters = pd.read_csv('batx-hitters-2025.csv')
-    ba_top_100 = pd.read_csv('ba_top_100.csv')
-    return zips_hitters, zips_pitchers, steamer_hitters, steamer_pitchers, batx_hitters, ba_top_100
+    return load_source(name)
+
+# Content hash per source; cheap to check since hashes are only redone when a file's mtime moves
+source_fingerprints = {name: source_fingerprint(name) for name in SOURCES}
 
-zips_hitters_df, zips_pitchers_df, steamer_hitters_df, steamer_pitchers_df, batx_hitters_df, ba_top_100_df = load_csv_files()
+ba_top_100_df = load_source_df("ba_top_100", source_fingerprints["ba_top_100"])
 
 # Load drafted players
 drafted_dict = load_drafted_players()  # {playerName -> draftPos}
@@ -267,155 +221,173 @@ drafted_dict = load_drafted_players()  # {playerName -> draftPos}
 # 5. PREPARE MERGED DATAFRAMES
 # -------------------------------#
 
-# ---- HELPER: rename columns after computing career WAR ----
-def prep_projection_df(
-    df, 
-    system_name, 
-    is_pitcher=False, 
-    discount=False, 
-    flatten=False,
-    war_col="WAR",
-    rename_age_pos=False
-):
-    """
-    1) Calculate career WAR (standard & flatten).
-    2) Rename columns from 'WAR' -> '{system_name}WAR' 
-       and 'CareerWAR' -> '{system_name}Career'.
-    3) Return the subset of columns we want: 
-       [MLBAMID, {system_name}WAR, {system_name}Career, (optionally Age, Position, NameASCII)]
-    4) If rename_age_pos=True, we keep the Age, Position, NameASCII from this df 
-       for later merges (i.e. Steamer is the "source" for age/position).
-    """
-    df = df.copy()
-    # Calculate career WAR in a column "CareerWAR"
-    df = calculate_career_war(
-        df, 
-        is_pitcher=is_pitcher, 
-        discount=discount, 
-        flatten=flatten, 
-        war_col=war_col,
-        new_col="CareerWAR"
-    )
-    
-    # Round single-year WAR
-    df[war_col] = df[war_col].round(1)
-
-    # Rename columns for clarity
-    df.rename(
-        columns={
-            war_col: f"{system_name}WAR",
-            "CareerWAR": f"{system_name}Career"
-        }, 
-        inplace=True
-    )
-    
-    # Decide what columns to keep
-    keep_cols = ["MLBAMID", f"{system_name}WAR", f"{system_name}Career", "PlayerId"]  # Added PlayerId
-    if rename_age_pos:
-        # Keep Age, Position, NameASCII from this system (Steamer recommended)
-        for c in ["Age", "Position", "NameASCII", "Team"]:
-            if c in df.columns:
-                keep_cols.append(c)
-    
-    # Only keep columns that exist in the dataframe
-    keep_cols = [col for col in keep_cols if col in df.columns]
-    return df[keep_cols].copy()
+@spans.cached("project", st.cache_data(ttl=24*3600))
+def load_projected_df(name, system_name, is_pitcher, fingerprint, extra_cols=()):
+    """
+    Load one source and compute its career WAR columns.
+    Cached per source (keyed by its fingerprint), so re-projecting after a
+    CSV changes only touches that one system.
+    """
+    return project_source(load_source_df(name, fingerprint), system_name, is_pitcher, extra_cols=extra_cols)
 
 
 # -------------------------------#
 # 5A. MERGE HITTERS
 # -------------------------------#
 
-@st.cache_data(ttl=24*3600)
-def build_merged_hitters_df(discount=False, flatten=False):
+@spans.cached("merge", st.cache_data(ttl=24*3600))
+def build_merged_hitters_df(fingerprints):
     """
     Merge (ZiPS, Steamer, BATX) hitters on MLBAMID.
     Position, Age, Name come from Steamer by default, falling back to ZiPS then BatX.
+    Career columns are filled for every toggle combination; see select_career_variant.
+    ConsensusCareer blends them with board.CONSENSUS_WEIGHTS, once per data version.
+    `fingerprints` maps each hitter source to its content hash.
     """
-    # First, prep each projection's df
-    # Keep Age/Position/Name from all systems for fallback
-    zips_h = prep_projection_df(zips_hitters_df, "ZiPS", is_pitcher=False, discount=discount, flatten=flatten, war_col="WAR", rename_age_pos=True)
-    steamer_h = prep_projection_df(steamer_hitters_df, "Steamer", is_pitcher=False, discount=discount, flatten=flatten, war_col="WAR", rename_age_pos=True)
-    batx_h = prep_projection_df(batx_hitters_df, "BatX", is_pitcher=False, discount=discount, flatten=flatten, war_col="WAR", rename_age_pos=True)
-
-    # Add wRC+ columns from each system if they exist
-    if "wRC+" in zips_hitters_df.columns:
-        zips_h["ZiPS_wRC+"] = zips_hitters_df["wRC+"]
-    if "wRC+" in steamer_hitters_df.columns:
-        steamer_h["Steamer_wRC+"] = steamer_hitters_df["wRC+"]
-    if "wRC+" in batx_hitters_df.columns:
-        batx_h["BatX_wRC+"] = batx_hitters_df["wRC+"]
-
-    # Merge on MLBAMID
-    merged = steamer_h.merge(zips_h, on="MLBAMID", how="outer", suffixes=("", "_ZiPS"))
-    merged = merged.merge(batx_h, on="MLBAMID", how="outer", suffixes=("", "_BatX"))
-    
-    # Fill missing demographic data from ZiPS then BatX
-    for col in ["Age", "Position", "NameASCII", "Team"]:
-        if col in merged.columns:
-            merged[col] = merged[col].fillna(merged[f"{col}_ZiPS"] if f"{col}_ZiPS" in merged.columns else np.nan)
-            merged[col] = merged[col].fillna(merged[f"{col}_BatX"] if f"{col}_BatX" in merged.columns else np.nan)
-    
-    # Drop the extra demographic columns
-    cols_to_drop = [c for c in merged.columns if c.endswith(("_ZiPS", "_BatX")) and c.split("_")[0] in ["Age", "Position", "NameASCII", "Team"]]
-    merged = merged.drop(columns=cols_to_drop)
-    
-    # Calculate average wRC+ across systems
-    wrc_cols = [col for col in merged.columns if "wRC+" in col]
-    if wrc_cols:
-        merged["Avg_wRC+"] = merged[wrc_cols].mean(axis=1, skipna=True).round(0)
-    
-    return merged
+    return merge_hitters([
+        load_projected_df(name, system, False, fingerprints[name], extra_cols=HITTER_EXTRA_COLS)
+        for system, name in HITTER_SYSTEMS
+    ])
 
 
 # -------------------------------#
 # 5B. MERGE PITCHERS
 # -------------------------------#
 
-@st.cache_data(ttl=24*3600)
-def build_merged_pitchers_df(discount=False, flatten=False):
+@spans.cached("merge", st.cache_data(ttl=24*3600))
+def build_merged_pitchers_df(fingerprints):
     """
     Merge ZiPS and Steamer pitchers on MLBAMID.
     Position, Age, Name come from Steamer by default, falling back to ZiPS.
+    Career columns are filled for every toggle combination; see select_career_variant.
+    ConsensusCareer blends them with board.CONSENSUS_WEIGHTS, once per data version.
+    `fingerprints` maps each pitcher source to its content hash.
     """
-    zips_p = prep_projection_df(zips_pitchers_df, "ZiPS", is_pitcher=True, discount=discount, flatten=flatten, war_col="WAR", rename_age_pos=True)
-    steamer_p = prep_projection_df(steamer_pitchers_df, "Steamer", is_pitcher=True, discount=discount, flatten=flatten, war_col="WAR", rename_age_pos=True)
+    return merge_pitchers([
+        load_projected_df(name, system, True, fingerprints[name], extra_cols=PITCHER_EXTRA_COLS)
+        for system, name in PITCHER_SYSTEMS
+    ])
 
-    merged = steamer_p.merge(zips_p, on="MLBAMID", how="outer", suffixes=("", "_ZiPS"))
-    
-    # Fill missing demographic data from ZiPS
-    for col in ["Age", "Position", "NameASCII", "Team"]:
-        if col in merged.columns:
-            merged[col] = merged[col].fillna(merged[f"{col}_ZiPS"] if f"{col}_ZiPS" in merged.columns else np.nan)
-    
-    # Drop the extra demographic columns
-    cols_to_drop = [c for c in merged.columns if c.endswith("_ZiPS") and c.split("_")[0] in ["Age", "Position", "NameASCII", "Team"]]
-    merged = merged.drop(columns=cols_to_drop)
-    
-    return merged
+
+# -------------------------------#
+# 5C. MERGE RELIEVERS
+# -------------------------------#
+
+@spans.cached("merge", st.cache_data(ttl=24*3600))
+def build_relievers_df(fingerprints):
+    """
+    ZiPS relievers (G > 4 * GS) with Steamer's age and rate stats alongside.
+    Returns None if the ZiPS pitchers data has no G/GS columns.
+    """
+    return merge_relievers(
+        load_source_df("zips_pitchers", fingerprints["zips_pitchers"]),
+        load_source_df("steamer_pitchers", fingerprints["steamer_pitchers"]),
+    )
+
+def fingerprints_for(names):
+    """The fingerprints a build depends on, so unrelated file changes don't invalidate it."""
+    return {name: source_fingerprints[name] for name in names}
 
 
 # -------------------------------#
 # 6. BUILD FINAL DATAFRAMES
 # -------------------------------#
 
-hitters_merged = build_merged_hitters_df(discount=use_discount_rate, flatten=use_flat_curve)
-pitchers_merged = build_merged_pitchers_df(discount=use_discount_rate, flatten=use_flat_curve)
-
-# Add a "DraftPos" column by matching the player's *NameASCII* to your drafted_dict
-def mark_drafted_column(df):
-    df = df.copy()
-    if "NameASCII" in df.columns:
-        # Create a case-insensitive mapping from player names to draft positions
-        case_insensitive_dict = {k.lower(): v for k, v in drafted_dict.items()}
-        # Map using lowercase names for case-insensitive matching
-        df["DraftPos"] = df["NameASCII"].str.lower().map(case_insensitive_dict)
-    else:
-        df["DraftPos"] = None
-    return df
+def select_career_variant(view, discount, flatten):
+    """
+    Points each '{system}Career' column at the variant chosen by the toggles.
+    All variants are precomputed, so this only copies columns, and only for
+    the rows that are queried or displayed.
+    """
+    for col, source in career_variant_columns(view.df.columns, discount, flatten).items():
+        view.derive(col, [source], lambda frame, source=source: frame[source])
+    return view
+
+hitter_fingerprints = fingerprints_for(name for _, name in HITTER_SYSTEMS)
+pitcher_fingerprints = fingerprints_for(name for _, name in PITCHER_SYSTEMS)
+reliever_fingerprints = fingerprints_for(RELIEVER_SOURCES)
+
+# Views over the cached frames: filters narrow a row mask and nothing is copied until display
+hitters_view = select_career_variant(View(build_merged_hitters_df(hitter_fingerprints), "Hitters"), use_discount_rate, use_flat_curve)
+pitchers_view = select_career_variant(View(build_merged_pitchers_df(pitcher_fingerprints), "Pitchers"), use_discount_rate, use_flat_curve)
+
+@st.cache_resource
+def get_name_index(version, _names, _keys):
+    """
+    Normalized name -> player keys, built once per data version.
+    `_names` and `_keys` (not hashed) are the columns to index.
+    """
+    return NameIndex(_names, _keys)
 
-hitters_merged = mark_drafted_column(hitters_merged)
-pitchers_merged = mark_drafted_column(pitchers_merged)
+# One index over every projected player, keyed by MLBAMID
+player_name_index = get_name_index(
+    frame_version("players", {**hitter_fingerprints, **pitcher_fingerprints}),
+    pd.concat([hitters_view.df["NameASCII"], pitchers_view.df["NameASCII"]]),
+    pd.concat([hitters_view.df["MLBAMID"], pitchers_view.df["MLBAMID"]]),
+)
+
+@st.cache_resource
+def get_draft_column(frame_name, fingerprints, _keys, _name_index):
+    """
+    DraftPos values for one cached frame, kept across reruns and sessions.
+    Keyed on the frame's data version, since rows are matched by position;
+    `_keys` (not hashed) are the frame's player keys and `_name_index`
+    resolves sheet names to them.
+    """
+    return DraftColumn(_keys, _name_index)
+
+def confirmed_picks(name_index):
+    """
+    {player key: draft position} for the sheet names without an exact
+    match whose closest match was confirmed in the expander below.
+    """
+    picks = {}
+    for name, pos in drafted_dict.items():
+        if st.session_state.get(f"confirm_pick_{name}") and name not in name_index:
+            picks.update(dict.fromkeys(name_index.resolve(name)[0], pos))
+    return picks
+
+# Add a "DraftPos" column by matching the player's name to your drafted_dict
+def mark_drafted_column(view, frame_name, fingerprints, name_index, key_col="MLBAMID", confirmed=None):
+    """
+    Sheet names are matched in normalized form through `name_index`. Only
+    picks made since the frame was last marked are applied (see
+    draft.DraftColumn), so a new pick updates just that player's rows.
+    `confirmed` adds the {key: pick} of approximate matches the user
+    accepted. `view` must be over the cached frame for `fingerprints`.
+    """
+    with view.stage("mark drafted"):
+        if key_col not in view.df.columns:
+            view.assign("DraftPos", np.full(len(view), np.nan))
+        else:
+            draft_column = get_draft_column(frame_name, fingerprints, view.df[key_col], name_index)
+            draft_pos = draft_column.sync(get_draft_poller())
+            if confirmed:
+                keys = view.df[key_col]
+                matched = keys.isin(confirmed.keys()).to_numpy()
+                draft_pos[matched] = keys[matched].map(confirmed).to_numpy(dtype=float)
+            view.assign("DraftPos", draft_pos)
+    return view
+
+# Closest matches confirmed in the expander below count as picks too. The sheet's version is read
+# before marking, so a pick landing mid-rerun can only make this version older than the data
+player_confirmed_picks = confirmed_picks(player_name_index)
+draft_version = (get_draft_poller().version, tuple(sorted(player_confirmed_picks.items())))
+mark_drafted_column(hitters_view, "hitters", hitter_fingerprints, player_name_index, confirmed=player_confirmed_picks)
+mark_drafted_column(pitchers_view, "pitchers", pitcher_fingerprints, player_name_index, confirmed=player_confirmed_picks)
+hitters_version = frame_version("hitters", hitter_fingerprints, use_discount_rate, use_flat_curve)
+pitchers_version = frame_version("pitchers", pitcher_fingerprints, use_discount_rate, use_flat_curve)
+
+# Draft sheet names without an exact match, with what they were matched to (if anything)
+sheet_matches = [(name, *player_name_index.resolve(name)) for name in drafted_dict if name not in player_name_index]
+if sheet_matches:
+    with st.expander(f"Draft Sheet Names Without an Exact Match ({len(sheet_matches)})"):
+        st.caption("Only exact name matches are marked drafted. Check a closest match to mark that player too.")
+        for name, keys, matched, confidence in sheet_matches:
+            if keys:
+                st.checkbox(f"🔎 {name} → {matched} ({confidence:.0%})", key=f"confirm_pick_{name}")
+            else:
+                st.write(f"❓ {name}: not found in projections")
 
 # Now add the name filter expander here
 with st.expander("Filter by Names"):
@@ -433,55 +405,39 @@ with st.expander("Filter by Names"):
 
     # Add drafted players check and not found check
     if st.session_state.name_list:
-        names = [name.strip() for name in st.session_state.name_list.replace('\n', ',').split(',')]
-        names = [name for name in names if name]
-        
-        # Get all unique names from our datasets
-        all_names = set()
-        if 'NameASCII' in hitters_merged.columns:
-            all_names.update(hitters_merged['NameASCII'].str.lower().dropna())
-        if 'NameASCII' in pitchers_merged.columns:
-            all_names.update(pitchers_merged['NameASCII'].str.lower().dropna())
-        
-        # Case-insensitive matching for drafted and not found names
-        drafted_names = [name for name in names if name.lower() in {k.lower() for k in drafted_dict.keys()}]
-        not_found_names = [name for name in names if name.lower() not in all_names and name]
+        names = parse_name_list(st.session_state.name_list)
+
+        # Drafted as marked in the tables; names in the list are matched approximately, through the shared index
+        drafted_ids = player_name_index.lookup_many(drafted_dict) | set(player_confirmed_picks)
+        resolved = {name: player_name_index.resolve(name) for name in names}
+        drafted_names = [name for name in names if drafted_ids.intersection(resolved[name][0])]
+        not_found_names = [name for name in names if not resolved[name][0]]
+        approximate = [
+            f"{name} → {matched} ({confidence:.0%})"
+            for name, (keys, matched, confidence) in resolved.items() if keys and confidence < 1
+        ]
         
         if drafted_names:
             st.write("🎯 Already drafted: " + ", ".join(drafted_names))
+        if approximate:
+            st.write("🔎 Closest match: " + ", ".join(approximate))
         if not_found_names:
             st.write("❓ Not found in data: " + ", ".join(not_found_names))
 
-# Filter drafted or not, based on toggle
-hitters_final = filter_drafted(hitters_merged, show_drafted)
-pitchers_final = filter_drafted(pitchers_merged, show_drafted)
-
-# Apply custom query if needed
-hitters_final = apply_custom_query(hitters_final)
-pitchers_final = apply_custom_query(pitchers_final)
-
-# Add StatcastURL to columns before displaying
-hitters_final = hitters_final.copy()  # Ensure we have a copy
-hitters_final.loc[:, "StatcastURL"] = hitters_final.apply(
-    lambda x: create_statcast_url(x["MLBAMID"], x["NameASCII"], is_pitcher=False), 
-    axis=1
-)
-
-# Add StatcastURL to columns before displaying
-pitchers_final = pitchers_final.copy()  # Ensure we have a copy
-pitchers_final.loc[:, "StatcastURL"] = pitchers_final.apply(
-    lambda x: create_statcast_url(x["MLBAMID"], x["NameASCII"], is_pitcher=True), 
-    axis=1
-)
-
-# Keep these filter calls before the tabs
-hitters_final = filter_by_names(hitters_final)
-pitchers_final = filter_by_names(pitchers_final)
+# Custom query, drafted toggle and name filter, as masks over the full frames so
+# query masks and indexes are reused across reruns
+filter_view(hitters_view, (hitters_version, draft_version), hitters_version, player_name_index)
+filter_view(pitchers_view, (pitchers_version, draft_version), pitchers_version, player_name_index)
 
 # -------------------------------#
 # 7. DISPLAY TABS
 # -------------------------------#
 
+# Career columns the hitters and pitchers can be ranked by
+RANK_BY_LABELS = {
+    "ConsensusCareer": "Consensus", "SteamerCareer": "Steamer600", "ZiPSCareer": "ZiPS", "BatXCareer": "BatX",
+}
+
 tab1, tab2, tab3, tab4 = st.tabs([
     "🏃 Hitters", 
     "⚾ Pitchers",
@@ -494,12 +450,20 @@ with tab1:
     
     # Add position filter here, at the start of the hitters tab
     positions = ["C", "1B", "2B", "3B", "SS", "OF", "DH"]  # Common positions
-    selected_positions = st.multiselect(
-        "Filter by Position(s)",
-        options=positions,
-        default=[],
-        help="Select one or more positions to filter the hitters table"
-    )
+    position_col, rank_col = st.columns([3, 1])
+    with position_col:
+        selected_positions = st.multiselect(
+            "Filter by Position(s)",
+            options=positions,
+            default=[],
+            help="Select one or more positions to filter the hitters table"
+        )
+    with rank_col:
+        hitters_rank_by = st.selectbox(
+            "Rank By", ["ConsensusCareer", "SteamerCareer", "ZiPSCareer", "BatXCareer"], key="hitters_rank_by",
+            format_func=RANK_BY_LABELS.get,
+            help="Consensus blends every system that projects a player, so nobody drops out for one missing projection."
+        )
     
     # Filter by selected positions if any are chosen
     if selected_positions:
@@ -510,9 +474,10 @@ with tab1:
                 expanded_positions.extend(["OF", "LF", "CF", "RF"])
             else:
                 expanded_positions.append(pos)
-        hitters_final = hitters_final[hitters_final["Position"].isin(expanded_positions)]
+        with hitters_view.stage("positions"):
+            hitters_view.filter(pd.Series(hitters_view.column("Position")).isin(expanded_positions))
     
-    # Add FangraphsURL and StatcastURL to columns
+    # FangraphsURL and StatcastURL come with the cached frame
     columns_to_show = [
         "NameASCII", 
         "Position", 
@@ -524,21 +489,19 @@ with tab1:
         "ZiPSCareer", 
         "SteamerCareer", 
         "BatXCareer",
+        "ConsensusCareer",
         "FangraphsURL",
         "StatcastURL"
     ]
     if show_drafted:
         columns_to_show.insert(0, "DraftPos")
     
-    # Create FangraphsURL column before displaying
-    hitters_final = hitters_final.copy()
-    hitters_final["FangraphsURL"] = hitters_final["PlayerId"].apply(create_fangraphs_url)
+    # Only columns that exist are built (some might be NaN if not projected by BatX, etc.)
+    hitters_final = hitters_view.materialize(columns_to_show, sort_by=hitters_rank_by, limit=shown_rows("hitters"))
     
-    # Make sure the columns exist in final df (some might be NaN if not projected by BatX, etc.)
-    columns_to_show = [c for c in columns_to_show if c in hitters_final.columns]
-    
-    st.dataframe(
-        hitters_final[columns_to_show].sort_values("SteamerCareer", ascending=False),
+    render_table(
+        "Hitters",
+        hitters_final,
         hide_index=True,
         use_container_width=True,
         height=600,
@@ -550,6 +513,7 @@ with tab1:
             "ZiPSCareer":  st.column_config.NumberColumn("ZiPS Career", format="%.1f"),
             "SteamerCareer": st.column_config.NumberColumn("Steamer600 Career", format="%.1f"),
             "BatXCareer":  st.column_config.NumberColumn("BatX Career", format="%.1f"),
+            "ConsensusCareer": st.column_config.NumberColumn("Consensus Career", format="%.1f"),
             "Avg_wRC+": st.column_config.NumberColumn("Avg wRC+", format="%d"),  # Format as integer
             "FangraphsURL": st.column_config.LinkColumn(
                 "Fangraphs",
@@ -561,10 +525,17 @@ with tab1:
             ),
         }
     )
+    load_more_button("hitters", len(hitters_final), hitters_view.rows)
 
 with tab2:
     st.subheader("Pitchers - ZiPS & Steamer")
-    
+
+    pitchers_rank_by = st.selectbox(
+        "Rank By", ["ConsensusCareer", "SteamerCareer", "ZiPSCareer"], key="pitchers_rank_by",
+        format_func=RANK_BY_LABELS.get,
+        help="Consensus blends every system that projects a player, so nobody drops out for one missing projection."
+    )
+
     columns_to_show = [
         "NameASCII",
         "Position",
@@ -573,20 +544,18 @@ with tab2:
         "SteamerWAR",
         "ZiPSCareer",
         "SteamerCareer",
+        "ConsensusCareer",
         "FangraphsURL",
         "StatcastURL"
     ]
     if show_drafted:
         columns_to_show.insert(0, "DraftPos")
     
-    # Create FangraphsURL column before displaying
-    pitchers_final = pitchers_final.copy()
-    pitchers_final["FangraphsURL"] = pitchers_final["PlayerId"].apply(create_fangraphs_url)
-    
-    columns_to_show = [c for c in columns_to_show if c in pitchers_final.columns]
+    pitchers_final = pitchers_view.materialize(columns_to_show, sort_by=pitchers_rank_by, limit=shown_rows("pitchers"))
     
-    st.dataframe(
-        pitchers_final[columns_to_show].sort_values("SteamerCareer", ascending=False),
+    render_table(
+        "Pitchers",
+        pitchers_final,
         hide_index=True,
         use_container_width=True,
         height=600,
@@ -596,6 +565,7 @@ with tab2:
             "SteamerWAR": st.column_config.NumberColumn("Steamer600 WAR", format="%.1f"),
             "ZiPSCareer":  st.column_config.NumberColumn("ZiPS Career", format="%.1f"),
             "SteamerCareer": st.column_config.NumberColumn("Steamer600 Career", format="%.1f"),
+            "ConsensusCareer": st.column_config.NumberColumn("Consensus Career", format="%.1f"),
             "FangraphsURL": st.column_config.LinkColumn(
                 "Fangraphs",
                 display_text="Fangraphs"
@@ -606,60 +576,28 @@ with tab2:
             ),
         }
     )
+    load_more_button("pitchers", len(pitchers_final), pitchers_view.rows)
 
 with tab3:
     st.subheader("Relievers")
     
-    # Create reliever-specific dataframe from ZiPS data
-    if all(col in zips_pitchers_df.columns for col in ["G", "GS"]):
-        # Start with ZiPS data and filter for relievers
-        relievers_df = zips_pitchers_df[
-            zips_pitchers_df["G"] > 4 * zips_pitchers_df["GS"]
-        ].copy()
-        
-        # Keep relevant ZiPS columns
-        zips_cols = ["MLBAMID", "NameASCII", "IP", "ERA", "FIP", "WAR", "PlayerId"]  # Added PlayerId
-        relievers_df = relievers_df[
-            [col for col in zips_cols if col in relievers_df.columns]
-        ].copy()
-        
-        # Rename ZiPS columns (except MLBAMID, NameASCII, and PlayerId)
-        rename_cols = {col: f"ZiPS_{col}" for col in zips_cols[2:-1]}  # Skip MLBAMID, NameASCII, PlayerId
-        relievers_df.columns = ["MLBAMID", "NameASCII"] + [f"ZiPS_{col}" for col in zips_cols[2:-1]] + ["PlayerId"]
-        
-        # Merge with Steamer data
-        steamer_cols = ["MLBAMID", "Age", "ERA", "FIP", "WAR"]
-        steamer_relief = steamer_pitchers_df[steamer_cols].copy()
-        steamer_relief.columns = ["MLBAMID", "Age"] + [f"Steamer_{col}" for col in steamer_cols[2:]]
-        
-        # Merge ZiPS and Steamer
-        relievers_df = relievers_df.merge(
-            steamer_relief, 
-            on="MLBAMID", 
-            how="left"
-        )
-        
+    relievers_df = build_relievers_df(reliever_fingerprints)
+    relievers_view = None
+    if relievers_df is not None:
+        relievers_view = View(relievers_df, "Relievers")
         # Mark drafted players
-        relievers_df = mark_drafted_column(relievers_df)
-        relievers_df = filter_drafted(relievers_df, show_drafted)
-        relievers_df = apply_custom_query(relievers_df)
-        relievers_df = filter_by_names(relievers_df)
-
-        # Add FangraphsURL column
-        if "PlayerId" in relievers_df.columns:
-            relievers_df["FangraphsURL"] = relievers_df["PlayerId"].apply(create_fangraphs_url)
-        else:
-            relievers_df["FangraphsURL"] = None
-            st.warning("PlayerId column not found - Fangraphs links unavailable")
+        mark_drafted_column(
+            relievers_view, "relievers", reliever_fingerprints, player_name_index, confirmed=player_confirmed_picks
+        )
+        relievers_version = frame_version("relievers", reliever_fingerprints)
+        filter_view(relievers_view, (relievers_version, draft_version), relievers_version, player_name_index)
 
-        # Add StatcastURL column
-        if "MLBAMID" in relievers_df.columns:
-            relievers_df["StatcastURL"] = relievers_df.apply(
-                lambda x: create_statcast_url(x["MLBAMID"], x["NameASCII"], is_pitcher=True), 
-                axis=1
-            )
-        else:
-            relievers_df["StatcastURL"] = None
+        # Link columns come with the cached frame (see board.add_link_columns)
+        if "FangraphsURL" not in relievers_view.columns:
+            relievers_view.assign("FangraphsURL", np.full(len(relievers_view), None))
+            st.warning("PlayerId column not found - Fangraphs links unavailable")
+        if "StatcastURL" not in relievers_view.columns:
+            relievers_view.assign("StatcastURL", np.full(len(relievers_view), None))
             st.warning("MLBAMID column not found - Statcast links unavailable")
 
         # Columns to display - reordered to group similar stats
@@ -679,8 +617,11 @@ with tab3:
         if show_drafted:
             columns_to_show.insert(0, "DraftPos")
 
-        st.dataframe(
-            relievers_df[columns_to_show].sort_values("ZiPS_WAR", ascending=False),
+        relievers_final = relievers_view.materialize(columns_to_show, sort_by="ZiPS_WAR", limit=shown_rows("relievers"))
+
+        render_table(
+            "Relievers",
+            relievers_final,
             hide_index=True,
             use_container_width=True,
             height=600,
@@ -704,6 +645,7 @@ with tab3:
                 ),
             }
         )
+        load_more_button("relievers", len(relievers_final), relievers_view.rows)
     else:
         st.info("Missing required columns (G, GS) in ZiPS pitchers data to identify relievers.")
 
@@ -715,19 +657,18 @@ with tab4:
     if show_drafted:
         columns_to_display.insert(0, "DraftPos")
     
-    # Mark drafted players in BA Top 100
-    ba_top_100_df = ba_top_100_df.copy()
-    # Create case-insensitive mapping for BA Top 100
-    case_insensitive_dict = {k.lower(): v for k, v in drafted_dict.items()}
-    ba_top_100_df["DraftPos"] = ba_top_100_df["Name"].str.lower().map(case_insensitive_dict)
-    filtered_ba = filter_drafted(ba_top_100_df, show_drafted)
-    filtered_ba = apply_custom_query(filtered_ba)
-
-    # Display
-    columns_to_display = [c for c in columns_to_display if c in filtered_ba.columns]
+    # Mark drafted players in BA Top 100 (no MLBAMIDs here, so prospects are keyed by rank)
+    ba_version = frame_version("ba_top_100", fingerprints_for(["ba_top_100"]))
+    ba_name_index = get_name_index(ba_version, ba_top_100_df["Name"], ba_top_100_df["Rank"])
+    ba_view = mark_drafted_column(
+        View(ba_top_100_df, "BA Top 100"), "ba_top_100", fingerprints_for(["ba_top_100"]), ba_name_index, key_col="Rank"
+    )
+    filter_view(ba_view, (ba_version, draft_version), ba_version)
+    filtered_ba = ba_view.materialize(columns_to_display, sort_by="Rank", ascending=True, limit=shown_rows("ba_top_100"))
     
-    st.dataframe(
-        filtered_ba[columns_to_display].sort_values("Rank"),
+    render_table(
+        "BA Top 100",
+        filtered_ba,
         hide_index=True,
         use_container_width=True,
         height=600,
@@ -736,3 +677,26 @@ with tab4:
             "Rank": st.column_config.NumberColumn("Rank", format="%d")
         }
     )
+    load_more_button("ba_top_100", len(filtered_ba), ba_view.rows)
+
+# Each table's filter stages, with the rows left after them, then the rerun as a whole
+if spans.enabled:
+    for view in (hitters_view, pitchers_view, relievers_view, ba_view):
+        for stage in view.trace if view is not None else ():
+            spans.add({**stage, "table": view.name})
+    spans.add({"stage": "rerun", "ms": spans.elapsed_ms()})
+
+if show_timings:
+    with st.expander("Timings"):
+        timings = spans.frame()
+        cache_calls = timings["cache"].value_counts()
+        st.caption(
+            f"Rerun took {spans.elapsed_ms():.0f} ms; "
+            f"{cache_calls.get('hit', 0)} cache hits, {cache_calls.get('miss', 0)} misses."
+        )
+        st.dataframe(
+            timings,
+            hide_index=True,
+            use_container_width=True,
+            column_config={"ms": st.column_config.NumberColumn("ms", format="%.2f")},
+        )
@@ -0,0 +1,243 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from board import (
+    HITTER_EXTRA_COLS, HITTER_SYSTEMS, PITCHER_EXTRA_COLS, PITCHER_SYSTEMS, career_variant_columns, merge_hitters,
+    merge_pitchers, merge_relievers, project_source
+)
+from projection import calculate_career_war
+from names import FuzzyMatcher, normalize_name
+from parallel import ShardExecutor
+from query import compile_query
+from simulation import simulate_frame
+from sources import DATA_DIR, SOURCES, read_csv_with_schema
+from view import DEFAULT_PAGE_SIZE, View
+
+BASELINE_PATH = os.path.join(DATA_DIR, ".benchmark_baseline.json")
+SCALES = (1, 10, 100)
+REPEAT = 3
+
+# A comparison fails when a stage is this much slower (or uses this much more
+# memory) than the baseline; MIN_SLOWDOWN ignores jitter on very fast stages
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.25
+MIN_SLOWDOWN = 0.005  # seconds
+
+# Copies of a player get MLBAMIDs this far apart, so scaled sources still merge one-to-one
+ID_STRIDE = 1_000_000
+
+# Simulated careers per player in the simulate stage; fewer than the default keeps 100x runs short
+BENCH_SIMULATIONS = 100
+
+PROJECTION_SOURCES = [name for _, name in HITTER_SYSTEMS + PITCHER_SYSTEMS]
+
+# -------------------------------#
+# SYNTHETIC SOURCES
+# -------------------------------#
+
+def scale_frame(df, scale):
+    """`scale` copies of a source, each with its own MLBAMIDs (and PlayerIds)."""
+    if scale == 1:
+        return df
+    copies = np.repeat(np.arange(scale), len(df))
+    scaled = pd.concat([df] * scale, ignore_index=True)
+    scaled["MLBAMID"] = scaled["MLBAMID"] + copies * ID_STRIDE
+    if "PlayerId" in scaled.columns:
+        scaled["PlayerId"] = scaled["PlayerId"].astype(str) + np.where(copies > 0, "-" + copies.astype(str), "")
+    return scaled
+
+def write_scaled_sources(scale, directory):
+    """
+    Writes each projection CSV (just its schema's columns) repeated
+    `scale` times into `directory`. Returns {source name: CSV path}; at
+    scale 1 these are the shipped CSVs themselves.
+    """
+    paths = {}
+    for name in PROJECTION_SOURCES:
+        source = SOURCES[name]
+        csv_path = os.path.join(DATA_DIR, source["path"])
+        if scale == 1:
+            paths[name] = csv_path
+            continue
+        df = read_csv_with_schema(csv_path, source["schema"])
+        paths[name] = os.path.join(directory, f"{scale}x-{source['path']}")
+        scale_frame(df, scale).to_csv(paths[name], index=False)
+    return paths
+
+# -------------------------------#
+# STAGES
+# -------------------------------#
+
+def load_stage(paths):
+    return {name: read_csv_with_schema(path, SOURCES[name]["schema"]) for name, path in paths.items()}
+
+def project_stage(sources, executor=None):
+    hitters = [
+        project_source(sources[name], system, False, extra_cols=HITTER_EXTRA_COLS, executor=executor)
+        for system, name in HITTER_SYSTEMS
+    ]
+    pitchers = [
+        project_source(sources[name], system, True, extra_cols=PITCHER_EXTRA_COLS, executor=executor)
+        for system, name in PITCHER_SYSTEMS
+    ]
+    return hitters, pitchers
+
+def render_stage(hitters):
+    """A typical rerun of the hitters tab: discounted careers, a query, undrafted only, one page."""
+    view = View(hitters, "Hitters")
+    for col, source in career_variant_columns(hitters.columns, True, False).items():
+        view.derive(col, [source], lambda frame, source=source: frame[source])
+    view.assign("DraftPos", np.where(np.arange(len(hitters)) % 20 == 0, 1.0, np.nan))
+    query = compile_query("SteamerWAR > 0.5 and Age < 30")
+    view.filter(query.mask(view.frame(query.columns)))
+    view.filter(pd.isna(view.column("DraftPos")))
+    return view.materialize(
+        ["NameASCII", "Position", "Age", "ZiPSCareer", "SteamerCareer", "BatXCareer", "FangraphsURL"],
+        sort_by="SteamerCareer", limit=DEFAULT_PAGE_SIZE,
+    )
+
+def fuzzy_match_stage(matcher, names):
+    """Approximate lookups of `names` with one letter dropped, as for unmatched draft sheet names."""
+    return [matcher.match(name[:1] + name[2:]) for name in names]
+
+def stages(paths, executor=None):
+    """
+    (stage name, rows processed, function) in pipeline order. Each stage's
+    input is built by running the stages before it once, outside the timing.
+    `executor` (a parallel.ShardExecutor) runs the project and simulate stages.
+    """
+    sources = load_stage(paths)
+    hitters, pitchers = project_stage(sources)
+    merged_hitters = merge_hitters([df.copy() for df in hitters])
+    steamer = sources["steamer_hitters"]
+    player_names = merged_hitters["NameASCII"].dropna().map(normalize_name).unique()
+    matcher = FuzzyMatcher(player_names)
+    return [
+        ("load", sum(len(df) for df in sources.values()), lambda: load_stage(paths)),
+        ("career_war", len(steamer), lambda: calculate_career_war(steamer)),
+        ("project", sum(len(df) for df in sources.values()), lambda: project_stage(sources, executor)),
+        # The merges add columns to what they're given, so each run gets fresh copies
+        ("merge_hitters", sum(len(df) for df in hitters), lambda: merge_hitters([df.copy() for df in hitters])),
+        ("merge_pitchers", sum(len(df) for df in pitchers), lambda: merge_pitchers([df.copy() for df in pitchers])),
+        ("merge_relievers", len(sources["zips_pitchers"]),
+         lambda: merge_relievers(sources["zips_pitchers"], sources["steamer_pitchers"])),
+        ("render", len(merged_hitters), lambda: render_stage(merged_hitters)),
+        ("fuzzy_match", 200, lambda: fuzzy_match_stage(matcher, player_names[:200])),
+        ("simulate", len(merged_hitters), lambda: simulate_frame(
+            merged_hitters, [system for system, _ in HITTER_SYSTEMS], n_sims=BENCH_SIMULATIONS, executor=executor
+        )),
+    ]
+
+# -------------------------------#
+# MEASUREMENT
+# -------------------------------#
+
+def measure(run, repeat=REPEAT):
+    """
+    (best wall time in seconds, peak traced memory in MB) of `run`.
+    Memory is traced in a separate first run, since tracing slows
+    allocation; it also warms up caches before the timed runs.
+    """
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times), peak / 1e6
+
+def run_benchmarks(scales=SCALES, repeat=REPEAT, only=None, workers=1):
+    """One result per (stage, scale): rows, seconds, peak_mb and rows_per_sec."""
+    results = []
+    executor = ShardExecutor(workers) if workers != 1 else None
+    with tempfile.TemporaryDirectory() as directory, executor or contextlib.nullcontext():
+        for scale in scales:
+            for stage, rows, run in stages(write_scaled_sources(scale, directory), executor):
+                if only and stage not in only:
+                    continue
+                seconds, peak_mb = measure(run, repeat)
+                results.append({
+                    "stage": stage, "scale": scale, "workers": workers, "rows": rows, "seconds": seconds,
+                    "peak_mb": peak_mb, "rows_per_sec": rows / seconds if seconds else float("inf"),
+                })
+                print(format_result(results[-1]), flush=True)
+    return results
+
+def format_result(result):
+    return (
+        f"{result['stage']:<16}{result['scale']:>5}x{result['rows']:>10,} rows"
+        f"{result['seconds'] * 1000:>11.1f} ms{result['peak_mb']:>10.1f} MB{result['rows_per_sec']:>14,.0f} rows/s"
+    )
+
+def environment():
+    return {
+        "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+        "machine": platform.machine(), "processor": platform.processor(),
+    }
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Regressions of `results` against `baseline` results, as messages.
+    Stages, scales or worker counts missing from either side are skipped.
+    """
+    previous = {(r["stage"], r["scale"], r.get("workers", 1)): r for r in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["stage"], result["scale"], result.get("workers", 1)))
+        if base is None:
+            continue
+        label = f"{result['stage']} at {result['scale']}x"
+        slowdown = result["seconds"] - base["seconds"]
+        if result["seconds"] > base["seconds"] * (1 + time_tolerance) and slowdown > MIN_SLOWDOWN:
+            regressions.append(
+                f"{label}: {result['seconds'] * 1000:.1f} ms vs {base['seconds'] * 1000:.1f} ms baseline"
+            )
+        if result["peak_mb"] > base["peak_mb"] * (1 + memory_tolerance) and result["peak_mb"] - base["peak_mb"] > 1:
+            regressions.append(f"{label}: {result['peak_mb']:.1f} MB vs {base['peak_mb']:.1f} MB baseline")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the load, projection, merge, render and simulation stages.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="copies of the shipped CSVs")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per stage (the best is kept)")
+    parser.add_argument("--stage", action="append", help="only run this stage (repeatable)")
+    parser.add_argument("--workers", type=int, default=1, help="processes for project and simulate (0 for one per CPU)")
+    parser.add_argument("--save", nargs="?", const=BASELINE_PATH, help="save the results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="fail if slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=TIME_TOLERANCE, help="allowed slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, args.repeat, only=args.stage, workers=args.workers)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print("Warning: the baseline was recorded in a different environment", file=sys.stderr)
+        regressions = compare(results, baseline["results"], time_tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,265 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import requests
-import time
+from requests.adapters import HTTPAdapter
 
-def get_player_info(mlbam_id):
-    """Fetch player age and position from MLB Stats API"""
-    url = f"https://statsapi.mlb.com/api/v1/people/{mlbam_id}"
+STATS_API_URL = "https://statsapi.mlb.com/api/v1"
+DEFAULT_FILES = ['steamer600-hitters-2025.csv', 'steamer600-pitchers-2025.csv']
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".player_cache.sqlite")
+
+# Request tuning: parallel connections, requests per second, and retry policy
+CONCURRENCY = 8
+BATCH_SIZE = 100  # IDs per /people?personIds= request
+RATE_LIMIT = 20.0
+RETRIES = 3
+BACKOFF = 0.5  # seconds, doubled after each failed attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# -------------------------------#
+# STATS API CLIENT
+# -------------------------------#
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` acquisitions per second on
+    average, with bursts of up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def make_session(pool_size=CONCURRENCY):
+    """A session whose connection pool fits `pool_size` concurrent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def parse_player(player, now=None):
+    """Age (years, 1 decimal) and position abbreviation from a Stats API person"""
+    result = {}
+    birth_date = player.get('birthDate')
+    position = player.get('primaryPosition', {}).get('abbreviation')
+    if birth_date:
+        now = now if now is not None else pd.Timestamp.now()
+        age = (now - pd.to_datetime(birth_date)).days / 365.25
+        result['Age'] = round(age, 1)
+    if position:
+        result['Position'] = position
+    return result
+
+def get_json(session, url, params=None, limiter=None, retries=RETRIES, backoff=BACKOFF, timeout=10):
+    """
+    GET `url` as JSON, retrying connection errors and 429/5xx responses
+    with exponential backoff. Every attempt waits for the rate limiter.
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                response.raise_for_status()
+                return response.json()
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        time.sleep(backoff * 2 ** attempt)
+
+# -------------------------------#
+# PLAYER METADATA CACHE
+# -------------------------------#
+
+class PlayerCache:
+    """
+    SQLite store of the raw Stats API fields we use, keyed by MLBAMID.
+    Birth dates are kept instead of ages, so cached players never go stale.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS players ("
+            "mlbam_id INTEGER PRIMARY KEY, birth_date TEXT, position TEXT)"
+        )
+
+    def get_many(self, mlbam_ids):
+        """{mlbam_id: person} for the IDs that are cached, in Stats API shape"""
+        found = {}
+        ids = list(mlbam_ids)
+        for start in range(0, len(ids), 500):  # stay under SQLite's variable limit
+            chunk = ids[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT mlbam_id, birth_date, position FROM players WHERE mlbam_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for mlbam_id, birth_date, position in rows:
+                found[mlbam_id] = {"birthDate": birth_date, "primaryPosition": {"abbreviation": position}}
+        return found
+
+    def put_many(self, people):
+        """Store {mlbam_id: person} as returned by the Stats API"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO players VALUES (?, ?, ?)",
+                [
+                    (mlbam_id, person.get("birthDate"), person.get("primaryPosition", {}).get("abbreviation"))
+                    for mlbam_id, person in people.items()
+                ]
+            )
+
+    def close(self):
+        self.connection.close()
+
+# -------------------------------#
+# FETCHING
+# -------------------------------#
+
+def fetch_person(mlbam_id, session=None, limiter=None, base_url=STATS_API_URL, **retry_options):
+    """The Stats API person record for one player, or None if it couldn't be fetched"""
+    session = session or requests.Session()
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
+        data = get_json(session, f"{base_url}/people/{mlbam_id}", limiter=limiter, **retry_options)
         if data.get('people') and len(data['people']) > 0:
-            player = data['people'][0]
-            birth_date = player.get('birthDate')
-            position = player.get('primaryPosition', {}).get('abbreviation')
-            
-            result = {}
-            if birth_date:
-                birth_time = pd.to_datetime(birth_date)
-                now = pd.Timestamp.now()
-                age = (now - birth_time).days / 365.25
-                result['Age'] = round(age, 1)
-            if position:
-                result['Position'] = position
-                
-            return result
-        return {}
+            return data['people'][0]
+        return None
     except Exception as e:
         print(f"Error fetching data for MLBAMID {mlbam_id}: {str(e)}")
+        return None
+
+def fetch_people_batch(mlbam_ids, session=None, limiter=None, base_url=STATS_API_URL, **retry_options):
+    """
+    {mlbam_id: person} for one /people?personIds= request. IDs the API
+    doesn't return are simply absent; a failed request returns {}.
+    """
+    session = session or requests.Session()
+    try:
+        data = get_json(
+            session, f"{base_url}/people", params={"personIds": ",".join(map(str, mlbam_ids))},
+            limiter=limiter, **retry_options
+        )
+    except Exception as e:
+        print(f"Error fetching batch of {len(mlbam_ids)} players: {str(e)}")
         return {}
+    requested = set(mlbam_ids)
+    return {person["id"]: person for person in data.get("people", []) if person.get("id") in requested}
+
+def get_player_info(mlbam_id, session=None, limiter=None, base_url=STATS_API_URL, now=None, **retry_options):
+    """Fetch player age and position from MLB Stats API"""
+    person = fetch_person(mlbam_id, session=session, limiter=limiter, base_url=base_url, **retry_options)
+    return parse_player(person, now=now) if person else {}
+
+def fetch_people(
+    mlbam_ids, concurrency=CONCURRENCY, rate=RATE_LIMIT, batch_size=BATCH_SIZE, base_url=STATS_API_URL, **retry_options
+):
+    """
+    {mlbam_id: person} from the Stats API. IDs are requested `batch_size`
+    at a time (None for one request per player); any ID a batch didn't
+    return is retried on its own. Requests run `concurrency` at a time
+    over one pooled session, at most `rate` per second.
+    """
+    limiter = TokenBucket(rate) if rate else None
+    options = dict(limiter=limiter, base_url=base_url, **retry_options)
+    people = {}
+    with make_session(concurrency) as session, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if batch_size:
+            batches = [mlbam_ids[start:start + batch_size] for start in range(0, len(mlbam_ids), batch_size)]
+            for batch in pool.map(lambda ids: fetch_people_batch(ids, session=session, **options), batches):
+                people.update(batch)
+
+        leftover = [mlbam_id for mlbam_id in mlbam_ids if mlbam_id not in people]
+        singles = pool.map(lambda mlbam_id: fetch_person(mlbam_id, session=session, **options), leftover)
+        people.update({mlbam_id: person for mlbam_id, person in zip(leftover, singles) if person})
+    return people
 
-def process_file(filename):
+def fetch_player_info(mlbam_ids, cache=None, **fetch_options):
+    """
+    Fetch {mlbam_id: info} for every distinct ID (see fetch_people for the
+    request options). IDs found in `cache` (a PlayerCache) skip the
+    network, and newly fetched players are added to it. Ages are computed
+    from birth dates now.
+    """
+    ids = list(dict.fromkeys(int(i) for i in pd.Series(mlbam_ids).dropna()))
+    people = cache.get_many(ids) if cache is not None else {}
+    missing = [mlbam_id for mlbam_id in ids if mlbam_id not in people]
+
+    if missing:
+        fetched = fetch_people(missing, **fetch_options)
+        people.update(fetched)
+        if cache is not None:
+            cache.put_many(fetched)
+
+    if cache is not None:
+        print(f"Player cache: {len(ids) - len(missing)} hits, {len(missing)} misses")
+    now = pd.Timestamp.now()
+    return {mlbam_id: parse_player(people[mlbam_id], now=now) if mlbam_id in people else {} for mlbam_id in ids}
+
+def enrich(df, infos, is_hitters):
+    """Write fetched ages (and hitter positions) back onto `df` in one assignment per column"""
+    ids = pd.to_numeric(df['MLBAMID'], errors='coerce')
+    updates = {'Age': ids.map({i: info.get('Age') for i, info in infos.items()})}
+    if is_hitters:
+        updates['Position'] = ids.map({i: info.get('Position') for i, info in infos.items()})
+    return df.assign(**updates)
+
+def process_file(filename, **fetch_options):
     """Process a single CSV file"""
     df = pd.read_csv(filename)
     is_hitters = 'hitters' in filename.lower()
-    
-    # Initialize columns
-    df['Age'] = None
+
+    infos = fetch_player_info(df['MLBAMID'], **fetch_options)
+    df = enrich(df, infos, is_hitters)
+    print(f"Added age for {df['Age'].notna().sum()} of {len(df)} players")
     if is_hitters:
-        df['Position'] = None
-    
-    # Iterate through each row and fetch info
-    for index, row in df.iterrows():
-        mlbam_id = row['MLBAMID']
-        player_info = get_player_info(mlbam_id)
-        
-        if 'Age' in player_info:
-            df.at[index, 'Age'] = player_info['Age']
-            print(f"Added age {player_info['Age']} for player ID {mlbam_id}")
-            
-        if is_hitters and 'Position' in player_info:
-            df.at[index, 'Position'] = player_info['Position']
-            print(f"Added position {player_info['Position']} for player ID {mlbam_id}")
-        
-        # Add a small delay to avoid overwhelming the API
-        time.sleep(0.05)
-    
+        print(f"Added position for {df['Position'].notna().sum()} of {len(df)} players")
+
     # Save the updated DataFrame back to the original file
     df.to_csv(filename, index=False)
     print(f"Process completed for {filename}")
 
-def main():
-    files = ['steamer600-hitters-2025.csv', 'steamer600-pitchers-2025.csv']
-    for file in files:
-        print(f"\nProcessing {file}...")
-        process_file(file)
+def main(files=DEFAULT_FILES):
+    parser = argparse.ArgumentParser(description="Add ages and positions from the MLB Stats API to projection CSVs.")
+    parser.add_argument("files", nargs="*", default=files)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="parallel requests")
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT, help="max requests per second (0 for no limit)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="players per request (0 for one at a time)")
+    parser.add_argument("--cache", default=CACHE_PATH, help="SQLite player cache")
+    parser.add_argument("--no-cache", action="store_true", help="fetch every player from the API")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else PlayerCache(args.cache)
+    try:
+        for file in args.files:
+            print(f"\nProcessing {file}...")
+            process_file(
+                file, concurrency=args.concurrency, rate=args.rate, batch_size=args.batch_size, cache=cache
+            )
+    finally:
+        if cache is not None:
+            cache.close()
     print("\nAll files processed successfully.")
 
 if __name__ == "__main__":
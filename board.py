@@ -0,0 +1,607 @@
+import argparse
+import http.server
+import json
+import sys
+import threading
+import urllib.parse
+
+import numpy as np
+import pandas as pd
+import requests
+
+from draft import DEFAULT_POLL_INTERVAL, DRAFT_SHEET_URL, DraftBoardPoller, DraftColumn
+from merge import merge_systems, weighted_mean
+from names import NameIndex
+from parallel import ShardExecutor
+from projection import CAREER_VARIANTS, calculate_career_war_variants, variant_suffix
+from query import QueryError, compile_query
+from simulation import DEFAULT_SEED, DEFAULT_SIMULATIONS, UNCERTAINTY_COLS, simulate_frame
+from sources import CACHE_DIR, load_source, source_fingerprint
+from view import View
+
+# -------------------------------#
+# PROJECTED FRAMES
+# -------------------------------#
+
+# (system name, source) in demographic precedence order
+HITTER_SYSTEMS = [("Steamer", "steamer_hitters"), ("ZiPS", "zips_hitters"), ("BatX", "batx_hitters")]
+PITCHER_SYSTEMS = [("Steamer", "steamer_pitchers"), ("ZiPS", "zips_pitchers")]
+RELIEVER_SOURCES = ["zips_pitchers", "steamer_pitchers"]
+
+# Per-system stats kept alongside WAR, as '{system}_{col}'
+HITTER_EXTRA_COLS = ("wRC+", *UNCERTAINTY_COLS)
+PITCHER_EXTRA_COLS = UNCERTAINTY_COLS
+
+# How much each system counts toward ConsensusCareer; systems not listed are left out
+CONSENSUS_WEIGHTS = {"Steamer": 1.0, "ZiPS": 1.0, "BatX": 1.0}
+
+# ---- HELPER: rename columns after computing career WAR ----
+def prep_projection_df(
+    df,
+    system_name,
+    is_pitcher=False,
+    war_col="WAR",
+    rename_age_pos=False,
+    use_grid=False,
+    extra_cols=(),
+    executor=None
+):
+    """
+    1) Calculate career WAR for every discount/flatten toggle combination.
+    2) Rename columns from 'WAR' -> '{system_name}WAR'
+       and 'CareerWAR{suffix}' -> '{system_name}Career{suffix}'.
+    3) Return the subset of columns we want:
+       [MLBAMID, {system_name}WAR, {system_name}Career*, (optionally Age, Position, NameASCII)]
+    4) If rename_age_pos=True, we keep the Age, Position, NameASCII from this df
+       for later merges (i.e. Steamer is the "source" for age/position).
+    5) If use_grid=True, career WAR is read from the precomputed lookup grid
+       (see projection.CareerWarGrid) - useful for large imported projection sets.
+    6) Any `extra_cols` (e.g. "wRC+") are kept as '{system_name}_{col}'.
+    7) With a parallel.ShardExecutor, large sources are projected across its workers.
+    """
+    df = df.copy()
+    # Calculate career WAR in "CareerWAR", "CareerWAR_Disc", "CareerWAR_Flat", ...
+    df = calculate_career_war_variants(
+        df,
+        is_pitcher=is_pitcher,
+        war_col=war_col,
+        new_col="CareerWAR",
+        use_grid=use_grid,
+        executor=executor
+    )
+
+    # Round single-year WAR
+    df[war_col] = df[war_col].round(1)
+
+    # Rename columns for clarity
+    career_cols = {
+        "CareerWAR" + variant_suffix(discount, flatten): f"{system_name}Career" + variant_suffix(discount, flatten)
+        for discount, flatten in CAREER_VARIANTS
+    }
+    extra = {col: f"{system_name}_{col}" for col in extra_cols}
+    df.rename(
+        columns={
+            war_col: f"{system_name}WAR",
+            **career_cols,
+            **extra
+        },
+        inplace=True
+    )
+
+    # Decide what columns to keep
+    keep_cols = ["MLBAMID", f"{system_name}WAR", *career_cols.values(), *extra.values(), "PlayerId"]  # Added PlayerId
+    if rename_age_pos:
+        # Keep Age, Position, NameASCII from this system (Steamer recommended)
+        for c in ["Age", "Position", "NameASCII", "Team"]:
+            if c in df.columns:
+                keep_cols.append(c)
+
+    # Only keep columns that exist in the dataframe
+    keep_cols = [col for col in keep_cols if col in df.columns]
+    return df[keep_cols].copy()
+
+def project_source(df, system_name, is_pitcher, extra_cols=(), executor=None):
+    """One loaded source with its career WAR columns, ready to merge."""
+    return prep_projection_df(
+        df, system_name, is_pitcher=is_pitcher, war_col="WAR", rename_age_pos=True, extra_cols=extra_cols,
+        executor=executor,
+    )
+
+def add_consensus_columns(df, systems, weights=None):
+    """
+    Adds ConsensusCareer (and a variant for every toggle combination): the
+    weighted mean of the systems' career columns, with `weights` (default
+    CONSENSUS_WEIGHTS) renormalized over the systems that project each
+    player. Missing only where none of them do.
+    """
+    weights = CONSENSUS_WEIGHTS if weights is None else weights
+    for discount, flatten in CAREER_VARIANTS:
+        suffix = variant_suffix(discount, flatten)
+        blended = [system for system in systems if weights.get(system, 0) and f"{system}Career{suffix}" in df.columns]
+        if blended:
+            df["ConsensusCareer" + suffix] = weighted_mean(
+                [df[f"{system}Career{suffix}"] for system in blended], [weights[system] for system in blended]
+            ).round(1)
+    return df
+
+def merge_hitters(projected, weights=None):
+    """
+    Merge projected (Steamer, ZiPS, BATX) hitters, in HITTER_SYSTEMS order, on MLBAMID.
+    Position, Age, Name come from Steamer by default, falling back to ZiPS then BatX.
+    Career columns are filled for every toggle combination; see select_career_variant.
+    ConsensusCareer blends them with `weights`; see add_consensus_columns.
+    """
+    # Keep Age/Position/Name from all systems for fallback
+    merged = merge_systems(projected)
+
+    # Calculate average wRC+ across systems
+    wrc_cols = [col for col in merged.columns if "wRC+" in col]
+    if wrc_cols:
+        merged["Avg_wRC+"] = merged[wrc_cols].mean(axis=1, skipna=True).round(0)
+
+    merged = add_consensus_columns(merged, [system for system, _ in HITTER_SYSTEMS], weights)
+    return add_link_columns(merged, is_pitcher=False)
+
+def merge_pitchers(projected, weights=None):
+    """
+    Merge projected (Steamer, ZiPS) pitchers, in PITCHER_SYSTEMS order, on MLBAMID.
+    Position, Age, Name come from Steamer by default, falling back to ZiPS.
+    ConsensusCareer blends the career columns with `weights`; see add_consensus_columns.
+    """
+    merged = add_consensus_columns(merge_systems(projected), [system for system, _ in PITCHER_SYSTEMS], weights)
+    return add_link_columns(merged, is_pitcher=True)
+
+def merge_relievers(zips_pitchers_df, steamer_pitchers_df):
+    """
+    ZiPS relievers (G > 4 * GS) with Steamer's age and rate stats alongside.
+    Returns None if the ZiPS pitchers data has no G/GS columns.
+    """
+    if not all(col in zips_pitchers_df.columns for col in ["G", "GS"]):
+        return None
+
+    # Start with ZiPS data and filter for relievers
+    zips_relief = zips_pitchers_df[zips_pitchers_df["G"] > 4 * zips_pitchers_df["GS"]]
+    zips_relief = zips_relief[[c for c in ["MLBAMID", "NameASCII", "IP", "ERA", "FIP", "WAR", "PlayerId"] if c in zips_relief.columns]]
+    zips_relief = zips_relief.rename(columns={col: f"ZiPS_{col}" for col in ["IP", "ERA", "FIP", "WAR"]})
+
+    steamer_relief = steamer_pitchers_df[["MLBAMID", "Age", "ERA", "FIP", "WAR"]]
+    steamer_relief = steamer_relief.rename(columns={col: f"Steamer_{col}" for col in ["ERA", "FIP", "WAR"]})
+
+    # Only ZiPS relievers are kept; Steamer fills in alongside them
+    return add_link_columns(merge_systems([zips_relief, steamer_relief], how="left"), is_pitcher=True)
+
+def frame_version(table, fingerprints, *state):
+    """Hashable identity of a frame's contents: its sources plus any state it was built with."""
+    return (table, tuple(sorted(fingerprints.items())), *state)
+
+def career_variant_columns(columns, discount, flatten):
+    """{'{system}Career': the variant column chosen by the toggles} for the columns that have one."""
+    suffix = variant_suffix(discount, flatten)
+    if not suffix:
+        return {}
+    return {c: c + suffix for c in columns if c.endswith("Career") and c + suffix in columns}
+
+# -------------------------------#
+# LINKS
+# -------------------------------#
+
+def create_fangraphs_urls(player_ids):
+    """Fangraphs URLs for a column of player IDs (missing where the ID is)"""
+    player_ids = pd.Series(player_ids).astype("string")
+    return "https://www.fangraphs.com/players/placeholder/" + player_ids + "/stats"
+
+def create_statcast_urls(player_ids, names, is_pitcher=False):
+    """Baseball Savant/Statcast URLs for columns of player IDs and names (missing where the ID is)"""
+    player_ids = pd.Series(player_ids).astype("string")
+    # Convert names to lowercase and replace spaces with hyphens
+    name_slugs = pd.Series(names).astype("string").str.lower().str.replace(" ", "-", regex=False).fillna("player")
+    stat_type = 'pitching' if is_pitcher else 'hitting'
+    return (
+        "https://baseballsavant.mlb.com/savant-player/" + name_slugs + "-" + player_ids
+        + f"?stats=statcast-r-{stat_type}-mlb"
+    )
+
+def add_link_columns(df, is_pitcher=False):
+    """
+    Adds FangraphsURL (from PlayerId) and StatcastURL (from MLBAMID and
+    NameASCII) to a merged frame. Called by the merge builders, so links
+    are built once per data version.
+    """
+    if "PlayerId" in df.columns:
+        df["FangraphsURL"] = create_fangraphs_urls(df["PlayerId"])
+    if "MLBAMID" in df.columns:
+        names = df["NameASCII"] if "NameASCII" in df.columns else pd.Series(pd.NA, index=df.index)
+        df["StatcastURL"] = create_statcast_urls(df["MLBAMID"], names, is_pitcher=is_pitcher)
+    return df
+
+# -------------------------------#
+# BOARD
+# -------------------------------#
+
+LINK_COLUMNS = ["FangraphsURL", "StatcastURL"]
+
+# Columns `Board.rank(simulate=True)` adds, and ranks by the first
+SIMULATION_COLUMNS = ["CareerP50", "CareerP10", "CareerP90", "CareerOver10", "CareerOver20", "CareerOver30"]
+
+# Table -> its sources, how it's ranked, the player key drafted names resolve to, the columns returned,
+# and the projection systems its careers can be simulated from
+TABLES = {
+    "hitters": {
+        "sources": [name for _, name in HITTER_SYSTEMS], "sort_by": "SteamerCareer", "ascending": False,
+        "key_col": "MLBAMID", "systems": [system for system, _ in HITTER_SYSTEMS],
+        "columns": [
+            "NameASCII", "Position", "Age", "ZiPSWAR", "SteamerWAR", "BatXWAR", "Avg_wRC+",
+            "ZiPSCareer", "SteamerCareer", "BatXCareer", "ConsensusCareer", *LINK_COLUMNS,
+        ],
+    },
+    "pitchers": {
+        "sources": [name for _, name in PITCHER_SYSTEMS], "sort_by": "SteamerCareer", "ascending": False,
+        "key_col": "MLBAMID", "systems": [system for system, _ in PITCHER_SYSTEMS],
+        "columns": [
+            "NameASCII", "Position", "Age", "ZiPSWAR", "SteamerWAR", "ZiPSCareer", "SteamerCareer", "ConsensusCareer",
+            *LINK_COLUMNS,
+        ],
+    },
+    "relievers": {
+        "sources": RELIEVER_SOURCES, "sort_by": "ZiPS_WAR", "ascending": False,
+        "key_col": "MLBAMID",
+        "columns": [
+            "NameASCII", "Age", "ZiPS_IP", "ZiPS_ERA", "Steamer_ERA", "ZiPS_FIP", "Steamer_FIP",
+            "ZiPS_WAR", "Steamer_WAR", *LINK_COLUMNS,
+        ],
+    },
+    "ba_top_100": {
+        "sources": ["ba_top_100"], "sort_by": "Rank", "ascending": True,
+        "key_col": "Rank",
+        "columns": ["Rank", "Name", "Team", "Position"],
+    },
+}
+
+class Board:
+    """
+    The projection board without a UI: loads the sources, projects and
+    merges them, and ranks the players still available.
+
+    Frames are built on first use and kept until one of their sources'
+    CSVs changes. Drafted players come from `poller` (a
+    draft.DraftBoardPoller, applied incrementally like the app does) or
+    a fixed {name: pick} mapping in `drafted`. With a
+    parallel.ShardExecutor, projections and simulations are split across
+    its worker processes. `weights` are the ConsensusCareer weights
+    (default CONSENSUS_WEIGHTS).
+    """
+
+    def __init__(self, poller=None, drafted=None, cache_dir=CACHE_DIR, executor=None, weights=None):
+        self.poller = poller
+        self.executor = executor
+        self.weights = weights
+        self.cache_dir = cache_dir
+        self._drafted = dict(drafted or {})
+        self._frames = {}
+        self._name_indexes = {}
+        self._draft_columns = {}
+        self._simulations = {}
+        self._lock = threading.RLock()
+
+    @property
+    def drafted(self):
+        return self.poller.drafted if self.poller is not None else self._drafted
+
+    def fingerprints(self, names):
+        return {name: source_fingerprint(name, cache_dir=self.cache_dir) for name in names}
+
+    def _load(self, name):
+        return load_source(name, cache_dir=self.cache_dir)
+
+    def _build(self, table):
+        if table == "hitters":
+            return merge_hitters([
+                project_source(self._load(name), system, False, extra_cols=HITTER_EXTRA_COLS, executor=self.executor)
+                for system, name in HITTER_SYSTEMS
+            ], weights=self.weights)
+        if table == "pitchers":
+            return merge_pitchers([
+                project_source(self._load(name), system, True, extra_cols=PITCHER_EXTRA_COLS, executor=self.executor)
+                for system, name in PITCHER_SYSTEMS
+            ], weights=self.weights)
+        if table == "relievers":
+            return merge_relievers(self._load("zips_pitchers"), self._load("steamer_pitchers"))
+        return self._load(table)
+
+    def frame(self, table):
+        """The merged frame for `table` and its version, rebuilt only when a source changed."""
+        if table not in TABLES:
+            raise KeyError(f"Unknown table {table!r}; expected one of {', '.join(TABLES)}")
+        version = frame_version(table, self.fingerprints(TABLES[table]["sources"]))
+        with self._lock:
+            cached = self._frames.get(table)
+            if cached is None or cached[1] != version:
+                cached = self._frames[table] = (self._build(table), version)
+            return cached
+
+    def name_index(self, table):
+        """
+        Names resolved to player keys: one index over every projected
+        player, except the BA Top 100, whose prospects are keyed by rank.
+        """
+        if table == "ba_top_100":
+            df, version = self.frame(table)
+            names, keys = df["Name"], df["Rank"]
+        else:
+            hitters, hitters_version = self.frame("hitters")
+            pitchers, pitchers_version = self.frame("pitchers")
+            version = (hitters_version, pitchers_version)
+            names = pd.concat([hitters["NameASCII"], pitchers["NameASCII"]])
+            keys = pd.concat([hitters["MLBAMID"], pitchers["MLBAMID"]])
+        group = "ba_top_100" if table == "ba_top_100" else "players"
+        with self._lock:
+            cached = self._name_indexes.get(group)
+            if cached is None or cached[1] != version:
+                cached = self._name_indexes[group] = (NameIndex(names, keys), version)
+            return cached[0]
+
+    def draft_positions(self, table):
+        """DraftPos for each row of `table`'s frame."""
+        df, version = self.frame(table)
+        key_col = TABLES[table]["key_col"]
+        if key_col not in df.columns:
+            return np.full(len(df), np.nan)
+        name_index = self.name_index(table)
+        with self._lock:
+            cached = self._draft_columns.get(table)
+            if cached is None or cached[1] != version:
+                cached = self._draft_columns[table] = (DraftColumn(df[key_col], name_index), version)
+                if self.poller is None:
+                    cached[0].apply(self._drafted, reset=True)
+        if self.poller is not None:
+            return cached[0].sync(self.poller)
+        return cached[0].values.copy()
+
+    def simulation(self, table, discount=False, flatten=False, n_sims=DEFAULT_SIMULATIONS, seed=DEFAULT_SEED):
+        """
+        Simulated career WAR percentiles and threshold chances for each row
+        of `table`'s frame (see simulation.simulate_career_war), kept until
+        the frame changes. Raises ValueError for a table without projections.
+        """
+        if "systems" not in TABLES.get(table, {}):
+            raise ValueError(f"Can't simulate {table}; only {', '.join(t for t in TABLES if 'systems' in TABLES[t])}")
+        df, version = self.frame(table)
+        key = (table, discount, flatten, n_sims, seed)
+        with self._lock:
+            cached = self._simulations.get(key)
+            if cached is None or cached[1] != version:
+                result = simulate_frame(
+                    df, TABLES[table]["systems"], is_pitcher=table == "pitchers",
+                    discount=discount, flatten=flatten, n_sims=n_sims, seed=seed, executor=self.executor,
+                )
+                cached = self._simulations[key] = (result, version)
+            return cached[0]
+
+    def rank(
+        self, table, top=25, discount=False, flatten=False, query=None, include_drafted=False,
+        simulate=False, n_sims=DEFAULT_SIMULATIONS, seed=DEFAULT_SEED, sort_by=None,
+    ):
+        """
+        The top `top` players of `table` (all if None), best first, by
+        `sort_by` (default the table's sort column, e.g. ConsensusCareer to
+        rank by the blend of every system). Drafted players are left out unless
+        `include_drafted`, which adds a DraftPos column. `query` is a custom
+        query in DataFrame.query syntax; a QueryError is raised if it can't
+        be parsed, references a column the table doesn't have or fails to
+        evaluate (e.g. comparing names to a number), and a ValueError for
+        an unknown `sort_by`. With `simulate`, players are ranked by their
+        simulated median career unless `sort_by` is given, with the
+        SIMULATION_COLUMNS added (and queryable).
+        """
+        df, _ = self.frame(table)
+        spec = TABLES[table]
+        view = View(df, table)
+        for col, source in career_variant_columns(df.columns, discount, flatten).items():
+            view.derive(col, [source], lambda frame, source=source: frame[source])
+        view.assign("DraftPos", self.draft_positions(table))
+        columns = spec["columns"]
+        if simulate:
+            simulated = self.simulation(table, discount=discount, flatten=flatten, n_sims=n_sims, seed=seed)
+            for col in SIMULATION_COLUMNS:
+                view.assign(col, simulated[col].to_numpy())
+            sort_by, columns = sort_by or "CareerP50", columns + SIMULATION_COLUMNS
+        sort_by = sort_by or spec["sort_by"]
+        if sort_by not in view.columns:
+            raise ValueError(f"No {sort_by} column to sort {table} by")
+
+        if query:
+            compiled = compile_query(query)
+            missing = compiled.missing_columns(view.columns)
+            if missing:
+                raise QueryError(f"No {', '.join(missing)} column in {table}")
+            try:
+                mask = compiled.mask(view.frame(compiled.columns))
+            except Exception as e:  # e.g. comparing a text column to a number
+                raise QueryError(str(e)) from e
+            view.filter(mask)
+        if not include_drafted:
+            view.filter(pd.isna(view.column("DraftPos")))
+
+        columns = (["DraftPos"] if include_drafted else []) + columns
+        return view.materialize(columns, sort_by=sort_by, ascending=spec["ascending"], limit=top)
+
+def to_records(df):
+    """JSON-ready rows, with missing values as None."""
+    return json.loads(df.to_json(orient="records"))
+
+# -------------------------------#
+# HTTP ENDPOINT
+# -------------------------------#
+
+# Most simulated careers per player one HTTP request may ask for, to bound its memory
+MAX_HTTP_SIMULATIONS = 10_000
+
+def _flag(params, name):
+    return params.get(name, ["0"])[-1].lower() in ("1", "true", "yes")
+
+class RankingHandler(http.server.BaseHTTPRequestHandler):
+    """
+    GET /rankings/<table>?top=25&discount=1&flatten=1&drafted=1&query=...
+    returns {"table", "drafted", "players"} as JSON (sort= picks the column
+    to rank by, e.g. ConsensusCareer; add simulate=1, and optionally sims=
+    and seed=, to rank by simulated careers); GET /tables lists the tables.
+    """
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = urllib.parse.parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["tables"]:
+            return self._send(200, {"tables": list(TABLES)})
+        if len(parts) != 2 or parts[0] != "rankings" or parts[1] not in TABLES:
+            return self._send(404, {"error": f"Unknown path {url.path}; try /rankings/<{'|'.join(TABLES)}>"})
+        try:
+            top = params.get("top", ["25"])[-1]
+            n_sims = int(params.get("sims", [DEFAULT_SIMULATIONS])[-1])
+            if n_sims > MAX_HTTP_SIMULATIONS:
+                raise ValueError(f"sims can be at most {MAX_HTTP_SIMULATIONS:,}")
+            players = self.server.board.rank(
+                parts[1],
+                top=None if top == "all" else int(top),
+                discount=_flag(params, "discount"),
+                flatten=_flag(params, "flatten"),
+                query=params.get("query", [None])[-1],
+                include_drafted=_flag(params, "drafted"),
+                simulate=_flag(params, "simulate"),
+                n_sims=n_sims,
+                seed=int(params.get("seed", [DEFAULT_SEED])[-1]),
+                sort_by=params.get("sort", [None])[-1],
+            )
+        except (QueryError, ValueError) as e:
+            return self._send(400, {"error": str(e)})
+        self._send(200, {"table": parts[1], "drafted": len(self.server.board.drafted), "players": to_records(players)})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def make_server(board, host="127.0.0.1", port=8765):
+    """A threaded HTTP server answering ranking requests from `board` (call serve_forever to run it)."""
+    server = http.server.ThreadingHTTPServer((host, port), RankingHandler)
+    server.board = board
+    return server
+
+# -------------------------------#
+# CLI
+# -------------------------------#
+
+def make_board(args):
+    """A Board following the draft sheet, or with nobody drafted if --no-draft."""
+    executor = ShardExecutor(args.workers) if args.workers != 1 else None
+    weights = {**CONSENSUS_WEIGHTS, **parse_weights(args.weight)}
+    if args.no_draft:
+        return Board(executor=executor, weights=weights)
+    poller = DraftBoardPoller(args.draft_sheet, interval=args.poll_interval)
+    try:
+        poller.poll()
+    except requests.RequestException as e:
+        print(f"Couldn't read the draft sheet ({e}); showing every player as available.", file=sys.stderr)
+    return Board(poller=poller, executor=executor, weights=weights)
+
+def parse_weights(pairs):
+    """
+    {system: weight} from "System=weight" strings; raises ValueError on a
+    malformed one or a weight that is negative, infinite or NaN.
+    """
+    weights = {}
+    for pair in pairs:
+        system, sep, weight = pair.partition("=")
+        if not sep or not system:
+            raise ValueError(f"Expected SYSTEM=WEIGHT, got {pair!r}")
+        weights[system] = float(weight)
+        if not np.isfinite(weights[system]) or weights[system] < 0:
+            raise ValueError(f"Weights must be finite and at least 0, got {pair!r}")
+    return weights
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank the best available players without the Streamlit app.")
+    parser.add_argument("--draft-sheet", default=DRAFT_SHEET_URL, help="CSV export of the draft sheet")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, help="seconds between sheet checks (serve)")
+    parser.add_argument("--no-draft", action="store_true", help="don't read the draft sheet; every player is available")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes for projections and simulations (0 for one per CPU)"
+    )
+    parser.add_argument(
+        "--weight", action="append", default=[], metavar="SYSTEM=WEIGHT",
+        help="ConsensusCareer weight for a system, e.g. Steamer=2 (repeatable; unlisted systems keep theirs)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rank = commands.add_parser("rank", help="print the top available players of a table")
+    rank.add_argument("table", choices=list(TABLES))
+    rank.add_argument("--top", type=int, default=25)
+    rank.add_argument("--discount", action="store_true", help="apply the discount rate to career WAR")
+    rank.add_argument("--flatten", action="store_true", help="use the flattened aging curve")
+    rank.add_argument("--query", help='custom query, e.g. "SteamerWAR > 3 and Age < 25"')
+    rank.add_argument("--drafted", action="store_true", help="include drafted players, with their pick")
+    rank.add_argument("--sort-by", help="column to rank by, e.g. ConsensusCareer (default: the table's)")
+    rank.add_argument("--simulate", action="store_true", help="rank by simulated median career WAR")
+    rank.add_argument("--sims", type=int, default=DEFAULT_SIMULATIONS, help="simulated careers per player")
+    rank.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed for --simulate")
+    rank.add_argument("--format", choices=["table", "json", "csv"], default="table")
+
+    serve = commands.add_parser("serve", help="answer GET /rankings/<table> with JSON")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    try:
+        board = make_board(args)
+    except ValueError as e:
+        parser.exit(2, f"{e}\n")
+    try:
+        run_command(board, args, parser)
+    finally:
+        if board.executor is not None:
+            board.executor.close()
+
+def run_command(board, args, parser):
+    """Runs the parsed `rank` or `serve` command against `board`."""
+    if args.command == "rank":
+        try:
+            players = board.rank(
+                args.table, top=args.top, discount=args.discount, flatten=args.flatten,
+                query=args.query, include_drafted=args.drafted,
+                simulate=args.simulate, n_sims=args.sims, seed=args.seed, sort_by=args.sort_by,
+            )
+        except QueryError as e:
+            parser.exit(2, f"Invalid query: {e}\n")
+        except ValueError as e:
+            parser.exit(2, f"{e}\n")
+        if args.format == "json":
+            print(json.dumps(to_records(players), indent=2))
+        elif args.format == "csv":
+            print(players.to_csv(index=False), end="")
+        else:
+            print(players.to_string(index=False))
+        return
+
+    for table in TABLES:
+        board.frame(table)  # build everything before the first request
+    if board.poller is not None:
+        board.poller.start()
+    server = make_server(board, args.host, args.port)
+    print(f"Serving rankings on http://{args.host}:{server.server_port}/rankings/<{'|'.join(TABLES)}>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if board.poller is not None:
+            board.poller.stop()
+
+if __name__ == "__main__":
+    main()
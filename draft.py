@@ -0,0 +1,230 @@
+import hashlib
+import io
+import logging
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import requests
+
+logger = logging.getLogger(__name__)
+
+DRAFT_SHEET_URL = (
+    'https://docs.google.com/spreadsheets/d/'
+    '1kfOLdBmdbnr0fNgwdLDYQ3CyY-R0m5RZiCslCNjwMb4'
+    '/export?format=csv&gid=306625921'
+)
+DEFAULT_POLL_INTERVAL = 30.0  # seconds
+
+# -------------------------------#
+# PARSING
+# -------------------------------#
+
+def parse_draft_board(csv_text, first_pick=1):
+    """
+    Parse the draft sheet CSV into {player_name: draft_position}.
+    The row number (1-based) is the draft position; blank rows keep their
+    slot but aren't players. The names in the sheet are already in ASCII format.
+    `first_pick` is the position of the first row, for parsing a tail of the sheet.
+    """
+    df = pd.read_csv(io.StringIO(csv_text))
+    players = df["Player"]
+    picked = players.notna().to_numpy()
+    positions = (df.index[picked] + first_pick).tolist()
+    return dict(zip(players[picked].tolist(), positions))
+
+# -------------------------------#
+# INCREMENTAL STATE
+# -------------------------------#
+
+class DraftState:
+    """
+    The picks ingested so far. Picks are only appended to the sheet, so
+    each ingest skips the rows up to the last pick and parses the rest.
+
+    The skipped rows are checked against a hash of what was ingested
+    before; if an earlier pick was edited or removed, the state is rebuilt
+    from the whole sheet and the ingest reports a reset. Rows are split on
+    lines, which is fine for a sheet of names (no quoted newlines).
+    """
+
+    def __init__(self):
+        self.drafted = {}
+        self.last_pick = 0
+        self._prefix_hash = None
+
+    @staticmethod
+    def _hash_rows(header, rows):
+        return hashlib.sha256("\n".join([header, *rows]).encode()).hexdigest()
+
+    def ingest(self, csv_text):
+        """
+        Ingest the current sheet. Returns (delta, reset): the newly drafted
+        {player_name: draft_position}, and whether earlier picks changed, in
+        which case `delta` is the whole board and earlier results are stale.
+        """
+        # pandas skips blank lines too, so row numbers still match the full parse
+        lines = [line for line in csv_text.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("Draft sheet is empty")
+        header, rows = lines[0], lines[1:]
+
+        reset = self._prefix_hash is not None and (
+            len(rows) < self.last_pick
+            or self._hash_rows(header, rows[:self.last_pick]) != self._prefix_hash
+        )
+        start = 0 if reset else self.last_pick
+        delta = parse_draft_board("\n".join([header, *rows[start:]]), first_pick=start + 1)
+
+        if reset:
+            self.drafted = {}
+        self.drafted.update(delta)
+        # Trailing rows without a player are re-read next time, in case they get filled
+        self.last_pick = max(delta.values()) if delta else start
+        self._prefix_hash = self._hash_rows(header, rows[:self.last_pick])
+        return delta, reset
+
+class DraftColumn:
+    """
+    DraftPos values for one frame. Sheet names are resolved to player keys
+    (e.g. MLBAMIDs) through a shared names.NameIndex, then to this frame's
+    rows. Only exact (normalized) matches are applied: a close match could
+    be a different player, so those are left for the user to confirm. Kept
+    in step with a poller by applying only the picks made since the last
+    sync, so each update touches just the newly drafted rows.
+    """
+
+    def __init__(self, keys, name_index):
+        keys = pd.Series(keys).to_numpy()
+        self._rows = pd.Series(keys).groupby(keys, dropna=True).indices
+        self.name_index = name_index
+        self.values = np.full(len(keys), np.nan)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def apply(self, delta, reset=False):
+        if reset:
+            self.values[:] = np.nan
+        for name, pos in delta.items():
+            for key in self.name_index.lookup(name):
+                rows = self._rows.get(key)
+                if rows is not None:
+                    self.values[rows] = pos
+
+    def sync(self, poller):
+        """Catch up with `poller` and return a copy of the DraftPos values."""
+        with self._lock:
+            if self.version != poller.version:
+                delta, reset, self.version = poller.changes_since(self.version)
+                self.apply(delta, reset)
+            return self.values.copy()
+
+# -------------------------------#
+# POLLER
+# -------------------------------#
+
+class DraftBoardPoller:
+    """
+    Keeps the drafted-players mapping in sync with the draft sheet.
+
+    Each poll is a conditional GET over one persistent session: the
+    server's ETag / Last-Modified are sent back, and a 304 costs nothing.
+    Servers that ignore those (Google's CSV export usually does) are
+    short-circuited on a hash of the body, so the sheet is only re-parsed
+    when it actually changed, and then only the new picks are parsed (see
+    DraftState). `drafted` and `version` only move when picks change;
+    `changes_since` gives the picks made after a given version.
+    """
+
+    def __init__(self, url=DRAFT_SHEET_URL, interval=DEFAULT_POLL_INTERVAL, session=None, timeout=10.0):
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.state = DraftState()
+        self.drafted = MappingProxyType({})
+        self.version = 0
+        self._changes = []  # (delta, reset) that produced each version
+        self.last_error = None
+
+        self._etag = None
+        self._last_modified = None
+        self._content_hash = None
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Fetch the sheet once. Returns True if a new mapping was published."""
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return False
+        response.raise_for_status()
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if content_hash == self._content_hash:
+            return False
+
+        with self._changed:
+            delta, reset = self.state.ingest(response.content.decode(response.encoding or "utf-8"))
+            self._content_hash = content_hash
+            if not (delta or reset):
+                return False
+            self.drafted = MappingProxyType(dict(self.state.drafted))
+            self._changes.append((delta, reset))
+            self.version += 1
+            self._changed.notify_all()
+        return True
+
+    def changes_since(self, version):
+        """
+        The picks published after `version`, as (delta, reset, current_version).
+        If any of those updates was a reset, the delta is the whole board.
+        """
+        with self._changed:
+            pending = self._changes[version:]
+            if any(reset for _, reset in pending):
+                return dict(self.drafted), True, self.version
+            delta = {}
+            for changes, _ in pending:
+                delta.update(changes)
+            return delta, False, self.version
+
+    def wait_for_change(self, version, timeout=None):
+        """Block until `version` is superseded (or timeout). Returns the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout=timeout)
+            return self.version
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the last good mapping and try again next interval
+                self.last_error = e
+                logger.warning("Draft board poll failed: %s", e)
+
+    def start(self):
+        """Start polling in a daemon thread (after an initial poll done by the caller, if wanted)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="draft-board-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
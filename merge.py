@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Columns every system may provide, resolved by system precedence
+DEMOGRAPHIC_COLS = ["NameASCII", "PlayerId", "Age", "Position", "Team"]
+
+def coalesce(columns):
+    """
+    First non-missing value per row across `columns` (aligned Series),
+    taking them in the order given.
+    """
+    result = columns[0]
+    if len(columns) == 1:
+        return result
+    if any(isinstance(col.dtype, pd.CategoricalDtype) for col in columns):
+        # Systems are loaded separately, so give them one set of categories
+        categories = pd.api.types.union_categoricals(
+            [col.astype("category") for col in columns], ignore_order=True
+        ).categories
+        columns = [col.astype(pd.CategoricalDtype(categories)) for col in columns]
+        result = columns[0]
+    present = np.column_stack([col.notna().to_numpy() for col in columns])
+    first = present.argmax(axis=1)
+    for rank, col in enumerate(columns[1:], start=1):
+        take = first == rank
+        if take.any():
+            result = result.where(~take, col)
+    return result
+
+def merge_systems(frames, key="MLBAMID", coalesce_cols=DEMOGRAPHIC_COLS, how="outer"):
+    """
+    Joins any number of projection frames on `key` in one pass.
+
+    `frames` are in precedence order: each column in `coalesce_cols` is
+    taken from the first frame that has a value for that player. Every
+    other column must be unique to one frame (e.g. 'ZiPSWAR', 'Steamer_ERA').
+    With how="outer" every player in any frame is kept; with how="left"
+    only the first frame's players are. Duplicate keys within a frame keep
+    their first row.
+    """
+    indexed = [df.drop_duplicates(key).set_index(key) for df in frames]
+    if how == "outer":
+        index = indexed[0].index
+        for df in indexed[1:]:
+            index = index.union(df.index)
+    elif how == "left":
+        index = indexed[0].index
+    else:
+        raise ValueError(f"how must be 'outer' or 'left', not {how!r}")
+
+    shared = [col for col in coalesce_cols if any(col in df.columns for df in indexed)]
+    own = [df.drop(columns=[c for c in shared if c in df.columns]) for df in indexed]
+    seen = set()
+    for df in own:
+        clashes = seen.intersection(df.columns)
+        if clashes:
+            raise ValueError(f"Columns {sorted(clashes)} appear in more than one system; prefix them")
+        seen.update(df.columns)
+
+    merged = pd.concat([df.reindex(index) for df in own], axis=1)
+    resolved = {
+        col: coalesce([df[col].reindex(index) for df in indexed if col in df.columns])
+        for col in shared
+    }
+    merged = pd.concat([pd.DataFrame(resolved, index=index), merged], axis=1)
+    merged.index.name = key
+    return merged.reset_index()
+
+def weighted_mean(columns, weights):
+    """
+    Row-wise weighted mean of `columns` (aligned Series or arrays), skipping
+    missing values: each row's weights are renormalized over the columns
+    it has. Missing where no column has a value.
+    """
+    values = np.column_stack([np.asarray(col, dtype=float) for col in columns])
+    weights = np.where(np.isnan(values), 0.0, np.asarray(weights, dtype=float))
+    totals = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(totals > 0, (np.nan_to_num(values) * weights).sum(axis=1) / totals, np.nan)
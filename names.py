@@ -0,0 +1,158 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Generational suffixes dropped from the end of a name ("Bobby Witt Jr." -> "bobby witt")
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+DROPPED = re.compile(r"[.'’`]")
+SEPARATORS = re.compile(r"[^\w\s]|_")
+
+# Fuzzy matching: the best candidate needs this trigram similarity, and a lead of
+# MATCH_MARGIN over the runner-up, since many distinct players have near-identical
+# names ("Chris Clark" / "Chris Clarke" score 0.88)
+MATCH_THRESHOLD = 0.6
+MATCH_MARGIN = 0.05
+
+@lru_cache(maxsize=1 << 16)
+def normalize_name(name):
+    """
+    Lowercase, accent-free form of a player name with punctuation and
+    suffixes removed: "José Ramírez" -> "jose ramirez", "J.P. Crawford"
+    -> "jp crawford", "Vladimir Guerrero Jr." -> "vladimir guerrero".
+    Anything that isn't a string normalizes to "".
+    """
+    if not isinstance(name, str):
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = SEPARATORS.sub(" ", DROPPED.sub("", text)).split()
+    while len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+def parse_name_list(text):
+    """Names from a pasted list, split on commas or newlines."""
+    names = [name.strip() for name in text.replace('\n', ',').split(',')]
+    return [name for name in names if name]
+
+# -------------------------------#
+# FUZZY MATCHING
+# -------------------------------#
+
+def trigrams(text):
+    """Character trigrams of `text`, padded so word starts and ends count."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class FuzzyMatcher:
+    """
+    Trigram index over a list of normalized names. Similarity is the Dice
+    coefficient of the two trigram sets (1.0 for identical sets); a query
+    only touches the names sharing at least one trigram with it.
+    """
+
+    def __init__(self, names, threshold=MATCH_THRESHOLD, margin=MATCH_MARGIN):
+        self.names = list(names)
+        self.threshold = threshold
+        self.margin = margin
+        postings = {}
+        sizes = []
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.float64)
+
+    def match(self, name):
+        """
+        (best name, similarity) for a normalized name. The name is None if the
+        best candidate is below the threshold or too close to the runner-up.
+        """
+        grams = trigrams(name)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not hits:
+            return None, 0.0
+        common = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        scores = 2 * common / (len(grams) + self._sizes)
+        if len(scores) > 1:
+            top_two = np.argpartition(scores, -2)[-2:]
+            runner_up, best = top_two[np.argsort(scores[top_two])]
+            lead = scores[best] - scores[runner_up]
+        else:
+            best, lead = 0, 1.0
+        score = float(scores[best])
+        if score < self.threshold or lead < self.margin:
+            return None, score
+        return self.names[best], score
+
+# -------------------------------#
+# NAME INDEX
+# -------------------------------#
+
+class NameIndex:
+    """
+    Normalized player name -> the keys (e.g. MLBAMIDs) of every player
+    with that name. Built once per data version and shared by drafting,
+    the name filter and the "not found" check. Names with no exact match
+    can be resolved approximately with `resolve` / `fuzzy=True`.
+    """
+
+    def __init__(self, names, keys):
+        frame = pd.DataFrame({
+            "name": pd.Series(names).to_numpy(dtype=object),
+            "normalized": pd.Series(names).map(normalize_name).to_numpy(),
+            "key": pd.Series(keys).to_numpy(),
+        })
+        frame = frame[(frame["normalized"] != "") & frame["key"].notna()]
+        grouped = frame.drop_duplicates(["normalized", "key"]).groupby("normalized", sort=False)
+        self._keys = {name: tuple(group.tolist()) for name, group in grouped["key"]}
+        # A display name per normalized name, for reporting approximate matches
+        self._display = dict(zip(grouped["name"].first().index, grouped["name"].first()))
+        self._matcher = None
+        self._resolved = {}
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def matcher(self):
+        # Built on first use: most sessions only need exact lookups
+        if self._matcher is None:
+            self._matcher = FuzzyMatcher(self._keys)
+        return self._matcher
+
+    def resolve(self, name):
+        """
+        (keys, matched name, confidence) for `name`. Exact (normalized)
+        matches have confidence 1.0; otherwise the closest name by trigram
+        similarity is used if it is confident enough, else keys are empty.
+        """
+        normalized = normalize_name(name)
+        if normalized in self._keys:
+            return self._keys[normalized], self._display[normalized], 1.0
+        if normalized not in self._resolved:
+            matched, score = self.matcher.match(normalized) if normalized else (None, 0.0)
+            if matched is None:
+                self._resolved[normalized] = ((), None, score)
+            else:
+                self._resolved[normalized] = (self._keys[matched], self._display[matched], score)
+        return self._resolved[normalized]
+
+    def lookup(self, name, fuzzy=False):
+        """Keys of the players called `name` (empty if none)."""
+        if fuzzy:
+            return self.resolve(name)[0]
+        return self._keys.get(normalize_name(name), ())
+
+    def lookup_many(self, names, fuzzy=False):
+        """Keys of every player matching any of `names`."""
+        return {key for name in names for key in self.lookup(name, fuzzy=fuzzy)}
@@ -0,0 +1,155 @@
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# -------------------------------#
+# SHARED ARRAYS
+# -------------------------------#
+
+def available_cpus():
+    """CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        return os.cpu_count() or 1
+
+class SharedArrays:
+    """
+    Named NumPy arrays copied into shared memory blocks, so worker
+    processes can attach to them by name (see `attach`) instead of having
+    them pickled. Use as a context manager; the blocks are freed on exit.
+    """
+
+    def __init__(self, arrays):
+        self.blocks = {}
+        self.arrays = {}
+        try:
+            for key, values in arrays.items():
+                values = np.ascontiguousarray(values)
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self.blocks[key] = block
+                self.arrays[key] = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+                self.arrays[key][...] = values
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def specs(self):
+        """{key: (block name, shape, dtype)}: what a worker needs to attach."""
+        return {key: (self.blocks[key].name, a.shape, a.dtype.str) for key, a in self.arrays.items()}
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def attach(specs):
+    """(blocks, arrays) for `SharedArrays.specs`; close the blocks when done with the arrays."""
+    blocks, arrays = {}, {}
+    for key, (name, shape, dtype) in specs.items():
+        blocks[key] = shared_memory.SharedMemory(name=name)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+    return blocks, arrays
+
+def _run_task(func, specs, task):
+    blocks, arrays = attach(specs)
+    try:
+        func(arrays, **task)
+    finally:
+        del arrays
+        for block in blocks.values():
+            block.close()
+
+# -------------------------------#
+# EXECUTOR
+# -------------------------------#
+
+class ShardExecutor:
+    """
+    Runs batch work split by player across a process pool.
+
+    `run(func, inputs, outputs, tasks)` calls `func(arrays, **task)` for
+    each task, where `arrays` maps each input and output name to an
+    array in shared memory. Each task reads its slice of players from the
+    inputs and writes them into the outputs, so results land in player
+    order whatever order the tasks finish in, and match running the same
+    tasks serially. `func` must be a module-level function, since workers
+    are started with "spawn" (safe from the app's and server's threads).
+
+    With one worker, or one task, everything runs in this process. The
+    pool is started on first use and kept until `close`. If a task fails,
+    the rest are cancelled or waited for before the error is raised, so
+    no worker is left using freed shared memory.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or available_cpus()
+        self._pool = None
+        self._lock = threading.Lock()  # e.g. a Board serving concurrent HTTP requests
+
+    def shards(self, rows, min_rows=1):
+        """(start, stop) ranges splitting `rows` into about one per worker, each at least `min_rows`."""
+        count = max(1, min(self.workers, rows // max(min_rows, 1)))
+        bounds = np.linspace(0, rows, count + 1).astype(int)
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    def run(self, func, inputs, outputs, tasks):
+        """
+        `outputs` maps names to (shape, dtype) arrays, created filled with
+        NaN (or zero for non-float dtypes). Returns them once every task is done.
+        """
+        empty = {
+            key: np.full(shape, np.nan if np.dtype(dtype).kind == "f" else 0, dtype=dtype)
+            for key, (shape, dtype) in outputs.items()
+        }
+        if self.workers == 1 or len(tasks) <= 1:
+            arrays = {**inputs, **empty}
+            for task in tasks:
+                func(arrays, **task)
+            return {key: arrays[key] for key in outputs}
+
+        with SharedArrays({**inputs, **empty}) as shared:
+            pool = self._get_pool()
+            futures = [pool.submit(_run_task, func, shared.specs, task) for task in tasks]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                # On a failure, drop the queued tasks and let running ones finish before the blocks are freed
+                for future in futures:
+                    future.cancel()
+                concurrent.futures.wait(futures)
+            return {key: shared.arrays[key].copy() for key in outputs}
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,511 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+DISCOUNT_RATE = 0.10  # 10% discount rate
+FINAL_AGE = 46  # Players are projected through their age-45 season
+PROJECTION_YEARS = FINAL_AGE  # Widest window: a player starting from age 0
+MISSING_DELTA = -2.5  # Delta used for ages outside the curve
+
+# Discount factor for each season from now, computed exactly as the scalar loop does
+DISCOUNT_FACTORS = np.array([1 / ((1 + DISCOUNT_RATE) ** k) for k in range(PROJECTION_YEARS)])
+DISCOUNT_FACTORS.flags.writeable = False
+
+# -------------------------------#
+# AGING CURVES
+# -------------------------------#
+
+class AgingCurve:
+    """
+    An immutable, array-backed aging curve.
+
+    `deltas` maps integer age -> yearly WAR change. On construction the
+    curve is laid out as `lower`/`upper` tables indexed by
+    (starting age, years from now): row j holds the deltas a player who is
+    j-and-a-fraction years old interpolates between in each remaining season.
+    Projecting a player is then one row lookup and one cumulative sum.
+    """
+
+    def __init__(self, name, deltas, missing_delta=MISSING_DELTA):
+        self.name = name
+        self.deltas = MappingProxyType(dict(deltas))
+        self.missing_delta = missing_delta
+
+        # Deltas by integer age 0..FINAL_AGE+1, missing ages filled in
+        by_age = np.full(FINAL_AGE + 2, missing_delta)
+        for age, delta in deltas.items():
+            if 0 <= age < len(by_age):
+                by_age[age] = delta
+
+        # Season k for a player starting at integer age j uses ages j+k and j+k+1
+        start = np.arange(FINAL_AGE)[:, None]
+        year = np.arange(PROJECTION_YEARS)[None, :]
+        lower_age = np.minimum(start + year, FINAL_AGE)
+        self.lower = by_age[lower_age]
+        self.upper = by_age[lower_age + 1]
+        for table in (self.lower, self.upper):
+            table.flags.writeable = False
+
+    def __repr__(self):
+        return f"AgingCurve({self.name!r})"
+
+    def __reduce__(self):
+        # Rebuilt from its deltas when pickled, e.g. to hand to a worker process
+        return AgingCurve, (self.name, dict(self.deltas), self.missing_delta)
+
+    def windows(self, ages):
+        """Lower/upper delta tables (players x years) for an array of starting ages."""
+        rows = np.clip(np.nan_to_num(np.trunc(ages), nan=0), 0, FINAL_AGE - 1).astype(np.intp)
+        return self.lower[rows], self.upper[rows]
+
+    def project(self, age, war, discount=False):
+        """Career WAR for a single player."""
+        return float(project_career_war([age], [war], discount=discount, curve=self)[0])
+
+
+AGING_CURVES = {}
+
+def register_curve(name, deltas, missing_delta=MISSING_DELTA):
+    """
+    Builds an AgingCurve and registers it under `name` so it can be
+    passed to the projection functions as `curve=name`.
+    """
+    curve = AgingCurve(name, deltas, missing_delta=missing_delta)
+    AGING_CURVES[name] = curve
+    return curve
+
+def get_curve(curve=None, is_pitcher=False, flatten=False):
+    """
+    Resolves a curve argument: an AgingCurve, a registered name, or None
+    for the standard/flattened hitter or pitcher curve.
+    """
+    if isinstance(curve, AgingCurve):
+        return curve
+    if curve is None:
+        curve = ("flat_" if flatten else "") + ("pitcher" if is_pitcher else "hitter")
+    try:
+        return AGING_CURVES[curve]
+    except KeyError:
+        raise KeyError(f"Unknown aging curve {curve!r}; registered: {sorted(AGING_CURVES)}") from None
+
+
+# Standard pitcher deltas
+PITCHER_CURVE = register_curve("pitcher", {
+    16: +0.27, 17: +0.22, 18: +0.22, 19: +0.17, 20: +0.17,
+    21: +0.17, 22: +0.07, 23: +0.07, 24: +0.07,
+    25: +0.00, 26: +0.00, 27: -0.08, 28: -0.18, 29: -0.18,
+    30: -0.28, 31: -0.28, 32: -0.38, 33: -0.38, 34: -0.48,
+    35: -0.58, 36: -0.68, 37: -0.78, 38: -0.88, 39: -0.98,
+    40: -1.08, 41: -1.18, 42: -1.28, 43: -1.38, 44: -1.48,
+    45: -1.58
+})
+
+# Flattened pitcher deltas
+FLAT_PITCHER_CURVE = register_curve("flat_pitcher", {
+    16: +0.02, 17: +0.01, 18: +0.00, 19: -0.01, 20: -0.02,
+    21: -0.02, 22: -0.05, 23: -0.08, 24: -0.08,
+    25: -0.11, 26: -0.14, 27: -0.17, 28: -0.22, 29: -0.22,
+    30: -0.25, 31: -0.25, 32: -0.30, 33: -0.30, 34: -0.33,
+    35: -0.37, 36: -0.41, 37: -0.45, 38: -0.50, 39: -0.55,
+    40: -0.60, 41: -0.65, 42: -0.70, 43: -0.75, 44: -0.80,
+    45: -0.85
+})
+
+# Standard hitter deltas
+HITTER_CURVE = register_curve("hitter", {
+    16: +0.35, 17: +0.30, 18: +0.30, 19: +0.25, 20: +0.25,
+    21: +0.20, 22: +0.20, 23: +0.10, 24: +0.10,
+    25: +0.03, 26: +0.03, 27: -0.05, 28: -0.15, 29: -0.25,
+    30: -0.35, 31: -0.45, 32: -0.55, 33: -0.65, 34: -0.75,
+    35: -0.85, 36: -0.95, 37: -1.15, 38: -1.35, 39: -1.55,
+    40: -1.75, 41: -1.95, 42: -2.15, 43: -2.35, 44: -2.55,
+    45: -2.80
+})
+
+# Flattened hitter deltas
+FLAT_HITTER_CURVE = register_curve("flat_hitter", {
+    16: +0.05, 17: +0.03, 18: +0.02, 19: +0.01, 20: +0.01,
+    21: +0.01, 22: -0.03, 23: -0.06, 24: -0.09,
+    25: -0.13, 26: -0.17, 27: -0.21, 28: -0.25, 29: -0.30,
+    30: -0.35, 31: -0.40, 32: -0.45, 33: -0.50, 34: -0.55,
+    35: -0.60, 36: -0.70, 37: -0.80, 38: -0.90, 39: -1.00,
+    40: -1.10, 41: -1.20, 42: -1.30, 43: -1.40, 44: -1.50,
+    45: -1.60
+})
+
+# -------------------------------#
+# SCALAR REFERENCE
+# -------------------------------#
+
+def interpolate_delta(age_deltas, age):
+    """
+    Interpolates between two ages based on decimal age.
+    For example, age 24.8 will use 20% of age 24's delta and 80% of age 25's delta.
+    """
+    lower_age = int(age)
+    upper_age = lower_age + 1
+    decimal_part = age - lower_age
+
+    lower_delta = age_deltas.get(lower_age, MISSING_DELTA)
+    upper_delta = age_deltas.get(upper_age, MISSING_DELTA)
+
+    return (1 - decimal_part) * lower_delta + decimal_part * upper_delta
+
+def aging_projection(row, is_pitcher, discount, flatten):
+    """
+    Calculates career WAR from current WAR and age,
+    optionally using a flattened or standard aging curve,
+    and optionally discounting future WAR.
+
+    This is the one-player reference implementation; `project_career_war`
+    computes the same thing for whole columns at once.
+    """
+    age = float(row["Age"])
+    current_war = row["WAR"]  # System-specific single-year WAR
+    total_future_war = max(0, current_war)
+    years_from_now = 0
+
+    # Choose deltas based on whether it's a pitcher or hitter, and whether flattening is used
+    deltas = get_curve(is_pitcher=is_pitcher, flatten=flatten).deltas
+
+    # Project until age 45
+    while age < FINAL_AGE:
+        delta = interpolate_delta(deltas, age)
+        current_war += delta
+
+        if current_war > 0:
+            if discount:
+                discount_factor = 1 / ((1 + DISCOUNT_RATE) ** years_from_now)
+                total_future_war += current_war * discount_factor
+            else:
+                total_future_war += current_war
+
+        age += 1
+        years_from_now += 1
+
+    return total_future_war
+
+# -------------------------------#
+# VECTORIZED ENGINE
+# -------------------------------#
+
+def _running_sum(start, steps):
+    """
+    Left-to-right running sum of `start` (players,) followed by `steps`
+    (players x years). np.cumsum accumulates sequentially, so every entry
+    matches the scalar `+=` loop bit for bit.
+    """
+    return np.cumsum(np.column_stack([start, steps]), axis=1)[:, 1:]
+
+def yearly_war_matrix(ages, wars, is_pitcher=False, flatten=False, curve=None):
+    """
+    Projects every player's WAR path at once.
+
+    Returns (war_path, active): two (players x years) arrays where
+    war_path[i, k] is player i's projected WAR k seasons from now and
+    active[i, k] is False once the player has aged past the curve.
+    """
+    curve = get_curve(curve, is_pitcher=is_pitcher, flatten=flatten)
+    ages = np.asarray(ages, dtype=float)
+    wars = np.asarray(wars, dtype=float)
+
+    valid_ages = ages[~np.isnan(ages)]
+    n_years = int(np.ceil(max(0.0, FINAL_AGE - valid_ages.min()))) if len(valid_ages) else 0
+    n_years = min(n_years, PROJECTION_YEARS)
+
+    # Age in each projected season, accumulated the same way the scalar loop does
+    age_path = _running_sum(ages, np.ones((len(ages), max(n_years - 1, 0))))
+    age_path = np.column_stack([ages, age_path])[:, :n_years]
+    active = age_path < FINAL_AGE
+    decimal_part = age_path - np.trunc(age_path)
+
+    lower, upper = curve.windows(ages)
+    deltas = (1 - decimal_part) * lower[:, :n_years] + decimal_part * upper[:, :n_years]
+    war_path = _running_sum(wars, np.where(active, deltas, 0.0))
+    return war_path, active
+
+def _career_from_path(wars, war_path, active, discount):
+    """Collapses a projected WAR path into career WAR, optionally discounted."""
+    if discount:
+        contributions = war_path * DISCOUNT_FACTORS[:war_path.shape[1]]
+    else:
+        contributions = war_path
+    contributions = np.where(active & (war_path > 0), contributions, 0.0)
+
+    current = np.where(wars > 0, wars, 0.0)
+    if contributions.shape[1] == 0:
+        return current
+    return _running_sum(current, contributions)[:, -1]
+
+def project_career_war(ages, wars, is_pitcher=False, discount=False, flatten=False, curve=None):
+    """
+    Vectorized `aging_projection`: takes Age and WAR arrays and returns
+    the career WAR for every player. `curve` overrides the hitter/pitcher
+    curve with an AgingCurve or registered curve name.
+    """
+    wars = np.asarray(wars, dtype=float)
+    war_path, active = yearly_war_matrix(ages, wars, is_pitcher=is_pitcher, flatten=flatten, curve=curve)
+    return _career_from_path(wars, war_path, active, discount)
+
+# -------------------------------#
+# TOGGLE VARIANTS
+# -------------------------------#
+
+# Every (discount, flatten) combination the UI toggles can select
+CAREER_VARIANTS = [(False, False), (True, False), (False, True), (True, True)]
+
+def variant_suffix(discount, flatten):
+    """Column suffix for a toggle combination; the default variant has none."""
+    return ("_Flat" if flatten else "") + ("_Disc" if discount else "")
+
+# Fewest players worth handing to a worker process
+MIN_SHARD_ROWS = 50_000
+
+def _variants_shard(arrays, start, stop, is_pitcher, use_grid):
+    """ShardExecutor task: the toggle variants of players start:stop, written into arrays[variant_suffix]."""
+    variants = project_career_war_variants(
+        arrays["ages"][start:stop], arrays["wars"][start:stop], is_pitcher=is_pitcher, use_grid=use_grid
+    )
+    for (discount, flatten), career in variants.items():
+        arrays[variant_suffix(discount, flatten)][start:stop] = career
+
+def project_career_war_variants(ages, wars, is_pitcher=False, use_grid=False, executor=None):
+    """
+    Career WAR for all four toggle combinations at once, as a dict keyed
+    by (discount, flatten). Each curve's WAR path is projected once and
+    collapsed both with and without the discount.
+
+    With a parallel.ShardExecutor, large batches are split by player
+    across its workers. Each player's projection doesn't depend on the
+    rest of the batch, so the results are identical.
+    """
+    ages = np.asarray(ages, dtype=float)
+    wars = np.asarray(wars, dtype=float)
+    if executor is not None:
+        shards = executor.shards(len(ages), min_rows=MIN_SHARD_ROWS)
+        if len(shards) > 1:
+            careers = executor.run(
+                _variants_shard,
+                inputs={"ages": ages, "wars": wars},
+                outputs={variant_suffix(*variant): (len(ages), float) for variant in CAREER_VARIANTS},
+                tasks=[
+                    {"start": start, "stop": stop, "is_pitcher": is_pitcher, "use_grid": use_grid}
+                    for start, stop in shards
+                ],
+            )
+            return {variant: careers[variant_suffix(*variant)] for variant in CAREER_VARIANTS}
+    results = {}
+    for flatten in (False, True):
+        if use_grid:
+            for discount in (False, True):
+                grid = career_war_grid(is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+                results[(discount, flatten)] = grid.lookup(ages, wars)
+        else:
+            war_path, active = yearly_war_matrix(ages, wars, is_pitcher=is_pitcher, flatten=flatten)
+            for discount in (False, True):
+                results[(discount, flatten)] = _career_from_path(wars, war_path, active, discount)
+    return results
+
+# -------------------------------#
+# CAREER WAR LOOKUP GRID
+# -------------------------------#
+
+class CareerWarGrid:
+    """
+    Career WAR precomputed on an (age, WAR) grid and read back with
+    bilinear interpolation, so each lookup is O(1) no matter how many
+    players are projected.
+
+    Error bound: grid nodes hold the exact engine's values. Within a
+    whole-age band [n, n+1) a player always gets 46 - n seasons, and career
+    WAR is max(0, WAR) + sum_k weight_k * max(0, WAR + S_k(age)), with each
+    running delta sum S_k linear in age. At whole ages the season count
+    drops by one, so cells ending on a whole age interpolate towards the
+    limit from below. Each term is a hinge over a plane, and bilinear
+    interpolation is exact for planes. Only hinges whose break-even line
+    WAR = -S_k crosses a cell add error, and the interpolant never falls
+    below the exact value. Two bounds are computed when the grid is built:
+
+    - `node_age_error_bound`: for ages on the age grid (every shipped file
+      uses 0.1-year ages), only WAR is interpolated. A hinge breaking inside
+      a WAR cell adds at most weight_k * war_step / 4. This is the largest
+      per-cell sum, at most 0.025 WAR for the built-in curves at the
+      default spacing.
+    - `error_bound`: for any age, a crossing hinge adds at most
+      weight_k * max|WAR + S_k| / 2 over the cell's corners. This is the
+      largest per-cell sum. It is looser, up to about 1.2 WAR for the
+      flattened curves, because adjacent seasons break even close together.
+
+    Inputs outside the grid fall back to the exact engine.
+    """
+
+    def __init__(self, curve, discount=False, age_range=(15.0, FINAL_AGE), war_range=(-5.0, 15.0),
+                 age_step=0.1, war_step=0.025):
+        self.curve = get_curve(curve)
+        self.discount = discount
+        self.age_step = age_step
+        self.war_step = war_step
+        self.ages = np.round(np.arange(age_range[0], age_range[1] + age_step / 2, age_step), 6)
+        self.wars = np.round(np.arange(war_range[0], war_range[1] + war_step / 2, war_step), 6)
+
+        node_ages, node_wars = np.meshgrid(self.ages, self.wars, indexing="ij")
+        self.values = project_career_war(
+            node_ages.ravel(), node_wars.ravel(), discount=discount, curve=self.curve
+        ).reshape(node_ages.shape)
+
+        # Value each cell interpolates towards at its upper age: the next
+        # node, or the limit from below when that node is a whole age
+        bands = np.floor(self.ages[:-1])
+        lower_steps, _ = self._band_steps(self.ages[:-1], bands)
+        upper_steps, weights = self._band_steps(self.ages[1:], bands)
+        self.upper_values = self.values[1:].copy()
+        whole = self.ages[1:] == np.floor(self.ages[1:])
+        self.upper_values[whole] = self._band_career(upper_steps[whole], weights[whole])
+
+        for table in (self.values, self.upper_values):
+            table.flags.writeable = False
+        self.node_age_error_bound, self.error_bound = self._error_bounds(lower_steps, upper_steps, weights)
+
+    def __repr__(self):
+        return (
+            f"CareerWarGrid({self.curve.name!r}, discount={self.discount}, "
+            f"node_age_error_bound={self.node_age_error_bound:.4f}, error_bound={self.error_bound:.4f})"
+        )
+
+    def _band_steps(self, ages, bands):
+        """
+        Running delta sums S_k (ages x seasons) for ages measured from the
+        start of whole-age `bands`, plus each season's weight (0 once the
+        player has aged out).
+        """
+        fraction = (ages - bands)[:, None]
+        lower, upper = self.curve.windows(bands)
+        active = np.arange(PROJECTION_YEARS)[None, :] < (FINAL_AGE - bands)[:, None]
+        steps = np.cumsum(np.where(active, (1 - fraction) * lower + fraction * upper, 0.0), axis=1)
+        factors = DISCOUNT_FACTORS if self.discount else np.ones(PROJECTION_YEARS)
+        return steps, np.where(active, factors, 0.0)
+
+    def _band_career(self, steps, weights):
+        wars = self.wars[None, :, None]
+        seasons = (weights[:, None, :] * np.maximum(0.0, wars + steps[:, None, :])).sum(axis=2)
+        return np.maximum(0.0, self.wars)[None, :] + seasons
+
+    def _error_bounds(self, lower_steps, upper_steps, weights):
+        # The current season is a hinge too, with S = 0 and weight 1
+        ones = np.ones((len(weights), 1))
+        lower_steps = np.hstack([0 * ones, lower_steps])
+        upper_steps = np.hstack([0 * ones, upper_steps])
+        weights = np.hstack([ones, weights])
+
+        wars_lo = self.wars[:-1][:, None]
+        wars_hi = self.wars[1:][:, None]
+        node_bound = self.war_step / 4  # Last age node: only the current season
+        bound = 0.0
+        for s_lo, s_hi, weight in zip(lower_steps, upper_steps, weights):
+            # WAR-only interpolation at the cell's lower age node
+            breaks = (wars_lo < -s_lo) & (-s_lo < wars_hi)
+            node_error = (weight * breaks).sum(axis=1) * self.war_step / 4
+            node_bound = max(node_bound, float(node_error.max()))
+
+            corners = np.stack([wars_lo + s_lo, wars_lo + s_hi, wars_hi + s_lo, wars_hi + s_hi])
+            low, high = corners.min(axis=0), corners.max(axis=0)
+            crossing = (low < 0) & (high > 0)
+            cell_error = (weight * np.where(crossing, np.maximum(-low, high), 0.0)).sum(axis=1) / 2
+            bound = max(bound, float(cell_error.max()))
+        return node_bound, max(bound, node_bound)
+
+    def _coordinates(self, values, axis, step):
+        # Position along an axis, snapped to the nearest node when within float noise
+        position = (values - axis[0]) / step
+        nearest = np.round(position)
+        position = np.where(np.abs(position - nearest) < 1e-6, nearest, position)
+        cell = np.clip(np.floor(position), 0, len(axis) - 2)
+        return cell.astype(np.intp), position - cell
+
+    def lookup(self, ages, wars):
+        """Career WAR for arrays of ages and WARs."""
+        ages = np.asarray(ages, dtype=float)
+        wars = np.asarray(wars, dtype=float)
+        result = np.empty(len(ages))
+
+        # The last age node is only ever reached from below, so exact ages
+        # on it go to the engine along with everything off the grid
+        on_grid = (
+            (ages >= self.ages[0]) & (ages < self.ages[-1])
+            & (wars >= self.wars[0]) & (wars <= self.wars[-1])
+        )
+        if not on_grid.all():
+            result[~on_grid] = project_career_war(
+                ages[~on_grid], wars[~on_grid], discount=self.discount, curve=self.curve
+            )
+
+        i, t = self._coordinates(ages[on_grid], self.ages, self.age_step)
+        j, u = self._coordinates(wars[on_grid], self.wars, self.war_step)
+        lower, upper = self.values, self.upper_values
+        result[on_grid] = (
+            (1 - t) * ((1 - u) * lower[i, j] + u * lower[i, j + 1])
+            + t * ((1 - u) * upper[i, j] + u * upper[i, j + 1])
+        )
+        return result
+
+
+@lru_cache(maxsize=None)
+def _cached_grid(curve_name, discount):
+    return CareerWarGrid(curve_name, discount=discount)
+
+def career_war_grid(is_pitcher=False, discount=False, flatten=False, curve=None):
+    """Returns the lookup grid for a curve/discount combination, building it on first use."""
+    return _cached_grid(get_curve(curve, is_pitcher=is_pitcher, flatten=flatten).name, discount)
+
+def calculate_career_war(df, is_pitcher=False, discount=False, flatten=False, war_col="WAR", new_col="CareerWAR", curve=None, use_grid=False):
+    """
+    Adds a column `new_col` to df that calculates the career WAR
+    given the current (war_col), age, and an aging-curve approach.
+    With use_grid=True the values come from the cached CareerWarGrid.
+    """
+    # Make sure Age and WAR columns are numeric
+    df["Age"] = pd.to_numeric(df["Age"], errors="coerce")
+    df[war_col] = pd.to_numeric(df[war_col], errors="coerce")
+
+    ages = df["Age"].to_numpy(dtype=float)
+    wars = df[war_col].to_numpy(dtype=float)
+    if use_grid:
+        grid = career_war_grid(is_pitcher=is_pitcher, discount=discount, flatten=flatten, curve=curve)
+        career = grid.lookup(ages, wars)
+    else:
+        career = project_career_war(
+            ages,
+            wars,
+            is_pitcher=is_pitcher,
+            discount=discount,
+            flatten=flatten,
+            curve=curve
+        )
+    df[new_col] = pd.Series(career, index=df.index).round(1)
+
+    return df
+
+def calculate_career_war_variants(
+    df, is_pitcher=False, war_col="WAR", new_col="CareerWAR", use_grid=False, executor=None
+):
+    """
+    Like `calculate_career_war`, but adds one column per toggle combination:
+    `new_col` for the default, and `new_col` + variant_suffix(...) for the rest.
+    `executor` is passed to `project_career_war_variants`.
+    """
+    df["Age"] = pd.to_numeric(df["Age"], errors="coerce")
+    df[war_col] = pd.to_numeric(df[war_col], errors="coerce")
+
+    variants = project_career_war_variants(
+        df["Age"].to_numpy(dtype=float),
+        df[war_col].to_numpy(dtype=float),
+        is_pitcher=is_pitcher,
+        use_grid=use_grid,
+        executor=executor,
+    )
+    for (discount, flatten), career in variants.items():
+        df[new_col + variant_suffix(discount, flatten)] = pd.Series(career, index=df.index).round(1)
+
+    return df
@@ -0,0 +1,278 @@
+import ast
+import operator
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------#
+# PARSING
+# -------------------------------#
+
+class QueryError(ValueError):
+    """A custom query that can't be parsed."""
+
+COMPARISONS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+ARITHMETIC = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+# The comparison seen from the other side, for `3 < SteamerWAR`
+FLIPPED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq}
+
+BACKTICK = re.compile(r"`([^`]*)`")
+# The functions DataFrame.query can call by name (pandas' MATHOPS); methods like .str.contains are fine too
+FUNCTIONS = frozenset({
+    "sin", "cos", "exp", "log", "expm1", "log1p", "sqrt", "sinh", "cosh", "tanh", "arcsin", "arccos",
+    "arctan", "arccosh", "arcsinh", "arctanh", "abs", "log10", "floor", "ceil", "arctan2",
+})
+
+class Query:
+    """
+    A custom query (pandas `DataFrame.query` syntax) parsed once.
+
+    `columns` are the column names it references, so it can be checked
+    against each frame before running. Comparisons, `and`/`or`/`not`
+    (and `&`/`|`/`~`), `in` lists and arithmetic are compiled to vectorized
+    operations; range predicates on indexed columns use a FrameIndex.
+    Anything else (e.g. `Name.str.contains("Jr")`) falls back to
+    `DataFrame.query` with the same text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        # Backtick-quoted names (`Avg_wRC+`) become placeholder identifiers
+        quoted = {}
+
+        def placeholder(match):
+            name = f"__col_{len(quoted)}__"
+            quoted[name] = match.group(1)
+            return name
+
+        source = BACKTICK.sub(placeholder, text)
+        try:
+            self.tree = ast.parse(source.strip(), mode="eval").body
+        except SyntaxError as e:
+            raise QueryError(f"{e.msg} in {text!r}") from None
+        self._quoted = quoted
+
+        functions = {node.func for node in ast.walk(self.tree) if isinstance(node, ast.Call)}
+        for func in functions:
+            # Caught here rather than by DataFrame.query, so it's reported once, not per frame
+            if isinstance(func, ast.Name) and func.id not in FUNCTIONS:
+                raise QueryError(f'"{func.id}" is not a supported function in {text!r}')
+        names = [node.id for node in ast.walk(self.tree) if isinstance(node, ast.Name) and node not in functions]
+        self.columns = list(dict.fromkeys(quoted.get(name, name) for name in names))
+        self.compiled = self._is_compilable(self.tree)
+
+    def missing_columns(self, columns):
+        """Referenced columns that aren't in `columns`."""
+        columns = set(columns)
+        return [col for col in self.columns if col not in columns]
+
+    def _is_compilable(self, node):
+        if isinstance(node, (ast.BoolOp, ast.Compare, ast.BinOp, ast.UnaryOp, ast.Name, ast.Constant)):
+            if isinstance(node, ast.Compare) and not all(
+                type(op) in COMPARISONS or isinstance(op, (ast.In, ast.NotIn)) for op in node.ops
+            ):
+                return False
+            if isinstance(node, ast.BinOp) and type(node.op) not in ARITHMETIC:
+                return isinstance(node.op, (ast.BitAnd, ast.BitOr)) and all(
+                    self._is_compilable(child) for child in (node.left, node.right)
+                )
+            if isinstance(node, ast.UnaryOp) and not isinstance(node.op, (ast.Not, ast.Invert, ast.USub, ast.UAdd)):
+                return False
+            return all(self._is_compilable(child) for child in ast.iter_child_nodes(node) if isinstance(child, ast.expr))
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return all(isinstance(elt, ast.Constant) for elt in node.elts)
+        return False
+
+    # -------------------------------#
+    # EVALUATION
+    # -------------------------------#
+
+    def mask(self, df, index=None):
+        """Boolean numpy mask of the rows of `df` matching the query."""
+        if not self.compiled:
+            positions = pd.RangeIndex(len(df))
+            return positions.isin(df.set_axis(positions).query(self.text).index)
+        return _as_mask(self._eval(self.tree, df, index), len(df))
+
+    def _column(self, name):
+        return self._quoted.get(name, name)
+
+    def _eval(self, node, df, index):
+        if isinstance(node, ast.Name):
+            return df[self._column(node.id)]
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [elt.value for elt in node.elts]
+        if isinstance(node, ast.BoolOp):
+            masks = [_as_mask(self._eval(value, df, index), len(df)) for value in node.values]
+            return np.logical_and.reduce(masks) if isinstance(node.op, ast.And) else np.logical_or.reduce(masks)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, df, index)
+            if isinstance(node.op, (ast.Not, ast.Invert)):
+                return ~_as_mask(operand, len(df))
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+                left = _as_mask(self._eval(node.left, df, index), len(df))
+                right = _as_mask(self._eval(node.right, df, index), len(df))
+                return left & right if isinstance(node.op, ast.BitAnd) else left | right
+            return ARITHMETIC[type(node.op)](self._eval(node.left, df, index), self._eval(node.right, df, index))
+        if isinstance(node, ast.Compare):
+            # Chained comparisons (20 < Age < 25) are the `and` of each pair
+            operands = [node.left, *node.comparators]
+            masks = [
+                self._compare(left, op, right, df, index)
+                for left, op, right in zip(operands, node.ops, operands[1:])
+            ]
+            return np.logical_and.reduce(masks)
+        raise QueryError(f"Unsupported expression in {self.text!r}")
+
+    def _compare(self, left, op, right, df, index):
+        if index is not None:
+            # Column vs number: binary search on the column's sorted index
+            if isinstance(right, ast.Name) and _is_number(left):
+                left, op, right = right, FLIPPED.get(type(op), type(op))(), left
+            if isinstance(left, ast.Name) and _is_number(right) and type(op) in FLIPPED:
+                rows = index.range(self._column(left.id), type(op), right.value, df=df)
+                if rows is not None:
+                    return rows
+
+        left_value = self._eval(left, df, index)
+        right_value = self._eval(right, df, index)
+        # As in DataFrame.query, `== [...]` means `in [...]`
+        if isinstance(op, (ast.In, ast.NotIn, ast.Eq, ast.NotEq)) and (
+            isinstance(right_value, list) or isinstance(op, (ast.In, ast.NotIn))
+        ):
+            values = right_value if isinstance(right_value, list) else [right_value]
+            matched = _as_mask(pd.Series(left_value).isin(values), len(df))
+            return matched if isinstance(op, (ast.In, ast.Eq)) else ~matched
+        return _as_mask(COMPARISONS[type(op)](left_value, right_value), len(df))
+
+def _is_number(node):
+    return isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+
+def _as_mask(value, length):
+    """Boolean numpy array from a comparison result; missing values don't match."""
+    if isinstance(value, pd.Series):
+        if value.dtype != bool:
+            value = value.fillna(False)
+        return value.to_numpy(dtype=bool)
+    if isinstance(value, np.ndarray):
+        return value.astype(bool, copy=False)
+    return np.full(length, bool(value))
+
+@lru_cache(maxsize=64)
+def compile_query(text):
+    """Parses a query once; the same text always gives the same Query."""
+    return Query(text)
+
+# -------------------------------#
+# SORTED COLUMN INDEXES
+# -------------------------------#
+
+def is_indexed_column(col):
+    """Columns that commonly get range predicates: Age and the WAR/Career columns."""
+    return col == "Age" or "WAR" in col or "Career" in col
+
+class FrameIndex:
+    """
+    Sorted positions of a frame's indexed columns, built on first use.
+    `range` answers `col <op> value` with a binary search, returning a
+    boolean mask without comparing every row. Missing values never match.
+    A column is indexed from whichever frame first asks for it, so frames
+    passed to `range` must be views of the same rows and values (e.g.
+    different column subsets of one version).
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._sorted = {}
+
+    def _column_index(self, col, df):
+        if col not in self._sorted:
+            series = df[col]
+            if not (is_indexed_column(col) and pd.api.types.is_numeric_dtype(series.dtype)):
+                self._sorted[col] = None
+            else:
+                dtype = series.dtype if pd.api.types.is_float_dtype(series.dtype) else np.float64
+                values = series.to_numpy(dtype=dtype, na_value=np.nan)
+                positions = np.flatnonzero(~np.isnan(values))
+                order = positions[np.argsort(values[positions], kind="stable")]
+                self._sorted[col] = (values[order], order)
+        return self._sorted[col]
+
+    def range(self, col, op, value, df=None):
+        """Mask for `col <op> value`, or None if `col` isn't indexed."""
+        df = self.df if df is None else df
+        if col not in df.columns:
+            return None
+        column_index = self._column_index(col, df)
+        if column_index is None:
+            return None
+        sorted_values, order = column_index
+        # Compare in the column's own precision, as the vectorized comparison would
+        value = sorted_values.dtype.type(value)
+        if op is ast.Lt:
+            rows = order[:np.searchsorted(sorted_values, value, side="left")]
+        elif op is ast.LtE:
+            rows = order[:np.searchsorted(sorted_values, value, side="right")]
+        elif op is ast.Gt:
+            rows = order[np.searchsorted(sorted_values, value, side="right"):]
+        elif op is ast.GtE:
+            rows = order[np.searchsorted(sorted_values, value, side="left"):]
+        else:
+            rows = order[np.searchsorted(sorted_values, value, side="left"):np.searchsorted(sorted_values, value, side="right")]
+        mask = np.zeros(len(df), dtype=bool)
+        mask[rows] = True
+        return mask
+
+# -------------------------------#
+# MEMOIZED MASKS
+# -------------------------------#
+
+class QueryCache:
+    """
+    Memoizes query masks per (query, frame version) and keeps one
+    FrameIndex per frame version. `version` must change whenever the
+    frame's rows or values do; the oldest entries are dropped past `maxsize`.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._masks = OrderedDict()
+        self._indexes = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _get(self, cache, key, build):
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = cache[key] = build()
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return value
+
+    def index(self, df, version):
+        with self._lock:
+            return self._get(self._indexes, version, lambda: FrameIndex(df))
+
+    def mask(self, query, df, version, index_version=None):
+        """
+        The memoized mask of `query` on `df`. `index_version` identifies the
+        values of the indexed columns, when those change less often than
+        the frame as a whole; it defaults to `version`.
+        """
+        index = self.index(df, version if index_version is None else index_version)
+        with self._lock:
+            return self._get(self._masks, (query.text, version), lambda: query.mask(df, index=index))
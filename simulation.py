@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+from projection import DISCOUNT_FACTORS, FINAL_AGE, PROJECTION_YEARS, get_curve, yearly_war_matrix
+from sources import UNCERTAINTY_SCHEMA
+
+# -------------------------------#
+# SIMULATION SETTINGS
+# -------------------------------#
+
+DEFAULT_SIMULATIONS = 1000
+DEFAULT_SEED = 2025
+CHUNK_SIZE = 256  # players simulated at once; memory is ~chunk x sims x seasons float32s
+PERCENTILES = (10, 50, 90)
+THRESHOLDS = (10, 20, 30)  # career WAR levels to report the chance of reaching
+
+# Per-system uncertainty fields in the projection CSVs
+UNCERTAINTY_COLS = tuple(UNCERTAINTY_SCHEMA)
+FIELD_KEYS = ("inter_sd", "intra_sd", "vol", "skew")
+
+# Used where a projection leaves InterSD/IntraSD blank: the spread of a
+# player's first-season WAR around the projection, and the yearly drift of
+# his WAR away from the aging curve. Vol scales the drift and Skew is the
+# shape of the first-season distribution; they default to 1 and 0.
+DEFAULT_INTER_SD = {"hitter": 1.0, "pitcher": 0.8}
+DEFAULT_INTRA_SD = {"hitter": 0.5, "pitcher": 0.5}
+
+# -------------------------------#
+# ENGINE
+# -------------------------------#
+
+def _as_columns(values, players, systems, default):
+    """(players x systems) float array from None, a scalar, a (players,) or a (players x systems) array."""
+    if values is None:
+        return np.full((players, systems), default)
+    values = np.asarray(values, dtype=float)
+    if values.ndim < 2:
+        values = np.broadcast_to(values.reshape(-1, 1) if values.ndim else values, (players, systems))
+    return np.where(np.isnan(values), default, values)
+
+def _skewed_normal(rng, shape, skew):
+    """Standardized skew-normal draws (mean 0, sd 1); `skew` is the shape parameter, 0 for normal."""
+    if not np.any(skew):
+        return rng.standard_normal(shape, dtype=np.float32)
+    delta = skew / np.sqrt(1 + skew ** 2)
+    u0 = rng.standard_normal(shape, dtype=np.float32)
+    u1 = rng.standard_normal(shape, dtype=np.float32)
+    draws = delta * np.abs(u0) + np.sqrt(1 - delta ** 2) * u1
+    return (draws - delta * np.sqrt(2 / np.pi)) / np.sqrt(1 - 2 * delta ** 2 / np.pi)
+
+def _simulate_chunk(rng, ages, wars, fields, walks, curve, discount):
+    """Career WAR of each path per player, as a (players x sims) float32 array."""
+    inter_sd, intra_sd, vol, skew = fields
+    players, n_sims = len(ages), len(walks)
+
+    # Each path starts from one of the player's available projections, picked uniformly
+    available = ~np.isnan(wars)
+    counts = available.sum(axis=1)
+    order = np.argsort(~available, axis=1, kind="stable")  # available systems first
+    pick = (rng.random((players, n_sims)) * np.maximum(counts, 1)[:, None]).astype(np.intp)
+    system = np.take_along_axis(order, pick, axis=1)
+
+    def per_path(values):
+        return np.take_along_axis(values, system, axis=1).astype(np.float32)
+
+    start = per_path(wars) + per_path(inter_sd) * _skewed_normal(rng, (players, n_sims), per_path(skew))
+
+    # The aging curve's deltas plus the path's random walk of yearly drift, scaled per player
+    aging, active = yearly_war_matrix(ages, np.zeros(players), curve=curve)
+    n_years = aging.shape[1]
+    path = walks[None, :, :n_years] * (per_path(intra_sd) * per_path(vol))[:, :, None]
+    path += start[:, :, None]
+    path += aging.astype(np.float32)[:, None, :]
+    np.maximum(path, 0, out=path)
+
+    weights = DISCOUNT_FACTORS[:n_years] if discount else np.ones(n_years)
+    weights = np.where(active, weights, 0).astype(np.float32)
+    careers = np.maximum(start, 0) + np.einsum("psy,py->ps", path, weights)
+    careers[(counts == 0) | np.isnan(ages)] = np.nan
+    return careers
+
+def _chunk_seed(seed, index):
+    # The same streams as np.random.SeedSequence(seed).spawn(): 0 for the walks, then one per chunk
+    return np.random.SeedSequence(seed, spawn_key=(index,))
+
+def _simulate_chunks(arrays, first, last, seed, chunk_size, curve, discount, percentiles, thresholds):
+    """
+    Simulates chunks first:last of the players (in arrays["by_age"] order)
+    into arrays["summary"]. A parallel.ShardExecutor task, also run
+    directly for the serial path.
+    """
+    ages, wars, by_age, walks, summary = (arrays[key] for key in ("ages", "wars", "by_age", "walks", "summary"))
+    fields = [arrays[key] for key in FIELD_KEYS]
+    for chunk in range(first, last):
+        rows = by_age[chunk * chunk_size:(chunk + 1) * chunk_size]
+        careers = _simulate_chunk(
+            np.random.default_rng(_chunk_seed(seed, 1 + chunk)), ages[rows], wars[rows], [f[rows] for f in fields],
+            walks, curve, discount,
+        )
+        simulated = ~np.isnan(careers[:, 0])
+        rows, careers = rows[simulated], careers[simulated]
+        if percentiles:
+            summary[rows, :len(percentiles)] = np.percentile(careers, percentiles, axis=1).T
+        for i, threshold in enumerate(thresholds):
+            summary[rows, len(percentiles) + i] = (careers >= threshold).mean(axis=1)
+
+def simulate_career_war(
+    ages,
+    wars,
+    is_pitcher=False,
+    discount=False,
+    flatten=False,
+    curve=None,
+    inter_sd=None,
+    intra_sd=None,
+    vol=None,
+    skew=None,
+    n_sims=DEFAULT_SIMULATIONS,
+    seed=DEFAULT_SEED,
+    chunk_size=CHUNK_SIZE,
+    percentiles=PERCENTILES,
+    thresholds=THRESHOLDS,
+    executor=None,
+):
+    """
+    Monte Carlo career WAR: `n_sims` WAR/aging paths per player, summarized
+    as a DataFrame (one row per player, in order) with 'CareerP{p}' for each
+    of `percentiles` and 'CareerOver{t}' (chance of reaching t career WAR)
+    for each of `thresholds`.
+
+    `wars` is a (players,) array, or (players x systems) with NaN where a
+    system doesn't project the player: each path then starts from one of
+    the available projections at random, so disagreement between systems
+    widens the range. The uncertainty fields can be scalars or arrays of
+    the same shape, with blanks filled from the defaults above. Each path's
+    career is counted exactly as in `project_career_war`, which it matches
+    when both SDs are 0.
+
+    The yearly drift comes from one set of `n_sims` standard random walks
+    shared by every player (common random numbers: each player's paths are
+    still independent of each other, and players are compared on the same
+    draws), scaled by the player's IntraSD * Vol. Players are simulated
+    `chunk_size` at a time, youngest first (None for all at once), each
+    chunk drawing its starting shocks from its own stream of `seed`, so
+    results are reproducible for a given seed and chunk size. With a
+    parallel.ShardExecutor the chunks are split across its workers, with
+    identical results.
+    """
+    if n_sims < 1:
+        raise ValueError(f"n_sims must be at least 1, not {n_sims}")
+    ages = np.asarray(ages, dtype=float)
+    wars = np.asarray(wars, dtype=float)
+    wars = wars.reshape(len(ages), -1)
+    players, systems = wars.shape
+    kind = "pitcher" if is_pitcher else "hitter"
+    defaults = [DEFAULT_INTER_SD[kind], DEFAULT_INTRA_SD[kind], 1.0, 0.0]
+    fields = [
+        _as_columns(values, players, systems, default)
+        for values, default in zip([inter_sd, intra_sd, vol, skew], defaults)
+    ]
+    curve = get_curve(curve, is_pitcher=is_pitcher, flatten=flatten)
+
+    columns = [f"CareerP{p}" for p in percentiles] + [f"CareerOver{t}" for t in thresholds]
+    chunk_size = chunk_size or max(players, 1)
+    chunks = -(-players // chunk_size)
+    walks = np.cumsum(
+        np.random.default_rng(_chunk_seed(seed, 0)).standard_normal((n_sims, PROJECTION_YEARS), dtype=np.float32),
+        axis=1,
+    )
+    inputs = {
+        "ages": ages, "wars": wars, **dict(zip(FIELD_KEYS, fields)), "walks": walks,
+        # Youngest first, so each chunk only runs as many seasons as its players need
+        "by_age": np.argsort(np.nan_to_num(ages, nan=FINAL_AGE), kind="stable"),
+    }
+    options = {
+        "seed": seed, "chunk_size": chunk_size, "curve": curve, "discount": discount,
+        "percentiles": tuple(percentiles), "thresholds": tuple(thresholds),
+    }
+    if executor is None:
+        summary = np.full((players, len(columns)), np.nan)
+        _simulate_chunks({**inputs, "summary": summary}, 0, chunks, **options)
+    else:
+        summary = executor.run(
+            _simulate_chunks, inputs, outputs={"summary": ((players, len(columns)), float)},
+            tasks=[{"first": first, "last": last, **options} for first, last in executor.shards(chunks)],
+        )["summary"]
+    return pd.DataFrame(summary, columns=columns)
+
+def simulate_frame(df, systems, is_pitcher=False, discount=False, flatten=False, **options):
+    """
+    `simulate_career_war` over a merged frame: each system's '{system}WAR'
+    column (and '{system}_InterSD', ... where present), with Age. The
+    result is indexed like `df`; `options` go to `simulate_career_war`.
+    """
+    def stacked(template):
+        columns = [template.format(system) for system in systems]
+        if not any(col in df.columns for col in columns):
+            return None
+        return np.column_stack([
+            df[col].to_numpy(dtype=float, na_value=np.nan) if col in df.columns else np.full(len(df), np.nan)
+            for col in columns
+        ])
+
+    # Uncertainty passed in `options` overrides the frame's columns
+    fields = {key: stacked("{}_" + col) for key, col in zip(FIELD_KEYS, UNCERTAINTY_COLS)}
+    result = simulate_career_war(
+        df["Age"].to_numpy(dtype=float, na_value=np.nan), stacked("{}WAR"),
+        is_pitcher=is_pitcher, discount=discount, flatten=flatten, **{**fields, **options},
+    )
+    return result.set_axis(df.index)
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# -------------------------------#
+# PROJECTION SOURCES
+# -------------------------------#
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DATA_DIR, ".projection_cache")
+
+# Compact dtypes shared by every source. IDs are int32 so merges on
+# MLBAMID use integer keys, names are Arrow-backed strings, and low-
+# cardinality labels are categorical. Age and WAR stay float64: they feed
+# the aging engine, and float32 would shift values off the 0.1 grid.
+ID = "int32"
+STAT = "float32"
+EXACT = "float64"
+LABEL = "category"
+TEXT = "string[pyarrow]"
+
+# Per-projection uncertainty, for the career WAR simulation (see simulation.py)
+UNCERTAINTY_SCHEMA = {"InterSD": STAT, "IntraSD": STAT, "Vol": STAT, "Skew": STAT}
+
+HITTER_SCHEMA = {
+    "NameASCII": TEXT, "Team": LABEL, "Position": LABEL, "Age": EXACT,
+    "MLBAMID": ID, "PlayerId": TEXT, "WAR": EXACT, "wRC+": STAT, **UNCERTAINTY_SCHEMA,
+}
+PITCHER_SCHEMA = {
+    "NameASCII": TEXT, "Team": LABEL, "Age": EXACT, "MLBAMID": ID, "PlayerId": TEXT,
+    "WAR": EXACT, "G": STAT, "GS": STAT, "IP": STAT, "ERA": STAT, "FIP": STAT, **UNCERTAINTY_SCHEMA,
+}
+BA_TOP_100_SCHEMA = {"Rank": "int16", "Name": TEXT, "Team": LABEL, "Position": LABEL}
+
+# Source name -> CSV file and the columns (with dtypes) the app actually uses
+SOURCES = {
+    "zips_hitters": {"path": "zips-hitters-2025.csv", "schema": HITTER_SCHEMA},
+    "zips_pitchers": {"path": "zips-pitchers-2025.csv", "schema": PITCHER_SCHEMA},
+    "steamer_hitters": {"path": "steamer600-hitters-2025.csv", "schema": HITTER_SCHEMA},
+    "steamer_pitchers": {"path": "steamer600-pitchers-2025.csv", "schema": PITCHER_SCHEMA},
+    "batx_hitters": {"path": "batx-hitters-2025.csv", "schema": HITTER_SCHEMA},
+    "ba_top_100": {"path": "ba_top_100.csv", "schema": BA_TOP_100_SCHEMA},
+}
+
+def read_csv_with_schema(csv_path, schema):
+    """
+    Reads only the schema's columns from a CSV, with their declared dtypes.
+    Columns missing from the file are skipped. Integer ID columns are read
+    as numbers first, and rows without an ID are dropped because they
+    can't be merged.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    schema = {col: dtype for col, dtype in schema.items() if col in header}
+    id_cols = [col for col, dtype in schema.items() if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(dtype))]
+
+    df = pd.read_csv(
+        csv_path,
+        usecols=list(schema),
+        dtype={col: dtype for col, dtype in schema.items() if col not in id_cols}
+    )
+    for col in id_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = df.dropna(subset=id_cols).reset_index(drop=True)
+    return df.astype({col: schema[col] for col in id_cols})
+
+# -------------------------------#
+# COLUMNAR CACHE
+# -------------------------------#
+
+def file_sha256(path):
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_paths(csv_path, cache_dir=CACHE_DIR):
+    """The Feather file and its JSON metadata sidecar for a source CSV."""
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{stem}.feather"), os.path.join(cache_dir, f"{stem}.json")
+
+def _read_metadata(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_atomic(path, write):
+    # Write to a temp file of our own and rename, so a concurrent reader never sees a partial
+    # file and concurrent writers (threads included) never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def build_columnar_cache(csv_path, schema, cache_dir=CACHE_DIR, force=False):
+    """
+    Converts a CSV into an uncompressed Feather file holding only the
+    schema's columns, already cast to their declared dtypes.
+
+    The build is skipped when the CSV's mtime and size match the recorded
+    ones. If only the mtime moved (e.g. the file was re-saved unchanged),
+    the content hash decides, and a matching hash just refreshes the
+    recorded mtime. Returns the Feather path.
+    """
+    feather_path, meta_path = cache_paths(csv_path, cache_dir)
+    stat = os.stat(csv_path)
+    meta = _read_metadata(meta_path)
+    is_current = (
+        not force
+        and meta is not None
+        and meta.get("schema") == schema
+        and os.path.exists(feather_path)
+    )
+
+    if is_current and meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+        return feather_path
+
+    sha256 = file_sha256(csv_path)
+    if not (is_current and meta["sha256"] == sha256):
+        df = read_csv_with_schema(csv_path, schema)
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_atomic(feather_path, lambda p: df.to_feather(p, compression="uncompressed"))
+
+    meta = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256, "schema": schema}
+
+    def write_meta(path):
+        with open(path, "w") as f:
+            json.dump(meta, f)
+
+    _write_atomic(meta_path, write_meta)
+    return feather_path
+
+def load_source(name, cache_dir=CACHE_DIR):
+    """Loads a projection source from its Feather cache, rebuilding it first if stale."""
+    source = SOURCES[name]
+    csv_path = os.path.join(DATA_DIR, source["path"])
+    feather_path = build_columnar_cache(csv_path, source["schema"], cache_dir=cache_dir)
+    table = feather.read_table(feather_path, memory_map=True)
+    # Keep strings in Arrow memory instead of converting them to Python objects
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+    return df.astype({col: dtype for col, dtype in source["schema"].items() if col in df.columns})
+
+def source_fingerprint(name, cache_dir=CACHE_DIR):
+    """
+    Content hash of a source's CSV, for use as a cache key. Refreshes the
+    Feather cache first, so the hash is only recomputed when the file's
+    mtime or size moved.
+    """
+    csv_path = os.path.join(DATA_DIR, SOURCES[name]["path"])
+    build_columnar_cache(csv_path, SOURCES[name]["schema"], cache_dir=cache_dir)
+    return _read_metadata(cache_paths(csv_path, cache_dir)[1])["sha256"]
+
+def main():
+    for name, source in SOURCES.items():
+        feather_path = build_columnar_cache(os.path.join(DATA_DIR, source["path"]), source["schema"])
+        print(f"{name}: {os.path.relpath(feather_path, DATA_DIR)}")
+
+if __name__ == "__main__":
+    main()
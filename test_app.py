@@ -2,7 +2,8 @@
 
 import pytest
 import pandas as pd
-from app import calculate_career_war, interpolate_delta, aging_projection
+from board import create_fangraphs_urls, create_statcast_urls
+from projection import aging_projection, calculate_career_war, interpolate_delta
 
 def test_interpolate_delta():
     age_deltas = {24: 0.1, 25: 0.2}
@@ -115,4 +116,15 @@ def test_war_monotonicity():
             
             prev_projection = curr_projection
 
-# Add more tests for other functions
\ No newline at end of file
+# Add more tests for other functions
+
+def test_create_link_columns():
+    """Links are built for whole columns, missing where the ID is"""
+    fangraphs = create_fangraphs_urls(pd.Series(["19755", None]))
+    assert fangraphs[0] == "https://www.fangraphs.com/players/placeholder/19755/stats"
+    assert pd.isna(fangraphs[1])
+
+    statcast = create_statcast_urls(pd.Series([660271, None], dtype="Int32"), pd.Series(["Shohei Ohtani", "X"]), is_pitcher=True)
+    assert statcast[0] == "https://baseballsavant.mlb.com/savant-player/shohei-ohtani-660271?stats=statcast-r-pitching-mlb"
+    assert pd.isna(statcast[1])
+    assert create_statcast_urls(pd.Series([1]), pd.Series([None]))[0].startswith("https://baseballsavant.mlb.com/savant-player/player-1?")
@@ -0,0 +1,43 @@
+# tests/test_bench.py
+
+import json
+
+import pandas as pd
+import pytest
+from bench import compare, main, scale_frame
+
+def test_scale_frame_keeps_ids_unique():
+    df = pd.DataFrame({"MLBAMID": pd.array([5, 7], dtype="int32"), "PlayerId": ["a", "b"], "WAR": [1.0, 2.0]})
+    scaled = scale_frame(df, 3)
+    assert len(scaled) == 6 and scaled["MLBAMID"].is_unique and scaled["PlayerId"].is_unique
+    assert scaled["WAR"].tolist() == [1.0, 2.0] * 3
+
+def test_compare_flags_regressions():
+    baseline = [
+        {"stage": "project", "scale": 1, "seconds": 0.100, "peak_mb": 10.0},
+        {"stage": "render", "scale": 1, "seconds": 0.001, "peak_mb": 1.0},
+    ]
+    results = [
+        {"stage": "project", "scale": 1, "seconds": 0.200, "peak_mb": 20.0},
+        {"stage": "render", "scale": 1, "seconds": 0.002, "peak_mb": 1.2},  # within jitter
+        {"stage": "merge_hitters", "scale": 1, "seconds": 1.0, "peak_mb": 1.0},  # no baseline
+    ]
+    regressions = compare(results, baseline)
+    assert len(regressions) == 2 and all(r.startswith("project at 1x") for r in regressions)
+    assert compare(results[:1], baseline, time_tolerance=1.5, memory_tolerance=1.5) == []
+
+def test_save_and_compare(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--scales", "1", "--repeat", "1", "--stage", "merge_relievers", "--stage", "render"]
+    main([*args, "--save", str(baseline)])
+    saved = json.loads(baseline.read_text())
+    assert [r["stage"] for r in saved["results"]] == ["merge_relievers", "render"]
+    assert all(r["rows_per_sec"] > 0 and r["peak_mb"] > 0 for r in saved["results"])
+
+    for result in saved["results"]:
+        result["seconds"] /= 100
+    baseline.write_text(json.dumps(saved))
+    with pytest.raises(SystemExit) as exit_info:
+        main([*args, "--compare", str(baseline)])
+    assert exit_info.value.code == 1
+    assert "REGRESSION merge_relievers at 1x" in capsys.readouterr().out
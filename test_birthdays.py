@@ -0,0 +1,181 @@
+# tests/test_birthdays.py
+
+import http.server
+import json
+import re
+import threading
+import time
+import urllib.parse
+
+import pandas as pd
+import pytest
+from birthdays import PlayerCache, TokenBucket, enrich, fetch_player_info, parse_player, process_file
+
+# Recorded /api/v1/people?personIds=660271,677951,669373 response (trimmed to a few fields)
+RECORDED_PEOPLE = {
+    "copyright": "Copyright 2025 MLB Advanced Media, L.P.  Use of any content on this page acknowledges agreement to the terms posted here http://gdx.mlb.com/components/copyright.txt",
+    "people": [
+        {
+            "id": 660271, "fullName": "Shohei Ohtani", "link": "/api/v1/people/660271",
+            "birthDate": "1994-07-05", "currentAge": 30, "active": True,
+            "primaryPosition": {"code": "Y", "name": "Two-Way Player", "type": "Two-Way Player", "abbreviation": "TWP"},
+        },
+        {
+            "id": 677951, "fullName": "Bobby Witt Jr.", "link": "/api/v1/people/677951",
+            "birthDate": "2000-06-14", "currentAge": 24, "active": True,
+            "primaryPosition": {"code": "6", "name": "Shortstop", "type": "Infielder", "abbreviation": "SS"},
+        },
+        {
+            "id": 669373, "fullName": "Tarik Skubal", "link": "/api/v1/people/669373",
+            "birthDate": "1996-11-20", "currentAge": 28, "active": True,
+            "primaryPosition": {"code": "1", "name": "Pitcher", "type": "Pitcher", "abbreviation": "P"},
+        },
+    ],
+}
+PEOPLE = {person["id"]: person for person in RECORDED_PEOPLE["people"]}
+
+class StatsApiStandIn(http.server.BaseHTTPRequestHandler):
+    """
+    Replays the recorded people. /api/v1/people/<id> fails the first
+    `server.failures[id]` requests with a 503; /api/v1/people?personIds=
+    leaves out anyone in `server.unbatched`.
+    """
+
+    def do_GET(self):
+        server = self.server
+        url = urllib.parse.urlsplit(self.path)
+        match = re.fullmatch(r"/api/v1/people/(\d+)", url.path)
+        if url.path == "/api/v1/people":
+            ids = [int(i) for i in urllib.parse.parse_qs(url.query)["personIds"][0].split(",")]
+            hit = tuple(ids)
+            people = [PEOPLE[i] for i in ids if i in PEOPLE and i not in server.unbatched]
+        else:
+            hit = int(match.group(1)) if match else None
+            people = [PEOPLE[hit]] if hit in PEOPLE else []
+        with server.lock:
+            server.hits.append(hit)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            failing = server.failures.get(hit, 0) > 0
+            if failing:
+                server.failures[hit] -= 1
+        try:
+            time.sleep(server.delay)
+            if failing:
+                self.send_response(503)
+                self.end_headers()
+                return
+            if not people and isinstance(hit, int):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps({"copyright": RECORDED_PEOPLE["copyright"], "people": people}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stats_api():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StatsApiStandIn)
+    server.lock = threading.Lock()
+    server.hits, server.failures, server.unbatched = [], {}, set()
+    server.active = server.max_active = 0
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/api/v1"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_player_info(stats_api):
+    infos = fetch_player_info([660271, 677951, 660271, None, 1], base_url=stats_api.url, rate=0, batch_size=None)
+    assert set(infos) == {660271, 677951, 1}
+    assert infos[677951]["Position"] == "SS" and infos[660271]["Position"] == "TWP"
+    assert infos[1] == {}
+    assert sorted(stats_api.hits) == [1, 660271, 677951]
+
+def test_retries_with_backoff(stats_api):
+    stats_api.failures = {677951: 2}
+    infos = fetch_player_info([677951], base_url=stats_api.url, rate=0, batch_size=None, backoff=0.01)
+    assert infos[677951]["Position"] == "SS"
+    assert stats_api.hits == [677951] * 3
+
+def test_gives_up_after_retries(stats_api):
+    stats_api.failures = {677951: 5}
+    infos = fetch_player_info([677951], base_url=stats_api.url, rate=0, batch_size=None, retries=1, backoff=0.01)
+    assert infos == {677951: {}}
+    assert len(stats_api.hits) == 2
+
+def test_concurrency_limit(stats_api):
+    stats_api.delay = 0.05
+    fetch_player_info(range(1, 21), base_url=stats_api.url, concurrency=3, rate=0, batch_size=None)
+    assert 1 < stats_api.max_active <= 3
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+def test_enrich_writes_columns():
+    df = pd.DataFrame({"MLBAMID": [1, 2, None], "Age": [None, None, None]})
+    result = enrich(df, {1: {"Age": 30.1, "Position": "C"}, 2: {}}, is_hitters=True)
+    assert result["Age"].tolist()[0] == 30.1 and result["Age"].isna().tolist() == [False, True, True]
+    assert result["Position"].tolist()[0] == "C"
+
+def test_process_file(stats_api, tmp_path):
+    path = tmp_path / "system-hitters.csv"
+    pd.DataFrame({"NameASCII": ["A", "B"], "MLBAMID": [660271, 677951]}).to_csv(path, index=False)
+    process_file(str(path), base_url=stats_api.url, rate=0)
+    df = pd.read_csv(path)
+    assert df["Position"].tolist() == ["TWP", "SS"]
+    assert df["Age"].notna().all()
+
+def test_player_cache_skips_network(stats_api, tmp_path):
+    cache = PlayerCache(str(tmp_path / "players.sqlite"))
+    first = fetch_player_info([660271, 677951, 1], base_url=stats_api.url, rate=0, batch_size=None, cache=cache)
+    assert sorted(stats_api.hits) == [1, 660271, 677951]
+
+    stats_api.hits.clear()
+    second = fetch_player_info([660271, 677951, 669373], base_url=stats_api.url, rate=0, batch_size=None, cache=cache)
+    assert stats_api.hits == [669373]
+    assert second[660271] == first[660271] and second[669373]["Position"] == "P"
+    cache.close()
+
+def test_player_cache_stores_birth_date(tmp_path):
+    """Ages are computed when read, so they move with the calendar"""
+    cache = PlayerCache(str(tmp_path / "players.sqlite"))
+    cache.put_many({677951: {"id": 677951, **PEOPLE[677951]}})
+    person = cache.get_many([677951, 2])
+    assert person == {677951: {"birthDate": "2000-06-14", "primaryPosition": {"abbreviation": "SS"}}}
+    assert parse_player(person[677951], now=pd.Timestamp("2025-06-14"))["Age"] == 25.0
+    assert parse_player(person[677951], now=pd.Timestamp("2026-06-14"))["Age"] == 26.0
+    cache.close()
+
+def test_batched_fetch(stats_api):
+    infos = fetch_player_info([660271, 677951, 669373], base_url=stats_api.url, rate=0, batch_size=2)
+    assert sorted(stats_api.hits) == [(660271, 677951), (669373,)]
+    assert infos[660271]["Position"] == "TWP" and infos[669373]["Position"] == "P"
+
+def test_batch_falls_back_to_single_fetches(stats_api):
+    """IDs a batch leaves out are fetched one by one; unknown IDs end up empty"""
+    stats_api.unbatched = {677951}
+    infos = fetch_player_info([660271, 677951, 1], base_url=stats_api.url, rate=0)
+    assert stats_api.hits[0] == (660271, 677951, 1)
+    assert sorted(stats_api.hits[1:]) == [1, 677951]
+    assert infos[677951]["Position"] == "SS" and infos[1] == {}
+
+def test_failed_batch_falls_back(stats_api):
+    stats_api.failures = {(660271, 677951): 5}
+    infos = fetch_player_info([660271, 677951], base_url=stats_api.url, rate=0, retries=1, backoff=0.01)
+    assert sorted(stats_api.hits[2:]) == [660271, 677951]
+    assert infos[660271]["Position"] == "TWP"
@@ -0,0 +1,104 @@
+# tests/test_board.py
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+from board import Board, main, make_server, merge_hitters, parse_weights
+from query import QueryError
+
+@pytest.fixture(scope="module")
+def board(tmp_path_factory):
+    drafted = {"Bobby Witt Jr.": 1, "Tarik Skubal": 2, "Roki Sasaki": 3}
+    return Board(drafted=drafted, cache_dir=str(tmp_path_factory.mktemp("cache")))
+
+def test_rank_leaves_out_drafted(board):
+    hitters = board.rank("hitters", top=None)
+    assert "Bobby Witt Jr." not in set(hitters["NameASCII"])
+    assert hitters["SteamerCareer"].dropna().is_monotonic_decreasing
+    assert len(board.rank("hitters", top=10)) == 10
+    assert board.rank("ba_top_100", top=3)["Rank"].tolist() == [2, 3, 4]
+
+def test_rank_with_drafted(board):
+    pitchers = board.rank("pitchers", top=None, include_drafted=True)
+    assert pitchers.columns[0] == "DraftPos"
+    assert pitchers.loc[pitchers["NameASCII"] == "Tarik Skubal", "DraftPos"].tolist() == [2.0]
+
+def test_rank_toggles_and_query(board):
+    df, _ = board.frame("hitters")
+    discounted = board.rank("hitters", top=5, discount=True, flatten=True)
+    expected = df.sort_values("SteamerCareer_Flat_Disc", ascending=False, kind="stable")
+    expected = expected[expected["NameASCII"] != "Bobby Witt Jr."].head(5)
+    assert discounted["SteamerCareer"].tolist() == expected["SteamerCareer_Flat_Disc"].tolist()
+
+    young = board.rank("hitters", top=None, query="Age < 23")
+    assert len(young) and (young["Age"] < 23).all()
+    with pytest.raises(QueryError):
+        board.rank("relievers", query="BatXWAR > 1")
+
+def test_http_endpoint(board):
+    server = make_server(board, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(f"{url}/rankings/hitters?top=3&query=Age%20%3C%2025") as response:
+            payload = json.load(response)
+        assert payload["table"] == "hitters" and payload["drafted"] == 3
+        assert len(payload["players"]) == 3 and all(p["Age"] < 25 for p in payload["players"])
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/rankings/hitters?query=Foo%20%3E%201")
+        assert error.value.code == 400
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/rankings/hitters?query=NameASCII%20%3E%203")
+        assert error.value.code == 400
+        for sims in ("0", "1000000"):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{url}/rankings/hitters?simulate=1&sims={sims}")
+            assert error.value.code == 400
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/rankings/catchers")
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_cli_rank(capsys):
+    main(["--no-draft", "rank", "ba_top_100", "--top", "2", "--format", "json"])
+    players = json.loads(capsys.readouterr().out)
+    assert [player["Rank"] for player in players] == [1, 2]
+
+def test_rank_simulated(board):
+    simulated = board.rank("hitters", top=10, simulate=True, n_sims=200)
+    assert len(simulated) == 10 and simulated["CareerP50"].is_monotonic_decreasing
+    assert (simulated["CareerP10"] <= simulated["CareerP90"]).all()
+    assert board.simulation("hitters", n_sims=200) is board.simulation("hitters", n_sims=200)
+    with pytest.raises(ValueError):
+        board.rank("relievers", simulate=True)
+
+def test_consensus_ranking(board):
+    df, _ = board.frame("hitters")
+    only_zips = df["SteamerCareer"].isna() & df["ZiPSCareer"].notna() & df["BatXCareer"].isna()
+    assert (df.loc[only_zips, "ConsensusCareer"] == df.loc[only_zips, "ZiPSCareer"]).all()
+    assert df["ConsensusCareer_Flat_Disc"].notna().sum() >= df["SteamerCareer_Flat_Disc"].notna().sum()
+
+    ranked = board.rank("pitchers", top=None, sort_by="ConsensusCareer")
+    assert ranked["ConsensusCareer"].dropna().is_monotonic_decreasing
+    assert ranked["ConsensusCareer"].notna().sum() > ranked["SteamerCareer"].notna().sum()
+    with pytest.raises(ValueError):
+        board.rank("relievers", sort_by="ConsensusCareer")
+
+def test_consensus_weights():
+    steamer = pd.DataFrame({"MLBAMID": [1, 2], "SteamerCareer": [10.0, 20.0]})
+    zips = pd.DataFrame({"MLBAMID": [1, 3], "ZiPSCareer": [40.0, 5.0]})
+    merged = merge_hitters([steamer, zips], weights={"Steamer": 2.0, "ZiPS": 1.0})
+    assert merged.set_index("MLBAMID")["ConsensusCareer"].to_dict() == {1: 20.0, 2: 20.0, 3: 5.0}
+
+def test_parse_weights():
+    assert parse_weights(["Steamer=2", "BatX=0"]) == {"Steamer": 2.0, "BatX": 0.0}
+    for bad in ["Steamer", "Steamer=-1", "Steamer=nan", "Steamer=inf", "=1"]:
+        with pytest.raises(ValueError):
+            parse_weights([bad])
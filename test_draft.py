@@ -0,0 +1,160 @@
+# tests/test_draft.py
+
+import http.server
+import threading
+
+import numpy as np
+import pytest
+from draft import DraftBoardPoller, DraftColumn, DraftState, parse_draft_board
+from names import NameIndex
+
+class SheetStandIn(http.server.BaseHTTPRequestHandler):
+    """Serves `server.board` as CSV, with an ETag when `server.use_etag` is set"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        etag = f'"{len(server.board)}-{hash(server.board)}"'
+        if server.use_etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        if server.use_etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(server.board)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def sheet():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SheetStandIn)
+    server.board = b"Player,Team\nBobby Witt Jr.,A\nShohei Ohtani,B\n"
+    server.use_etag = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/export?format=csv"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_parse_draft_board_positions():
+    """Row number is the pick; empty player cells are skipped"""
+    drafted = parse_draft_board("Player,Team\nA,X\n,Y\nC,Z\n")
+    assert drafted == {"A": 1, "C": 3}
+
+def test_poll_publishes_first_board(sheet):
+    poller = DraftBoardPoller(sheet.url)
+    assert poller.poll()
+    assert dict(poller.drafted) == {"Bobby Witt Jr.": 1, "Shohei Ohtani": 2}
+    assert poller.version == 1
+
+def test_conditional_get_not_modified(sheet):
+    """The ETag is sent back and a 304 leaves the mapping alone"""
+    poller = DraftBoardPoller(sheet.url)
+    poller.poll()
+    drafted = poller.drafted
+    assert not poller.poll()
+    assert "If-None-Match" in sheet.requests[-1]
+    assert poller.drafted is drafted and poller.version == 1
+
+def test_unchanged_body_short_circuits_without_etag(sheet):
+    sheet.use_etag = False
+    poller = DraftBoardPoller(sheet.url)
+    poller.poll()
+    drafted = poller.drafted
+    assert not poller.poll()
+    assert poller.drafted is drafted and poller.version == 1
+
+def test_new_pick_is_published(sheet):
+    poller = DraftBoardPoller(sheet.url)
+    poller.poll()
+    sheet.board += b"Tarik Skubal,C\n"
+    assert poller.poll()
+    assert poller.drafted["Tarik Skubal"] == 3
+    assert poller.version == 2
+
+def test_background_polling(sheet):
+    """The polling thread publishes a change without being asked"""
+    poller = DraftBoardPoller(sheet.url, interval=0.01)
+    poller.poll()
+    poller.start()
+    try:
+        sheet.board = b"Player\nPaul Skenes\n"
+        assert poller.wait_for_change(1, timeout=5) == 2
+        assert dict(poller.drafted) == {"Paul Skenes": 1}
+    finally:
+        poller.stop()
+
+def test_failed_poll_keeps_last_mapping(sheet):
+    poller = DraftBoardPoller(sheet.url)
+    poller.poll()
+    sheet.board = b"Team\nA\n"
+    with pytest.raises(KeyError):
+        poller.poll()
+    assert dict(poller.drafted) == {"Bobby Witt Jr.": 1, "Shohei Ohtani": 2}
+
+def test_draft_state_parses_only_new_rows(monkeypatch):
+    state = DraftState()
+    assert state.ingest("Player,Team\nA,X\nB,Y\n,Z\n") == ({"A": 1, "B": 2}, False)
+    assert state.last_pick == 2
+
+    parsed = []
+    monkeypatch.setattr("draft.parse_draft_board", lambda text, first_pick: parsed.append(text) or {})
+    state.ingest("Player,Team\nA,X\nB,Y\n,Z\n")
+    assert parsed == ["Player,Team\n,Z"]
+
+def test_draft_state_delta_matches_full_parse():
+    board = "Player,Team\nA,X\n,Y\nC,Z\n"
+    state = DraftState()
+    state.ingest(board)
+    board += "D,X\n,Y\nE,Z\n"
+    assert state.ingest(board) == ({"D": 4, "E": 6}, False)
+    assert state.drafted == parse_draft_board(board)
+
+def test_draft_state_resets_when_a_pick_is_edited():
+    state = DraftState()
+    state.ingest("Player\nA\nB\n")
+    assert state.ingest("Player\nA\nZ\nC\n") == ({"A": 1, "Z": 2, "C": 3}, True)
+    assert state.drafted == {"A": 1, "Z": 2, "C": 3}
+
+def test_poller_changes_since(sheet):
+    poller = DraftBoardPoller(sheet.url)
+    poller.poll()
+    sheet.board += b"Tarik Skubal,C\n"
+    poller.poll()
+    sheet.board += b"Paul Skenes,D\n"
+    poller.poll()
+    assert poller.changes_since(1) == ({"Tarik Skubal": 3, "Paul Skenes": 4}, False, 3)
+    assert poller.changes_since(3) == ({}, False, 3)
+
+    sheet.board = b"Player\nPaul Skenes\n"
+    poller.poll()
+    assert poller.changes_since(3) == ({"Paul Skenes": 1}, True, 4)
+
+def test_draft_column_updates_only_new_picks(sheet):
+    poller = DraftBoardPoller(sheet.url)
+    poller.poll()
+    name_index = NameIndex(["Shohei Ohtani", "Tarik Skubal", "Paul Skenes"], [660271, 669373, 694973])
+    column = DraftColumn([660271, 669373, 694973, 660271], name_index)
+    np.testing.assert_array_equal(column.sync(poller), [2, np.nan, np.nan, 2])
+
+    sheet.board += b"tarik skubal,C\n"
+    poller.poll()
+    column.values[0] = -1  # untouched unless a pick matches row 0
+    np.testing.assert_array_equal(column.sync(poller), [-1, 3, np.nan, 2])
+
+    sheet.board = b"Player\nTarik Skubal\n"
+    poller.poll()
+    np.testing.assert_array_equal(column.sync(poller), [np.nan, 1, np.nan, np.nan])
+
+def test_draft_column_skips_approximate_matches():
+    """A close name could be another player, so only exact matches are marked"""
+    name_index = NameIndex(["Jackson Ferris", "Jaison Chourio", "Charlie Condon"], [82, 32, 42])
+    column = DraftColumn([32, 42, 82], name_index)
+    column.apply({"Jackson Merrill": 1, "Jackson Chourio": 2, "Charlie Morton": 3, "charlie condon": 4})
+    np.testing.assert_array_equal(column.values, [np.nan, 4, np.nan])
@@ -0,0 +1,60 @@
+# tests/test_merge.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from merge import coalesce, merge_systems, weighted_mean
+
+def system(ids, prefix, **cols):
+    return pd.DataFrame({"MLBAMID": ids, f"{prefix}WAR": [1.0] * len(ids), **cols})
+
+def test_outer_merge_keeps_every_player():
+    steamer = system([1, 2], "Steamer", NameASCII=["A", None], Age=[25.0, None])
+    zips = system([2, 3], "ZiPS", NameASCII=["B (ZiPS)", "C"], Age=[30.0, 31.0])
+    batx = system([3, 4], "BatX", NameASCII=["C (BatX)", "D"])
+    merged = merge_systems([steamer, zips, batx])
+
+    assert merged["MLBAMID"].tolist() == [1, 2, 3, 4]
+    assert merged["NameASCII"].tolist() == ["A", "B (ZiPS)", "C", "D"]
+    assert merged["Age"].tolist()[:3] == [25.0, 30.0, 31.0]
+    assert pd.isna(merged["Age"].iloc[3])
+    assert merged["ZiPSWAR"].isna().tolist() == [True, False, False, True]
+    assert list(merged.columns) == ["MLBAMID", "NameASCII", "Age", "SteamerWAR", "ZiPSWAR", "BatXWAR"]
+
+def test_precedence_follows_frame_order():
+    steamer = system([1], "Steamer", Team=["KCR"])
+    zips = system([1], "ZiPS", Team=["KC"])
+    assert merge_systems([zips, steamer])["Team"].tolist() == ["KC"]
+    assert merge_systems([steamer, zips])["Team"].tolist() == ["KCR"]
+
+def test_left_merge_keeps_first_frame_rows_in_order():
+    zips = system([5, 2, 9], "ZiPS", NameASCII=["E", "B", "I"])
+    steamer = system([2, 7], "Steamer", Age=[28.0, 22.0])
+    merged = merge_systems([zips, steamer], how="left")
+    assert merged["MLBAMID"].tolist() == [5, 2, 9]
+    assert merged["Age"].isna().tolist() == [True, False, True]
+
+def test_clashing_columns_rejected():
+    with pytest.raises(ValueError):
+        merge_systems([system([1], "ZiPS"), system([2], "ZiPS")])
+
+def test_coalesce_keeps_categories():
+    dtype = pd.CategoricalDtype(["C", "SS"])
+    first = pd.Series([None, "SS", None], dtype=dtype)
+    second = pd.Series(["C", "C", None], dtype=dtype)
+    result = coalesce([first, second])
+    assert result.dtype == dtype
+    assert result.tolist()[:2] == ["C", "SS"]
+    assert pd.isna(result.iloc[2])
+
+def test_coalesce_unifies_separately_loaded_categories():
+    """Systems loaded on their own have different categories"""
+    first = pd.Series(["NYY", None], dtype="category")
+    second = pd.Series(["BOS", "LAD"], dtype="category")
+    assert coalesce([first, second]).tolist() == ["NYY", "LAD"]
+
+def test_weighted_mean_renormalizes_over_present_values():
+    steamer = pd.Series([10.0, np.nan, 4.0, np.nan])
+    zips = pd.Series([20.0, 6.0, np.nan, np.nan])
+    blended = weighted_mean([steamer, zips], [3.0, 1.0])
+    np.testing.assert_allclose(blended, [12.5, 6.0, 4.0, np.nan])
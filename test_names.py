@@ -0,0 +1,49 @@
+# tests/test_names.py
+
+import pytest
+from names import FuzzyMatcher, NameIndex, normalize_name, parse_name_list
+
+@pytest.mark.parametrize("name,expected", [
+    ("Bobby Witt Jr.", "bobby witt"),
+    ("José Ramírez", "jose ramirez"),
+    ("J.P. Crawford", "jp crawford"),
+    ("Ke'Bryan Hayes", "kebryan hayes"),
+    ("Jazz Chisholm  Jr", "jazz chisholm"),
+    ("Cal Raleigh III", "cal raleigh"),
+    ("Isiah Kiner-Falefa", "isiah kiner falefa"),
+    ("  SHOHEI OHTANI ", "shohei ohtani"),
+    ("V", "v"),
+    (None, ""),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+def test_parse_name_list():
+    assert parse_name_list("Bobby Witt Jr., Juan Soto\nAaron Judge,\n\n") == ["Bobby Witt Jr.", "Juan Soto", "Aaron Judge"]
+
+def test_name_index_lookup():
+    index = NameIndex(
+        ["Bobby Witt Jr.", "Will Smith", "Will Smith", "José Ramírez", None, "Bobby Witt Jr."],
+        [677951, 669257, 519293, 608070, 1, 677951],
+    )
+    assert index.lookup("bobby witt") == (677951,)
+    assert index.lookup("Jose Ramirez") == (608070,)
+    assert set(index.lookup("Will Smith")) == {669257, 519293}
+    assert index.lookup("Juan Soto") == ()
+    assert "BOBBY WITT JR" in index and "Juan Soto" not in index
+    assert index.lookup_many(["Will Smith", "Bobby Witt"]) == {669257, 519293, 677951}
+    assert len(index) == 3
+
+def test_fuzzy_resolve_reports_confidence():
+    index = NameIndex(["Bobby Witt Jr.", "Mookie Betts", "Aaron Judge"], [677951, 605141, 592450])
+    assert index.resolve("Bobby Witt") == ((677951,), "Bobby Witt Jr.", 1.0)
+    keys, matched, confidence = index.resolve("Mookie Bets")
+    assert keys == (605141,) and matched == "Mookie Betts" and 0.6 <= confidence < 1
+    assert index.resolve("Zzzz Qqqq")[0] == ()
+    assert index.lookup("Mookie Bets") == () and index.lookup("Mookie Bets", fuzzy=True) == (605141,)
+
+def test_fuzzy_rejects_ambiguous_names():
+    """A typo equally close to two players matches neither"""
+    matcher = FuzzyMatcher(["chris clark", "chris clarke"])
+    assert matcher.match("chris clarkk")[0] is None
+    assert matcher.match("chriss clarke")[0] == "chris clarke"
@@ -0,0 +1,61 @@
+# tests/test_parallel.py
+
+import numpy as np
+import pytest
+import projection
+from parallel import SharedArrays, ShardExecutor, attach
+from projection import project_career_war_variants
+from simulation import simulate_career_war
+
+def _fail_on_first_shard(arrays, start, stop):
+    if start == 0:
+        raise RuntimeError("shard failed")
+    arrays["out"][start:stop] = arrays["ages"][start:stop]
+
+RNG = np.random.default_rng(0)
+AGES = np.round(RNG.uniform(18, 44, 3000), 1)
+WARS = np.round(RNG.normal(1.5, 2.0, (3000, 3)), 1)
+AGES[::97] = np.nan
+WARS[::13, 0] = np.nan
+
+@pytest.fixture(scope="module")
+def executor():
+    with ShardExecutor(workers=2) as executor:
+        yield executor
+
+def test_shared_arrays_attach():
+    with SharedArrays({"ages": AGES, "wars": WARS}) as shared:
+        blocks, arrays = attach(shared.specs)
+        np.testing.assert_array_equal(arrays["wars"], WARS)
+        arrays["ages"][0] = 99.0
+        assert shared.arrays["ages"][0] == 99.0
+        del arrays
+        for block in blocks.values():
+            block.close()
+
+def test_shards_cover_rows_in_order():
+    shards = ShardExecutor(workers=4).shards(10)
+    assert shards[0][0] == 0 and shards[-1][1] == 10
+    assert all(stop == start for (_, stop), (start, _) in zip(shards, shards[1:]))
+    assert ShardExecutor(workers=4).shards(10, min_rows=8) == [(0, 10)]
+
+def test_simulation_matches_serial(executor):
+    serial = simulate_career_war(AGES, WARS, n_sims=200, chunk_size=128, skew=1.0)
+    parallel = simulate_career_war(AGES, WARS, n_sims=200, chunk_size=128, skew=1.0, executor=executor)
+    assert parallel.equals(serial)
+
+def test_variants_match_serial(executor, monkeypatch):
+    monkeypatch.setattr(projection, "MIN_SHARD_ROWS", 500)
+    serial = project_career_war_variants(AGES, WARS[:, 0], is_pitcher=True)
+    parallel = project_career_war_variants(AGES, WARS[:, 0], is_pitcher=True, executor=executor)
+    for variant, career in serial.items():
+        np.testing.assert_array_equal(parallel[variant], career)
+
+def test_failed_task_raises_after_the_rest(executor):
+    tasks = [{"start": start, "stop": stop} for start, stop in ShardExecutor(workers=6).shards(len(AGES))]
+    outputs = {"out": (len(AGES), float)}
+    with pytest.raises(RuntimeError, match="shard failed"):
+        executor.run(_fail_on_first_shard, {"ages": AGES}, outputs, tasks)
+    # The pool is still usable afterwards
+    out = executor.run(_fail_on_first_shard, {"ages": AGES}, outputs, tasks[1:])["out"]
+    assert out[-1] == AGES[-1]
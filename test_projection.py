@@ -0,0 +1,133 @@
+# tests/test_projection.py
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from projection import (
+    AGING_CURVES, CAREER_VARIANTS, aging_projection, calculate_career_war, calculate_career_war_variants,
+    career_war_grid, get_curve, project_career_war, register_curve, variant_suffix, yearly_war_matrix
+)
+
+TOGGLES = list(itertools.product([False, True], repeat=3))  # (is_pitcher, discount, flatten)
+
+def scalar_career_war(ages, wars, is_pitcher, discount, flatten):
+    return np.array([
+        aging_projection({"Age": age, "WAR": war}, is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+        for age, war in zip(ages, wars)
+    ])
+
+@pytest.mark.parametrize("is_pitcher,discount,flatten", TOGGLES)
+def test_vectorized_matches_scalar_on_grid(is_pitcher, discount, flatten):
+    """Every (age, WAR) pair at 0.1 resolution matches the reference loop exactly"""
+    ages, wars = np.meshgrid(np.round(np.arange(16.0, 47.0, 0.1), 1), np.round(np.arange(-3.0, 10.0, 0.1), 1))
+    ages, wars = ages.ravel(), wars.ravel()
+    expected = scalar_career_war(ages, wars, is_pitcher, discount, flatten)
+    actual = project_career_war(ages, wars, is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+    np.testing.assert_array_equal(actual, expected)
+
+@pytest.mark.parametrize("filename,is_pitcher", [
+    ("zips-hitters-2025.csv", False),
+    ("steamer600-hitters-2025.csv", False),
+    ("batx-hitters-2025.csv", False),
+    ("zips-pitchers-2025.csv", True),
+    ("steamer600-pitchers-2025.csv", True),
+])
+def test_vectorized_matches_scalar_on_projection_files(filename, is_pitcher):
+    """Parity on the shipped projections, including blank ages and WAR"""
+    df = pd.read_csv(filename, usecols=["Age", "WAR"])
+    ages = pd.to_numeric(df["Age"], errors="coerce").to_numpy(dtype=float)
+    wars = pd.to_numeric(df["WAR"], errors="coerce").to_numpy(dtype=float)
+    for discount, flatten in itertools.product([False, True], repeat=2):
+        expected = scalar_career_war(ages, wars, is_pitcher, discount, flatten)
+        actual = project_career_war(ages, wars, is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+        np.testing.assert_array_equal(actual, expected)
+
+def test_missing_inputs():
+    """Blank WAR projects to zero, blank age keeps only this season's WAR"""
+    result = project_career_war([np.nan, 25.0, np.nan], [3.0, np.nan, -1.0])
+    np.testing.assert_array_equal(result, [3.0, 0.0, 0.0])
+
+def test_yearly_war_matrix_shape():
+    """One column per season until the youngest player ages out"""
+    war_path, active = yearly_war_matrix([44.5, 30.0], [2.0, 2.0])
+    assert war_path.shape == (2, 16)
+    assert active[0].sum() == 2
+    assert active[1].all()
+
+def test_calculate_career_war_keeps_index():
+    """Career WAR lines up with the frame's own index"""
+    df = pd.DataFrame({"Age": [24.0, "n/a"], "WAR": [2.0, 3.0]}, index=[10, 3])
+    result_df = calculate_career_war(df)
+    assert result_df.loc[10, "CareerWAR"] == round(aging_projection({"Age": 24.0, "WAR": 2.0}, False, False, False), 1)
+    assert result_df.loc[3, "CareerWAR"] == 3.0
+
+def test_curves_are_read_only():
+    """Registered curves can't be edited in place"""
+    curve = get_curve(is_pitcher=True, flatten=True)
+    assert curve is AGING_CURVES["flat_pitcher"]
+    with pytest.raises(TypeError):
+        curve.deltas[30] = 0.0
+    with pytest.raises(ValueError):
+        curve.lower[0, 0] = 0.0
+
+def test_register_custom_curve():
+    """Extra curves plug into the engine by name"""
+    catcher_deltas = {age: delta - 0.1 for age, delta in get_curve().deltas.items()}
+    curve = register_curve("test_catcher", catcher_deltas)
+    try:
+        ages, wars = np.array([22.3, 29.9, 37.0]), np.array([2.0, 4.5, 1.0])
+        expected = [
+            aging_projection({"Age": age, "WAR": war}, is_pitcher=False, discount=False, flatten=False)
+            for age, war in zip(ages, wars)
+        ]
+        catcher = project_career_war(ages, wars, curve="test_catcher")
+        assert (catcher <= expected).all() and catcher[0] < expected[0]
+        assert curve.project(22.3, 2.0) == catcher[0]
+    finally:
+        del AGING_CURVES["test_catcher"]
+
+def test_unknown_curve():
+    with pytest.raises(KeyError):
+        project_career_war([25.0], [2.0], curve="goalie")
+
+@pytest.mark.parametrize("is_pitcher,discount,flatten", TOGGLES)
+def test_grid_within_documented_bounds(is_pitcher, discount, flatten):
+    """Grid lookups stay within the bounds computed when the grid is built"""
+    grid = career_war_grid(is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+    rng = np.random.default_rng(0)
+    wars = rng.uniform(-5.0, 15.0, 20000)
+    exact = lambda ages: project_career_war(ages, wars, is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+
+    node_ages = np.round(rng.uniform(15.0, 46.0, len(wars)), 1)
+    assert np.abs(grid.lookup(node_ages, wars) - exact(node_ages)).max() <= grid.node_age_error_bound + 1e-9
+
+    any_ages = rng.uniform(15.0, 46.0, len(wars))
+    assert np.abs(grid.lookup(any_ages, wars) - exact(any_ages)).max() <= grid.error_bound + 1e-9
+    assert grid.node_age_error_bound <= 0.025
+
+def test_grid_exact_on_nodes_and_off_grid():
+    """Node inputs and inputs outside the grid match the exact engine"""
+    grid = career_war_grid()
+    ages = np.array([24.7, 35.0, 45.9, 46.0, 12.0, 30.0, np.nan])
+    wars = np.array([3.2, 1.0, 0.5, 2.0, 1.0, 22.0, 1.0])
+    np.testing.assert_array_equal(grid.lookup(ages, wars), project_career_war(ages, wars))
+    assert career_war_grid() is grid
+
+def test_calculate_career_war_with_grid():
+    df = pd.DataFrame({"Age": [22.4, 31.0], "WAR": [3.14, 5.26]})
+    exact = calculate_career_war(df.copy())["CareerWAR"]
+    gridded = calculate_career_war(df.copy(), use_grid=True)["CareerWAR"]
+    np.testing.assert_allclose(gridded, exact, atol=0.1)
+
+def test_variants_match_single_toggle_runs():
+    """One pass fills every (discount, flatten) column with the single-toggle values"""
+    df = pd.read_csv("zips-pitchers-2025.csv", usecols=["Age", "WAR"])
+    result_df = calculate_career_war_variants(df.copy(), is_pitcher=True)
+    for discount, flatten in CAREER_VARIANTS:
+        expected = calculate_career_war(df.copy(), is_pitcher=True, discount=discount, flatten=flatten)["CareerWAR"]
+        pd.testing.assert_series_equal(
+            result_df["CareerWAR" + variant_suffix(discount, flatten)], expected, check_names=False
+        )
+    assert "CareerWAR" in result_df.columns and "CareerWAR_Flat_Disc" in result_df.columns
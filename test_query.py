@@ -0,0 +1,83 @@
+# tests/test_query.py
+
+import ast
+
+import numpy as np
+import pandas as pd
+import pytest
+from query import FrameIndex, Query, QueryCache, QueryError, compile_query
+from sources import load_source
+
+@pytest.fixture(scope="module")
+def hitters(tmp_path_factory):
+    df = load_source("steamer_hitters", cache_dir=str(tmp_path_factory.mktemp("cache")))
+    return df.rename(columns={"WAR": "SteamerWAR", "wRC+": "Steamer_wRC+"})
+
+QUERIES = [
+    "SteamerWAR > 3 and Age < 25",
+    "SteamerWAR >= 2.5",
+    "3 < SteamerWAR",
+    "20 <= Age < 23.5",
+    "Age == 24.3",
+    'Position == "SS" and SteamerWAR > 2',
+    'Position in ["C", "1B"] or Age > 38',
+    'Position == ["C", "1B"]',
+    'Team != "LAD"',
+    "not (SteamerWAR < 1)",
+    "(SteamerWAR > 2) & ~(Age > 30) | (Age < 21)",
+    "`Steamer_wRC+` > 120",
+    "SteamerWAR * 2 - 1 > Age / 10",
+    'NameASCII.str.contains("Jr")',
+]
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_matches_dataframe_query(hitters, text):
+    """Compiled masks, with and without indexes, select the same rows as DataFrame.query"""
+    expected = hitters.index.isin(hitters.query(text).index)
+    query = Query(text)
+    np.testing.assert_array_equal(query.mask(hitters), expected)
+    np.testing.assert_array_equal(query.mask(hitters, index=FrameIndex(hitters)), expected)
+
+def test_referenced_columns():
+    query = Query('`Avg_wRC+` > 100 and Position == "SS" and NameASCII.str.contains("Jr")')
+    assert query.columns == ["Avg_wRC+", "Position", "NameASCII"]
+    assert query.missing_columns(["Avg_wRC+", "NameASCII"]) == ["Position"]
+    assert not query.compiled and Query("Age > 3").compiled
+
+def test_syntax_error():
+    with pytest.raises(QueryError):
+        Query("SteamerWAR >")
+
+def test_unsupported_function():
+    with pytest.raises(QueryError, match="__import__"):
+        compile_query("__import__('os').getcwd() == 1")
+    assert Query("abs(SteamerWAR) > 1").columns == ["SteamerWAR"]
+
+def test_index_range_on_missing_values():
+    df = pd.DataFrame({"ZiPSWAR": [1.0, np.nan, 3.0, 2.0], "Team": ["A", "B", "C", "D"]})
+    index = FrameIndex(df)
+    np.testing.assert_array_equal(index.range("ZiPSWAR", ast.Gt, 1.5), [False, False, True, True])
+    np.testing.assert_array_equal(index.range("ZiPSWAR", ast.LtE, 1.0), [True, False, False, False])
+    assert index.range("Team", ast.Gt, 1) is None
+
+def test_index_uses_column_precision():
+    """float32 columns compare like the vectorized comparison, in float32"""
+    df = pd.DataFrame({"SteamerWAR": np.array([0.1, 0.2, 0.3], dtype="float32")})
+    for text in ["SteamerWAR > 0.1", "SteamerWAR <= 0.2", "SteamerWAR == 0.3"]:
+        np.testing.assert_array_equal(Query(text).mask(df, index=FrameIndex(df)), Query(text).mask(df))
+
+def test_query_cache_memoizes_per_version(hitters):
+    cache = QueryCache()
+    query = compile_query("SteamerWAR > 3")
+    assert compile_query("SteamerWAR > 3") is query
+    first = cache.mask(query, hitters, ("v1", 0), index_version="v1")
+    assert cache.mask(query, hitters, ("v1", 0), index_version="v1") is first
+    assert cache.mask(query, hitters, ("v1", 1), index_version="v1") is not first
+    assert cache.index(hitters, "v1") is cache.index(hitters, "v1")
+
+def test_index_shared_across_column_subsets(hitters):
+    """One index serves frames holding different columns of the same version"""
+    cache = QueryCache()
+    cache.mask(compile_query("Age < 25"), hitters[["Age"]], "v1")
+    mask = cache.mask(compile_query("SteamerWAR > 2"), hitters[["SteamerWAR"]], "v1")
+    np.testing.assert_array_equal(mask, (hitters["SteamerWAR"] > 2).to_numpy())
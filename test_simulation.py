@@ -0,0 +1,55 @@
+# tests/test_simulation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from projection import project_career_war
+from simulation import simulate_career_war, simulate_frame
+
+AGES = np.array([20.0, 24.5, 27.0, 31.0, 35.0, 39.0])
+WARS = np.array([1.0, 4.2, 6.0, 2.5, 3.0, 0.5])
+
+@pytest.mark.parametrize("is_pitcher,discount,flatten", [(False, False, False), (True, True, False), (False, True, True)])
+def test_without_uncertainty_matches_projection(is_pitcher, discount, flatten):
+    result = simulate_career_war(
+        AGES, WARS, is_pitcher=is_pitcher, discount=discount, flatten=flatten, inter_sd=0, intra_sd=0, n_sims=50
+    )
+    expected = project_career_war(AGES, WARS, is_pitcher=is_pitcher, discount=discount, flatten=flatten)
+    for col in ["CareerP10", "CareerP50", "CareerP90"]:
+        np.testing.assert_allclose(result[col], expected, rtol=1e-5, atol=1e-4)
+
+def test_reproducible_for_a_seed():
+    first = simulate_career_war(AGES, WARS, seed=7, chunk_size=2)
+    assert first.equals(simulate_career_war(AGES, WARS, seed=7, chunk_size=2))
+    assert not first.equals(simulate_career_war(AGES, WARS, seed=8, chunk_size=2))
+
+def test_percentiles_and_thresholds_are_ordered():
+    result = simulate_career_war(AGES, WARS, n_sims=2000, skew=2.0)
+    assert (result["CareerP10"] <= result["CareerP50"]).all()
+    assert (result["CareerP50"] <= result["CareerP90"]).all()
+    assert (result["CareerOver10"] >= result["CareerOver20"]).all()
+    assert (result["CareerOver20"] >= result["CareerOver30"]).all()
+    assert result.filter(like="Over").stack().between(0, 1).all()
+
+def test_systems_disagreeing_spread_the_range():
+    wars = np.array([[1.0, 5.0], [np.nan, 5.0], [np.nan, np.nan]])
+    result = simulate_career_war([25.0, 25.0, 25.0], wars, inter_sd=0, intra_sd=0, n_sims=1000)
+    low, high = project_career_war([25.0, 25.0], [1.0, 5.0])
+    assert result.loc[0, "CareerP10"] == pytest.approx(low, abs=1e-4)
+    assert result.loc[0, "CareerP90"] == pytest.approx(high, abs=1e-4)
+    assert result.loc[1, "CareerP10"] == pytest.approx(high, abs=1e-4)
+    assert result.loc[2].isna().all()
+
+def test_simulate_frame_reads_system_columns():
+    df = pd.DataFrame(
+        {"Age": [23.0, 30.0], "SteamerWAR": [3.0, np.nan], "ZiPSWAR": [3.0, 2.0], "Steamer_InterSD": [np.nan, 0.0]},
+        index=[10, 20],
+    )
+    result = simulate_frame(df, ["Steamer", "ZiPS"], inter_sd=0, intra_sd=0)
+    assert list(result.index) == [10, 20]
+    np.testing.assert_allclose(result["CareerP50"], project_career_war([23.0, 30.0], [3.0, 2.0]), atol=1e-4)
+
+@pytest.mark.parametrize("n_sims", [0, -5])
+def test_rejects_no_simulations(n_sims):
+    with pytest.raises(ValueError):
+        simulate_career_war(AGES, WARS, n_sims=n_sims)
@@ -0,0 +1,104 @@
+# tests/test_sources.py
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from sources import (
+    SOURCES, build_columnar_cache, cache_paths, file_sha256, load_source, read_csv_with_schema, source_fingerprint
+)
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "system-hitters.csv"
+    pd.DataFrame({
+        "Name": ["A", "B"],
+        "WAR": [1.5, 2.5],
+        "P10": [None, None],
+        "MLBAMID": [1, 2],
+    }).to_csv(path, index=False)
+    return str(path)
+
+def test_cache_keeps_only_requested_columns(csv_file, tmp_path):
+    feather_path = build_columnar_cache(csv_file, {"MLBAMID": "int32", "WAR": "float64", "Age": "float64"}, cache_dir=str(tmp_path / "cache"))
+    df = pd.read_feather(feather_path)
+    assert list(df.columns) == ["WAR", "MLBAMID"]
+    assert df["WAR"].tolist() == [1.5, 2.5]
+    assert df["MLBAMID"].dtype == "int32"
+
+def test_cache_reused_until_csv_changes(csv_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    feather_path = build_columnar_cache(csv_file, {"MLBAMID": "int32", "WAR": "float64"}, cache_dir=cache_dir)
+    built_at = os.stat(feather_path).st_mtime_ns
+
+    # Same contents with a newer mtime: hash matches, no rebuild
+    os.utime(csv_file, ns=(built_at + 10**9, built_at + 10**9))
+    build_columnar_cache(csv_file, {"MLBAMID": "int32", "WAR": "float64"}, cache_dir=cache_dir)
+    assert os.stat(feather_path).st_mtime_ns == built_at
+
+    # New contents: rebuilt
+    pd.DataFrame({"WAR": [9.0], "MLBAMID": [3]}).to_csv(csv_file, index=False)
+    build_columnar_cache(csv_file, {"MLBAMID": "int32", "WAR": "float64"}, cache_dir=cache_dir)
+    assert pd.read_feather(feather_path)["MLBAMID"].tolist() == [3]
+
+def test_concurrent_rebuilds_dont_collide(csv_file, tmp_path):
+    """Threads rebuilding the same stale cache each write their own temp file"""
+    cache_dir = str(tmp_path / "cache")
+    schema = {"MLBAMID": "int32", "WAR": "float64"}
+    errors = []
+
+    def rebuild():
+        try:
+            build_columnar_cache(csv_file, schema, cache_dir=cache_dir)
+        except Exception as e:
+            errors.append(e)
+
+    for i in range(10):
+        with open(csv_file, "a") as f:
+            f.write(f"X,{i}.5,,{i + 10}\n")
+        threads = [threading.Thread(target=rebuild) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert errors == []
+    feather_path = cache_paths(csv_file, cache_dir)[0]
+    assert pd.read_feather(feather_path)["MLBAMID"].tolist()[-1] == 19
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+
+def test_cache_rebuilt_when_schema_changes(csv_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    build_columnar_cache(csv_file, {"MLBAMID": "int32"}, cache_dir=cache_dir)
+    feather_path = build_columnar_cache(csv_file, {"MLBAMID": "int32", "Name": "string[pyarrow]"}, cache_dir=cache_dir)
+    assert list(pd.read_feather(feather_path).columns) == ["Name", "MLBAMID"]
+    assert cache_paths(csv_file, cache_dir)[0] == feather_path
+
+@pytest.mark.parametrize("name", sorted(SOURCES))
+def test_load_source_matches_csv(name, tmp_path):
+    """The cached frame has the schema's dtypes and the CSV's values"""
+    df = load_source(name, cache_dir=str(tmp_path))
+    schema = SOURCES[name]["schema"]
+    assert {col: str(dtype) for col, dtype in df.dtypes.items()} == {
+        col: str(pd.api.types.pandas_dtype(dtype)) for col, dtype in schema.items() if col in df.columns
+    }
+    expected = pd.read_csv(SOURCES[name]["path"], usecols=list(df.columns))[list(df.columns)]
+    for col in df.columns:
+        if schema[col] == "float32":
+            assert np.allclose(df[col], expected[col], equal_nan=True)
+        else:
+            same = (df[col].astype(object) == expected[col].astype(object)) | (df[col].isna() & expected[col].isna())
+            assert same.all()
+
+def test_read_csv_with_schema_drops_rows_without_id(tmp_path):
+    path = tmp_path / "ids.csv"
+    path.write_text("MLBAMID,Team,WAR\n1,NYY,2.0\n,BOS,1.0\n3,,0.5\n")
+    df = read_csv_with_schema(str(path), {"MLBAMID": "int32", "Team": "category", "WAR": "float32", "Age": "float64"})
+    assert df["MLBAMID"].tolist() == [1, 3]
+    assert df["MLBAMID"].dtype == "int32"
+    assert df["Team"].dtype == "category"
+
+def test_source_fingerprint_is_content_hash(tmp_path):
+    name = "batx_hitters"
+    assert source_fingerprint(name, cache_dir=str(tmp_path)) == file_sha256(SOURCES[name]["path"])
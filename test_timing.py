@@ -0,0 +1,57 @@
+# tests/test_timing.py
+
+import functools
+import json
+import logging
+
+from timing import NULL_SPAN, Spans
+
+def memoize(fn):
+    """Stand-in for st.cache_data: memoizes on the arguments, with .clear()"""
+    memo = functools.lru_cache(maxsize=None)(fn)
+    memo.clear = memo.cache_clear
+    return memo
+
+def test_disabled_spans_record_nothing():
+    spans = Spans()
+    assert spans.span("load") is NULL_SPAN
+
+    @spans.cached("load", memoize)
+    def load(name):
+        return name.upper()
+
+    assert load("zips") == "ZIPS"
+    assert spans.records == []
+
+def test_cached_calls_record_hits_and_misses():
+    spans = Spans(enabled=True)
+
+    @spans.cached("load", memoize)
+    def load(name, fingerprint):
+        return name
+
+    @spans.cached("merge", memoize)
+    def merge(fingerprint):
+        return load("zips", fingerprint) + load("steamer", fingerprint)
+
+    merge("a")
+    merge("a")
+    load("zips", "a")
+    calls = [(r["stage"], r["detail"], r["cache"]) for r in spans.records]
+    assert calls == [
+        ("load", "zips", "miss"), ("load", "steamer", "miss"), ("merge", "a", "miss"),
+        ("merge", "a", "hit"), ("load", "zips", "hit"),
+    ]
+    assert all(r["ms"] >= 0 for r in spans.records)
+    load.clear()
+    load("zips", "a")
+    assert spans.records[-1]["cache"] == "miss"
+
+def test_spans_logged_as_json(caplog):
+    spans = Spans(log=True)
+    with caplog.at_level(logging.INFO, logger="timing"):
+        with spans.span("render", table="Hitters") as record:
+            record["rows"] = 250
+    logged = json.loads(caplog.records[-1].getMessage())
+    assert logged["stage"] == "render" and logged["table"] == "Hitters" and logged["rows"] == 250
+    assert spans.frame()["table"].tolist() == ["Hitters"]
@@ -0,0 +1,78 @@
+# tests/test_view.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from view import View, top_k
+
+@pytest.fixture
+def players():
+    return pd.DataFrame({
+        "NameASCII": ["A", "B", "C", "D"],
+        "Position": ["C", "SS", "OF", "SS"],
+        "SteamerCareer": [10.0, 30.0, 20.0, 5.0],
+        "SteamerCareer_discount": [8.0, 25.0, 16.0, 4.0],
+    })
+
+def test_filters_compose_into_one_mask(players):
+    view = View(players, "Hitters")
+    view.filter(players["Position"] == "SS").filter(None).filter(np.array([True, True, True, False]))
+    assert view.rows == 1
+    assert view.materialize(["NameASCII"])["NameASCII"].tolist() == ["B"]
+
+def test_materialize_sorts_and_skips_missing_columns(players):
+    view = View(players).filter(players["Position"] != "C")
+    out = view.materialize(["NameASCII", "BatXCareer"], sort_by="SteamerCareer")
+    assert list(out.columns) == ["NameASCII"]
+    assert out["NameASCII"].tolist() == ["B", "C", "D"]
+    assert out.index.tolist() == [1, 2, 3]
+
+def test_derived_columns_only_computed_for_surviving_rows(players):
+    seen = []
+
+    def discounted(frame):
+        seen.append(len(frame))
+        return frame["SteamerCareer_discount"]
+
+    view = View(players)
+    view.derive("SteamerCareer", ["SteamerCareer_discount"], discounted)
+    view.filter(players["Position"] == "SS")
+    out = view.materialize(["NameASCII", "SteamerCareer"], sort_by="SteamerCareer")
+    assert seen == [2]
+    assert out["SteamerCareer"].tolist() == [25.0, 4.0]
+    assert players["SteamerCareer"].tolist() == [10.0, 30.0, 20.0, 5.0]
+
+def test_assigned_columns_are_not_copied_into_frame(players):
+    view = View(players)
+    view.assign("DraftPos", [np.nan, 1.0, np.nan, np.nan])
+    view.filter(pd.isna(view.column("DraftPos")))
+    assert "DraftPos" not in players.columns
+    assert view.materialize(["DraftPos", "NameASCII"])["NameASCII"].tolist() == ["A", "C", "D"]
+    with pytest.raises(ValueError):
+        view.assign("DraftPos", [1.0])
+
+def test_trace_records_stages(players):
+    view = View(players, "Hitters")
+    with view.stage("positions"):
+        view.filter(players["Position"] == "SS")
+    view.materialize(["NameASCII"])
+    trace = view.trace_frame()
+    assert trace["stage"].tolist() == ["positions", "materialize"]
+    assert trace["rows"].tolist() == [2, 2]
+    assert (trace["ms"] >= 0).all() and (trace["table"] == "Hitters").all()
+
+@pytest.mark.parametrize("ascending", [False, True])
+def test_top_k_matches_stable_sort(ascending):
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 20, 500).astype(float)
+    values[rng.choice(500, 40, replace=False)] = np.nan
+    expected = pd.Series(values).sort_values(ascending=ascending, kind="stable").index.to_numpy()
+    for k in [0, 1, 7, 100, 460, 480, 600]:
+        np.testing.assert_array_equal(top_k(values, k, ascending=ascending), expected[:k])
+
+def test_materialize_limit(players):
+    view = View(players, "Hitters")
+    out = view.materialize(["NameASCII"], sort_by="SteamerCareer", limit=2)
+    assert out["NameASCII"].tolist() == ["B", "C"]
+    assert view.trace[-1]["rows"] == 2 and view.rows == 4
+    assert view.materialize(["NameASCII"], sort_by="NameASCII", limit=2)["NameASCII"].tolist() == ["D", "C"]
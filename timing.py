@@ -0,0 +1,103 @@
+import contextlib
+import functools
+import json
+import logging
+import os
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Set to 1 to log every span of every rerun as a JSON line
+LOG_ENV = "FRANCHISEDRAFT_TIMINGS"
+
+NULL_SPAN = contextlib.nullcontext({})
+
+def logging_enabled():
+    return os.environ.get(LOG_ENV, "").lower() in ("1", "true", "yes")
+
+def log_to_stderr():
+    """Sends span logs to stderr, unless this logger was already set up."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+class Spans:
+    """
+    Named timing spans for one rerun of the app.
+
+    `span(stage, **fields)` times a block; `cached(stage, cache)` wraps a
+    function in a Streamlit cache decorator and times each call, noting
+    whether the cache was hit. Spans are kept in `records` and, with
+    `log`, written as JSON lines to this module's logger. When disabled,
+    `span` hands back a shared no-op context and cached functions are
+    called directly, so instrumentation costs a flag check.
+    """
+
+    def __init__(self, enabled=False, log=False):
+        self.enabled = enabled or log
+        self.log = log
+        self.records = []
+        self.started = time.perf_counter()
+        self._calls = []  # records of the cached calls in progress, innermost last
+
+    def span(self, stage, **fields):
+        if not self.enabled:
+            return NULL_SPAN
+        return self._span(stage, fields)
+
+    @contextlib.contextmanager
+    def _span(self, stage, fields):
+        record = {"stage": stage, **fields}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = (time.perf_counter() - start) * 1000
+            self.add(record)
+
+    def add(self, record):
+        self.records.append(record)
+        if self.log:
+            logger.info(json.dumps(record, default=str))
+
+    def cached(self, stage, cache):
+        """
+        Decorator: `cache` (e.g. st.cache_data(ttl=...)) applied to the
+        function, with each call recorded as a `stage` span. A call is a
+        miss if the function body ran, a hit otherwise.
+        """
+        def decorate(fn):
+            @functools.wraps(fn)
+            def compute(*args, **kwargs):
+                if self._calls:
+                    self._calls[-1]["cache"] = "miss"
+                return fn(*args, **kwargs)
+
+            cached_fn = cache(compute)
+
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                if not self.enabled:
+                    return cached_fn(*args, **kwargs)
+                # e.g. the source name; the rest are usually fingerprints
+                detail = next((arg for arg in args if isinstance(arg, str)), "")
+                with self.span(stage, function=fn.__name__, detail=detail, cache="hit") as record:
+                    self._calls.append(record)
+                    try:
+                        return cached_fn(*args, **kwargs)
+                    finally:
+                        self._calls.pop()
+
+            call.clear = cached_fn.clear
+            return call
+        return decorate
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def frame(self):
+        return pd.DataFrame(self.records, columns=["stage", "function", "detail", "table", "cache", "rows", "ms"])
@@ -0,0 +1,151 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Rows sent to the browser per table until "Load more" is clicked
+DEFAULT_PAGE_SIZE = 250
+
+def top_k(values, k, ascending=False):
+    """
+    Positions of the first `k` of `values` in sorted order, the same rows
+    and order as a stable sort (missing values last) cut to `k`, but
+    only the selected rows are sorted: a partial selection finds the
+    cutoff value first.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keys = values if ascending else -values
+    present = np.flatnonzero(~np.isnan(keys))
+    if k >= len(present):
+        order = present[np.argsort(keys[present], kind="stable")]
+        return np.concatenate([order, np.flatnonzero(np.isnan(keys))])[:k]
+    if k <= 0:
+        return present[:0]
+    cutoff = np.partition(keys[present], k - 1)[k - 1]
+    # Everything before the cutoff, then ties at the cutoff in their original order
+    ahead = present[keys[present] < cutoff]
+    tied = present[keys[present] == cutoff][:k - len(ahead)]
+    chosen = np.sort(np.concatenate([ahead, tied]))
+    return chosen[np.argsort(keys[chosen], kind="stable")]
+
+class View:
+    """
+    A lazy, filtered view of a frame, for display.
+
+    Filters only narrow a boolean row mask. Extra columns are attached as
+    full-length arrays (no copy of the frame) or derived from other
+    columns, in which case they're computed only for the rows asked for.
+    `materialize` builds the one DataFrame that gets displayed: surviving
+    rows and requested columns, taken in one step. Stages run inside
+    `stage()` are timed, with the rows left after each, in `trace`.
+    """
+
+    def __init__(self, df, name=""):
+        self.df = df
+        self.name = name
+        self.mask = np.ones(len(df), dtype=bool)
+        self.trace = []
+        self._extra = {}
+        self._derived = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def rows(self):
+        """Rows left after the filters so far."""
+        return int(self.mask.sum())
+
+    @property
+    def columns(self):
+        return list(dict.fromkeys([*self.df.columns, *self._extra, *self._derived]))
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block of work on this view and record it in `trace`."""
+        start = time.perf_counter()
+        yield self
+        self.trace.append({"stage": name, "rows": self.rows, "ms": (time.perf_counter() - start) * 1000})
+
+    def trace_frame(self):
+        return pd.DataFrame(self.trace, columns=["stage", "rows", "ms"]).assign(table=self.name)
+
+    # -------------------------------#
+    # COLUMNS
+    # -------------------------------#
+
+    def assign(self, column, values):
+        """Attach a full-length column (array or Series in frame row order)."""
+        values = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+        if len(values) != len(self.df):
+            raise ValueError(f"{column} has {len(values)} values for {len(self.df)} rows")
+        self._extra[column] = values
+        self._derived.pop(column, None)
+
+    def derive(self, column, inputs, compute):
+        """
+        Define `column` as `compute(frame)`, where `frame` holds the `inputs`
+        columns for the rows being built. Replaces a frame column of the same name.
+        """
+        self._derived[column] = (list(inputs), compute)
+        self._extra.pop(column, None)
+
+    def column(self, column):
+        """Full-length values of one column, for building filter masks."""
+        if column in self._extra:
+            return self._extra[column]
+        if column in self._derived:
+            return self.frame([column])[column].to_numpy()
+        return self.df[column].to_numpy()
+
+    def frame(self, columns, rows=None):
+        """
+        DataFrame of `columns` for the row positions `rows` (all rows if
+        None). Frame columns are taken in one step; derived columns are then
+        computed on the result.
+        """
+        derived = [c for c in columns if c in self._derived]
+        needed = list(dict.fromkeys([*columns, *(i for c in derived for i in self._derived[c][0])]))
+        base = [c for c in needed if c in self.df.columns and c not in self._extra and c not in self._derived]
+        row_selector = slice(None) if rows is None else rows
+        out = self.df.iloc[row_selector, self.df.columns.get_indexer(base)]
+        extra = {c: self._extra[c][row_selector] for c in needed if c in self._extra}
+        if extra:
+            out = out.assign(**extra)
+        for column in derived:
+            out = out.assign(**{column: self._derived[column][1](out)})
+        return out[list(columns)]
+
+    # -------------------------------#
+    # FILTERING AND OUTPUT
+    # -------------------------------#
+
+    def filter(self, mask):
+        """Narrow the view to rows where `mask` is true (None leaves it as is)."""
+        if mask is not None:
+            self.mask &= np.asarray(mask, dtype=bool)
+        return self
+
+    def materialize(self, columns, sort_by=None, ascending=False, limit=None):
+        """
+        The displayed frame: surviving rows, the requested `columns` that
+        exist (in order), sorted by `sort_by` if given. With a `limit`, only
+        the first `limit` rows in that order are built (see top_k).
+        """
+        with self.stage("materialize"):
+            available = set(self.columns)
+            columns = [c for c in columns if c in available]
+            needed = columns + [sort_by] if sort_by and sort_by not in columns else columns
+            rows = np.flatnonzero(self.mask)
+            if sort_by and limit is not None and limit < len(rows):
+                keys = self.frame([sort_by], rows=rows)[sort_by]
+                if pd.api.types.is_numeric_dtype(keys.dtype):
+                    rows, sort_by = rows[top_k(keys.to_numpy(dtype=np.float64, na_value=np.nan), limit, ascending)], None
+            out = self.frame(needed, rows=rows)
+            if sort_by:
+                out = out.sort_values(sort_by, ascending=ascending, kind="stable")
+            out = out[columns].iloc[:limit]
+        # Report the rows actually built, not all that passed the filters
+        self.trace[-1]["rows"] = len(out)
+        return out